@@ -0,0 +1,48 @@
+import shutil
+import sys
+import tempfile
+import time
+
+from synth import ROOT, cool_class
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.parsing.cache import AstCache  # noqa: E402
+from cool_inference.parsing.parser import parser  # noqa: E402
+
+
+def run(fn, sources):
+    start = time.perf_counter()
+    for code in sources:
+        fn(code)
+    return time.perf_counter() - start
+
+
+def main(files=200, classes=5):
+    sources = [
+        "\n".join(cool_class(f * classes + i) for i in range(classes))
+        for f in range(files)
+    ]
+    tmp = tempfile.mkdtemp()
+    try:
+        cache = AstCache(tmp)
+        no_cache = run(parser.parse, sources)
+        cold = run(cache.parse, sources)
+        warm = run(cache.parse, sources)
+        stats = cache.stats()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"{files} files of {classes} classes")
+    print(f"  no cache   : {no_cache * 1000:8.1f} ms")
+    print(f"  cold cache : {cold * 1000:8.1f} ms")
+    print(f"  warm cache : {warm * 1000:8.1f} ms")
+    print(
+        "  {hits} hits, {misses} misses, {entries} entries, {bytes} bytes".format(
+            **stats
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import io
+import pickle
+import sys
+import tracemalloc
+
+from synth import ROOT, program
+
+sys.path.insert(0, ROOT)
+
+import cool_inference.ast as ast  # noqa: E402
+from cool_inference.parsing.parser import parser  # noqa: E402
+
+# the same hierarchy without __slots__, as the nodes were before
+PLAIN = {}
+for name, cls in vars(ast).items():
+    if isinstance(cls, type) and issubclass(cls, ast.AstNode):
+        PLAIN[name] = type(name, (object,), {"__init__": cls.__init__})
+
+
+class PlainUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if module == ast.__name__:
+            return PLAIN[name]
+        return super().find_class(module, name)
+
+
+def count_nodes(value):
+    if isinstance(value, (list, tuple)):
+        return sum(count_nodes(v) for v in value)
+    if not isinstance(value, ast.AstNode):
+        return 0
+    slots = (s for cls in type(value).__mro__ for s in getattr(cls, "__slots__", ()))
+    return 1 + sum(count_nodes(getattr(value, s)) for s in slots)
+
+
+def strip_ids(value):
+    # drops the nid and summary slots, the fields the nodes gained with the ids
+    if isinstance(value, (list, tuple)):
+        for v in value:
+            strip_ids(v)
+    elif isinstance(value, ast.AstNode):
+        for name in ("nid", "summary"):
+            if hasattr(value, name):
+                delattr(value, name)
+        for cls in type(value).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                strip_ids(getattr(value, name, None))
+
+
+def measure(load, data):
+    tracemalloc.start()
+    tree = load(data)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, tree
+
+
+def main(classes=200):
+    sys.setrecursionlimit(100000)
+    tree = parser.parse(program(classes))
+    nodes = count_nodes(tree)
+    # the span table is kept apart from the nodes and measured on its own, so
+    # both trees hold the same attributes (nid included) and only differ in
+    # how they store them
+    spans = pickle.dumps(tree.spans, pickle.HIGHEST_PROTOCOL)
+    tree.spans = None
+    data = pickle.dumps(tree, pickle.HIGHEST_PROTOCOL)
+    strip_ids(tree)
+    bare = pickle.dumps(tree, pickle.HIGHEST_PROTOCOL)
+    del tree
+
+    before, _ = measure(lambda d: PlainUnpickler(io.BytesIO(d)).load(), data)
+    after, _ = measure(pickle.loads, data)
+    no_ids, _ = measure(pickle.loads, bare)
+    table, _ = measure(pickle.loads, spans)
+
+    print(f"{nodes} nodes")
+    print(f"  without __slots__ : {before / nodes:6.1f} bytes/node")
+    print(f"  with __slots__    : {after / nodes:6.1f} bytes/node")
+    print(f"  without ids       : {no_ids / nodes:6.1f} bytes/node (no nid, summary)")
+    print(f"  span table        : {table / nodes:6.1f} bytes/node (not in the above)")
+
+
+if __name__ == "__main__":
+    main()
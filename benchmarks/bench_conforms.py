@@ -0,0 +1,74 @@
+import random
+import sys
+import time
+
+from synth import ROOT
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.semantics.check import TypeCollector  # noqa: E402
+
+
+def deep(context, size):
+    # a single chain of size classes
+    parent = context.get_type("Object")
+    for i in range(size):
+        typex = context.create_type(f"Deep{i}")
+        typex.set_parent(parent)
+        parent = typex
+
+
+def wide(context, size):
+    # size classes under a common parent, every one with a child
+    root = context.create_type("Wide")
+    root.set_parent(context.get_type("Object"))
+    for i in range(size):
+        typex = context.create_type(f"Wide{i}")
+        typex.set_parent(root)
+        context.create_type(f"Leaf{i}").set_parent(typex)
+
+
+def hierarchy(make, size):
+    collector = TypeCollector([])
+    collector.begin()
+    make(collector.context, size)
+    return collector.context
+
+
+def best(run, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(sizes=(1000, 5000), queries=20000, repeat=3):
+    sys.setrecursionlimit(100000)
+    rng = random.Random(0)
+    print(f"{queries} conforms_to checks between random types")
+    for name, make in (("deep", deep), ("wide", wide)):
+        for size in sizes:
+            context = hierarchy(make, size)
+            types = list(context.types.values())
+            pairs = [(rng.choice(types), rng.choice(types)) for _ in range(queries)]
+
+            def run():
+                for t1, t2 in pairs:
+                    t1.conforms_to(t2)
+
+            walk = best(run, repeat)
+            start = time.perf_counter()
+            context.label()
+            t_label = time.perf_counter() - start
+            labelled = best(run, repeat)
+            print(
+                f"  {name:4} {size:6} types : parent walk {walk * 1000:8.1f} ms, "
+                f"labelled {labelled * 1000:6.1f} ms "
+                f"(labelling {t_label * 1000:5.1f} ms, {walk / labelled:.0f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
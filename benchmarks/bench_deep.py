@@ -0,0 +1,98 @@
+import sys
+import time
+
+from synth import ROOT
+
+sys.path.insert(0, ROOT)
+
+import cool_inference.ast as ast  # noqa: E402
+import cool_inference.utils.traverse as traverse  # noqa: E402
+import cool_inference.utils.visitor as visitor  # noqa: E402
+from cool_inference.cli.ast_str import AstStr  # noqa: E402
+from cool_inference.parsing.parser import parser  # noqa: E402
+
+
+def chain(depth):
+    # a + a + ... + a, a left leaning tree depth levels deep
+    body = " + ".join(["a"] * depth)
+    return f"class Main {{ a : Int ; f ( ) : Int {{ {body} }} ; }} ;"
+
+
+def lets(depth):
+    decls = " in ".join(f"let x_{i} : Int <- {i}" for i in range(depth))
+    return f"class Main {{ f ( ) : Int {{ {decls} in x_0 }} ; }} ;"
+
+
+def parens(depth):
+    body = "(" * depth + "1" + ")" * depth
+    return f"class Main {{ f ( ) : Int {{ {body} }} ; }} ;"
+
+
+class Count(visitor.Visitor):
+    # a recursive visitor, one level of python calls per level of the tree
+    @visitor.on("node")
+    def visit(self, node):
+        return 1
+
+    @visitor.when(ast.Program)
+    def visit(self, node):  # noqa: F811
+        return 1 + sum(self.visit(c) for c in node.cool_class_list)
+
+    @visitor.when(ast.CoolClass)
+    def visit(self, node):  # noqa: F811
+        return 1 + sum(self.visit(f) for f in node.feature_list)
+
+    @visitor.when(ast.FuncDecl)
+    def visit(self, node):  # noqa: F811
+        return 1 + self.visit(node.body)
+
+    @visitor.when(ast.Binary)
+    def visit(self, node):  # noqa: F811
+        return 1 + self.visit(node.left) + self.visit(node.right)
+
+    @visitor.when(ast.Unary)
+    def visit(self, node):  # noqa: F811
+        return 1 + self.visit(node.exp)
+
+    @visitor.when(ast.LetIn)
+    def visit(self, node):  # noqa: F811
+        return (
+            1
+            + sum(self.visit(e) for _, _, e in node.decl_list)
+            + (self.visit(node.exp))
+        )
+
+
+class Size(traverse.Walker):
+    # the same count with the explicit stack engine
+    @traverse.post(ast.AstNode)
+    def size(self, node, state, values):
+        return 1 + sum(value for value in values if value is not None)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    try:
+        fn(*args)
+    except RecursionError:
+        return "RecursionError"
+    return f"{(time.perf_counter() - start) * 1000:8.1f} ms"
+
+
+def main(depths=(1000, 10000, 100000)):
+    for name, make in (("a + ... + a", chain), ("nested let", lets), ("(...)", parens)):
+        print(name)
+        for depth in depths:
+            start = time.perf_counter()
+            tree = parser.parse(make(depth))
+            t_parse = (time.perf_counter() - start) * 1000
+            print(
+                f"  depth {depth:6} : parse {t_parse:8.1f} ms, "
+                f"recursive visitor {timed(Count().visit, tree):>14}, "
+                f"walker {timed(Size().walk, tree)}, "
+                f"AstStr {timed(AstStr().visit, tree, 0)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
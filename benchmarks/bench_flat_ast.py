@@ -0,0 +1,59 @@
+import pickle
+import sys
+import time
+import tracemalloc
+
+from synth import ROOT, program
+
+sys.path.insert(0, ROOT)
+
+from cool_inference import flat  # noqa: E402
+from cool_inference.parsing.parser import parser  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def traced(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def main(classes=200):
+    sys.setrecursionlimit(100000)
+    code = program(classes)
+
+    t_tree, tree = timed(parser.parse, code)
+    t_flat, flat_ast = timed(flat.parse, code)
+    nodes = len(flat_ast)
+
+    tree_data = pickle.dumps(tree, pickle.HIGHEST_PROTOCOL)
+    flat_data = pickle.dumps(flat_ast, pickle.HIGHEST_PROTOCOL)
+    del tree, flat_ast
+
+    tree_size, _ = traced(pickle.loads, tree_data)
+    flat_size, _ = traced(pickle.loads, flat_data)
+    t_tree_load, _ = timed(pickle.loads, tree_data)
+    t_flat_load, _ = timed(pickle.loads, flat_data)
+
+    print(f"{nodes} nodes")
+    print(
+        f"  object tree : {tree_size / nodes:6.1f} bytes/node, "
+        f"pickle {len(tree_data) / nodes:5.1f} bytes/node, "
+        f"parse {t_tree * 1000:7.1f} ms, unpickle {t_tree_load * 1000:6.1f} ms"
+    )
+    print(
+        f"  flat        : {flat_size / nodes:6.1f} bytes/node, "
+        f"pickle {len(flat_data) / nodes:5.1f} bytes/node, "
+        f"parse {t_flat * 1000:7.1f} ms, unpickle {t_flat_load * 1000:6.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
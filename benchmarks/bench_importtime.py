@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+from synth import ROOT
+
+# (description, python arguments, budget in ms of import time on top of a bare
+# interpreter started the same way, modules that must not be imported)
+SCENARIOS = [
+    ("cli --help", ["-m", "cool_inference", "--help"], 10, ["lark", "rich"]),
+    (
+        "import pipeline",
+        ["-c", "import cool_inference.cli.pipeline"],
+        10,
+        ["lark", "rich", "cool_inference.semantics.check"],
+    ),
+    (
+        "import parser module",
+        ["-c", "import cool_inference.parsing.parser"],
+        10,
+        ["lark", "cool_inference.parsing.standalone"],
+    ),
+]
+
+# running a module with -m imports runpy and the import machinery it needs, so
+# those scenarios are compared with running a module that imports nothing
+BASELINES = {"-c": ["-c", "pass"], "-m": ["-m", "abc"]}
+
+
+def importtime(args):
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    cmd = [sys.executable, "-X", "importtime"] + args
+    subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True)
+    out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    modules = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def main():
+    ok = True
+    baselines = {}
+    for flag, args in BASELINES.items():
+        baselines[flag] = baseline = importtime(args)
+        name = f"bare interpreter {flag}"
+        print(f"{name:<22}: {sum(baseline.values()) / 1000:6.1f} ms")
+    for name, args, budget, forbidden in SCENARIOS:
+        baseline = baselines[args[0]]
+        modules = importtime(args)
+        total = sum(t for m, t in modules.items() if m not in baseline) / 1000
+        loaded = [m for m in forbidden if m in modules]
+        passed = total <= budget and not loaded
+        ok = ok and passed
+        status = "ok" if passed else "OVER BUDGET"
+        print(f"{name:<22}: {total:6.1f} ms (budget {budget} ms) {status}")
+        if loaded:
+            print(f"{'':<22}  unexpected imports: {', '.join(loaded)}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import sys
+import time
+
+from synth import ROOT, program
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.parsing.stream import StreamParser  # noqa: E402
+
+
+def edits(code):
+    middle = code.index("atr5000 : Int <- 5000")
+    yield "change a literal", (middle + 17, middle + 21, "4242")
+    yield "add a newline", (middle, middle, "\n")
+    yield "insert a class", (0, 0, "class Extra { x : Int <- 1 ; } ;\n")
+    yield "delete a class", (0, len("class Extra { x : Int <- 1 ; } ;\n"), "")
+    last = code.rindex("atr")
+    yield "edit the last class", (last, last + 3, "atr")
+
+
+def main(classes=10000, methods=1):
+    code = program(classes, methods)
+    parser = StreamParser()
+
+    start = time.perf_counter()
+    ast = parser.parse(code)
+    full = time.perf_counter() - start
+    print(f"{classes} classes, {len(code) // 1024} KiB")
+    print(f"  {'full parse':<20} : {full * 1000:10.1f} ms")
+
+    for name, edit in edits(code):
+        start = time.perf_counter()
+        code = parser.reparse(ast, code, edit)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<20} : {elapsed * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,66 @@
+import random
+import sys
+import time
+
+from synth import ROOT
+
+sys.path.insert(0, ROOT)
+
+from bench_conforms import deep, hierarchy, wide  # noqa: E402
+from cool_inference.utils.lca import (  # noqa: E402
+    lca_index,
+    lca_of_set,
+    lowest_common_ancestor,
+    walk_ancestors,
+)
+
+
+def best(run, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(sizes=(1000, 5000), queries=200, repeat=3):
+    sys.setrecursionlimit(100000)
+    rng = random.Random(0)
+    print(f"{queries} joins of random pairs and of random sets of 8 types")
+    for name, make in (("deep", deep), ("wide", wide)):
+        for size in sizes:
+            context = hierarchy(make, size)
+            types = list(context.types.values())
+            pairs = [(rng.choice(types), rng.choice(types)) for _ in range(queries)]
+            groups = [rng.sample(types, 8) for _ in range(queries)]
+
+            def walk():
+                for t1, t2 in pairs:
+                    walk_ancestors(t1, t2, context)
+                for group in groups:
+                    result = group[0]
+                    for typex in group:
+                        result = walk_ancestors(result, typex, context)
+
+            def indexed():
+                for t1, t2 in pairs:
+                    lowest_common_ancestor(t1, t2, context)
+                for group in groups:
+                    lca_of_set(group, context)
+
+            start = time.perf_counter()
+            lca_index(context)
+            t_build = time.perf_counter() - start
+            # the walk already checks conformance with the labels of the index
+            t_walk = best(walk, repeat)
+            t_index = best(indexed, repeat)
+            print(
+                f"  {name:4} {size:6} types : walk {t_walk * 1000:8.1f} ms, "
+                f"index {t_index * 1000:5.1f} ms "
+                f"(build {t_build * 1000:5.1f} ms, {t_walk / t_index:.0f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import sys
+import time
+
+from synth import ROOT, program
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.parsing.lexer import tokenize  # noqa: E402
+from cool_inference.parsing.parser import build_parser  # noqa: E402
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(classes=1000, repeat=3):
+    code = program(classes)
+    lark_parser = build_parser()
+    fast_parser = build_parser(lexer="fast")
+    print(f"input: {classes} classes, {len(code) / 1e6:.1f} MB")
+
+    lexers = {
+        "lark": lambda: sum(1 for _ in lark_parser.lex(code)),
+        "fast": lambda: sum(1 for _ in tokenize(code)),
+    }
+    print("tokenizing")
+    for name, fn in lexers.items():
+        elapsed, count = best(fn, repeat)
+        print(
+            f"  {name:<4} : {count / elapsed / 1e6:6.2f} M tokens/s ({elapsed:.2f} s)"
+        )
+
+    print("parsing")
+    for name, parser in (("lark", lark_parser), ("fast", fast_parser)):
+        elapsed, _ = best(lambda: parser.parse(code), 1)
+        print(f"  {name:<4} : {len(code) / elapsed / 1e6:6.2f} MB/s ({elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import random
+from collections import OrderedDict
+import sys
+import time
+
+from synth import ROOT
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.semantics.semantics import (  # noqa: E402
+    Attribute,
+    Method,
+    SemanticError,
+    Type,
+)
+
+
+class LegacyType(Type):
+    # the member lookups as they were before the member tables: a scan of the
+    # type's lists, then the parent, raising again at every level on a miss
+    def get_attribute(self, name):
+        try:
+            return next(attr for attr in self.attributes if attr.name == name)
+        except StopIteration:
+            if self.parent is None:
+                raise SemanticError(f'Attribute "{name}" is not defined.')
+            try:
+                return self.parent.get_attribute(name)
+            except SemanticError:
+                raise SemanticError(f'Attribute "{name}" is not defined.')
+
+    def define_attribute(self, name, typex):
+        try:
+            self.get_attribute(name)
+        except SemanticError:
+            attribute = Attribute(name, typex)
+            self.attributes.append(attribute)
+            return attribute
+        raise SemanticError(f'Attribute "{name}" is already defined.')
+
+    def get_method(self, name):
+        try:
+            return next(method for method in self.methods if method.name == name)
+        except StopIteration:
+            if self.parent is None:
+                raise SemanticError(f'Method "{name}" is not defined.')
+            try:
+                return self.parent.get_method(name)
+            except SemanticError:
+                raise SemanticError(f'Method "{name}" is not defined.')
+
+    def define_method(self, name, param_names, param_types, return_type):
+        if name in (method.name for method in self.methods):
+            raise SemanticError(f'Method "{name}" already defined.')
+        method = Method(name, param_names, param_types, return_type)
+        self.methods.append(method)
+        return method
+
+    def all_attributes(self, clean=True):
+        plain = (
+            OrderedDict() if self.parent is None else self.parent.all_attributes(False)
+        )
+        for attr in self.attributes:
+            plain[attr.name] = (attr, self)
+        return plain.values() if clean else plain
+
+    def all_methods(self, clean=True):
+        plain = OrderedDict() if self.parent is None else self.parent.all_methods(False)
+        for method in self.methods:
+            plain[method.name] = (method, self)
+        return plain.values() if clean else plain
+
+
+def build(cls, depth, members):
+    # a chain of depth classes with members attributes and methods each
+    types = []
+    parent = None
+    for i in range(depth):
+        typex = cls(f"T{i}")
+        if parent is not None:
+            typex.set_parent(parent)
+        for j in range(members):
+            typex.define_attribute(f"a{i}_{j}", typex)
+            typex.define_method(f"m{i}_{j}", [], [], typex)
+        types.append(typex)
+        parent = typex
+    return types
+
+
+def lookups(types, names, rng):
+    # method lookups from random classes, a tenth of them misses
+    queries = []
+    for _ in range(names):
+        i = rng.randrange(len(types))
+        j = rng.randrange(i + 1)
+        name = f"m{j}_0" if rng.random() < 0.9 else "missing"
+        queries.append((types[i], name))
+    return queries
+
+
+def resolve(queries):
+    for typex, name in queries:
+        try:
+            typex.get_method(name)
+        except SemanticError:
+            pass
+
+
+def layouts(queries):
+    # the attribute and method layouts of the classes, as codegen asks them
+    for typex, _ in queries:
+        typex.all_attributes()
+        typex.all_methods()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main(shapes=((1, 500), (20, 100), (200, 5)), names=20000):
+    sys.setrecursionlimit(100000)
+    print(
+        f"class building, {names} method lookups "
+        f"and {names // 10} layouts (all_attributes and all_methods)"
+    )
+    for depth, members in shapes:
+        rates = []
+        for cls in (LegacyType, Type):
+            t_build, types = timed(build, cls, depth, members)
+            queries = lookups(types, names, random.Random(0))
+            t_lookup, _ = timed(resolve, queries)
+            t_layout, _ = timed(layouts, queries[: names // 10])
+            rates.append((t_build, t_lookup, t_layout))
+        (b0, l0, y0), (b1, l1, y1) = rates
+        print(
+            f"  depth {depth:4}, {members:3} members : "
+            f"build {b0 * 1000:7.1f} -> {b1 * 1000:6.1f} ms, "
+            f"lookups {l0 * 1000:7.1f} -> {l1 * 1000:6.1f} ms, "
+            f"layouts {y0 * 1000:7.1f} -> {y1 * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
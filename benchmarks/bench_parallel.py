@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import time
+
+from synth import ROOT, program
+
+sys.path.insert(0, ROOT)
+
+from cool_inference import flat  # noqa: E402
+from cool_inference.parsing.batch import parse_files  # noqa: E402
+
+
+def write_files(path, files, classes):
+    paths = []
+    for i in range(files):
+        paths.append(os.path.join(path, f"file{i}.cool"))
+        with open(paths[-1], "w") as fp:
+            fp.write(program(classes))
+    return paths
+
+
+def serial(paths):
+    for path in paths:
+        with open(path) as fp:
+            flat.parse(fp.read())
+
+
+def main(files=64, classes=10):
+    print(f"{files} files of {classes} classes, {os.cpu_count()} cpus")
+    with tempfile.TemporaryDirectory() as path:
+        paths = write_files(path, files, classes)
+        flat.get_parser()
+
+        start = time.perf_counter()
+        serial(paths)
+        base = time.perf_counter() - start
+        print(f"  {'in process':<10} : {base * 1000:8.1f} ms")
+
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            for _, _, error in parse_files(paths, workers):
+                assert error is None
+            elapsed = time.perf_counter() - start
+            print(
+                f"  {workers} workers  : {elapsed * 1000:8.1f} ms, "
+                f"speedup {base / elapsed:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,84 @@
+import itertools as itt
+import sys
+import time
+
+from synth import ROOT
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.parsing.parser import parser  # noqa: E402
+from cool_inference.semantics.check import (  # noqa: E402
+    TypeBuilder,
+    TypeChecker,
+    TypeCollector,
+)
+from cool_inference.semantics.semantics import Scope, VariableInfo  # noqa: E402
+
+
+class LegacyScope(Scope):
+    # the scope as it was before the name tables: a scan of the locals, then
+    # the parent with a recursive call
+    def create_child(self):
+        child = LegacyScope(self)
+        self.children.append(child)
+        return child
+
+    def define_variable(self, vname, vtype):
+        info = VariableInfo(vname, vtype)
+        self.locals.append(info)
+        return info
+
+    def find_variable(self, vname, index=None):
+        locals = self.locals if index is None else itt.islice(self.locals, index)
+        try:
+            return next(x for x in locals if x.name == vname)
+        except StopIteration:
+            if self.parent is not None:
+                return self.parent.find_variable(vname, self.index)
+            return None
+
+
+def wide_let(bindings):
+    # a single let with bindings variables
+    decls = ", ".join(f"x_{i} : Int <- a" for i in range(bindings))
+    body = " + ".join(f"x_{i}" for i in range(0, bindings, 7))
+    return f"class Main {{ a : Int ; f ( ) : Int {{ let {decls} in {body} }} ; }} ;"
+
+
+def nested_lets(bindings):
+    # bindings nested lets, the innermost expression uses all of them
+    decls = " in ".join(f"let x_{i} : Int <- a" for i in range(bindings))
+    body = " + ".join(f"x_{i}" for i in range(0, bindings, 7))
+    return f"class Main {{ a : Int ; f ( ) : Int {{ {decls} in {body} + a }} ; }} ;"
+
+
+def check(ast, scope):
+    errors = []
+    collector = TypeCollector(errors)
+    collector.visit(ast)
+    context = collector.context
+    TypeBuilder(context, errors).visit(ast)
+    checker = TypeChecker(context, errors)
+    start = time.perf_counter()
+    for cool_class in ast.cool_class_list:
+        checker.visit(cool_class, scope.create_child())
+    assert not errors, errors
+    return time.perf_counter() - start
+
+
+def main(sizes=(100, 500, 2000), repeat=3):
+    sys.setrecursionlimit(100000)
+    print("type checking methods with many let bindings")
+    for name, make in (("one let", wide_let), ("nested lets", nested_lets)):
+        for size in sizes:
+            ast = parser.parse(make(size))
+            before = min(check(ast, LegacyScope()) for _ in range(repeat))
+            after = min(check(ast, Scope()) for _ in range(repeat))
+            print(
+                f"  {name:11} {size:5} bindings : {before * 1000:8.1f} -> "
+                f"{after * 1000:6.1f} ms ({before / after:.0f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
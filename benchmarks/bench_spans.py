@@ -0,0 +1,44 @@
+import sys
+import time
+
+from synth import ROOT, examples, program
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.parsing.parser import build_parser  # noqa: E402
+from cool_inference.parsing.transformer import CoolASTTransformer  # noqa: E402
+
+
+class NoSpansTransformer(CoolASTTransformer):
+    def mark(self, node, children):
+        return node
+
+
+def best(parser, sources, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for code in sources:
+            parser.parse(code)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(repeat=5):
+    parsers = {
+        "without spans": build_parser(transformer=NoSpansTransformer()),
+        "with spans": build_parser(),
+    }
+    corpora = {
+        "examples": [code for _, code in examples()],
+        "synthetic": [program(300)],
+    }
+    for corpus, sources in corpora.items():
+        print(corpus)
+        for name, parser in parsers.items():
+            elapsed = best(parser, sources, repeat)
+            print(f"  {name:<13} : {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from synth import ROOT, examples, program
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.parsing import build  # noqa: E402
+from cool_inference.parsing.parser import build_parser, load_standalone  # noqa: E402
+from cool_inference.parsing.transformer import CoolASTTransformer  # noqa: E402
+
+FIRST_PARSE = (
+    "from cool_inference.parsing.parser import parser; "
+    "parser.parse('class A { a : Int <- 1 ; } ;')"
+)
+
+
+def first_parse(backend, repeat):
+    env = dict(os.environ, COOL_INFERENCE_PARSER=backend)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    cmd = [sys.executable, "-c", FIRST_PARSE]
+    subprocess.run(cmd, cwd=ROOT, env=env, check=True)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, env=env, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def throughput(parser, sources, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for code in sources:
+            parser.parse(code)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(repeat=5):
+    if load_standalone() is None:
+        build.build()
+    standalone = load_standalone()
+    parsers = {
+        "lark": build_parser(),
+        "standalone": standalone.Lark_StandAlone(transformer=CoolASTTransformer()),
+    }
+
+    print("import-to-first-parse (subprocess, median)")
+    for backend in parsers:
+        print(f"  {backend:<10} : {first_parse(backend, repeat) * 1000:8.1f} ms")
+
+    corpus = [code for _, code in examples()]
+    synthetic = [program(2000)]
+    size = len(synthetic[0]) / 1e6
+    print(f"parse time (in process, best of {repeat})")
+    for backend, parser in parsers.items():
+        t_examples = throughput(parser, corpus, repeat)
+        t_synthetic = throughput(parser, synthetic, 1)
+        print(
+            f"  {backend:<10} : examples {t_examples * 1000:8.1f} ms, "
+            f"synthetic ({size:.1f} MB) {t_synthetic * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
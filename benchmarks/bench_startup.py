@@ -0,0 +1,43 @@
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT = "import cool_inference.parsing.parser"
+
+
+def run(env, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", IMPORT], cwd=ROOT, env=env, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(repeat=10):
+    tmp = tempfile.mkdtemp()
+    env = dict(os.environ, COOL_INFERENCE_CACHE_DIR=tmp, COOL_INFERENCE_PARSER="lark")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    try:
+        cold = []
+        for _ in range(repeat):
+            shutil.rmtree(tmp)
+            os.makedirs(tmp)
+            cold.append(run(env, 1))
+        warm = run(env, repeat)
+        no_cache = run(dict(env, COOL_INFERENCE_NO_CACHE="1"), repeat)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"no cache   : {no_cache * 1000:8.1f} ms")
+    print(f"cold cache : {statistics.median(cold) * 1000:8.1f} ms")
+    print(f"warm cache : {warm * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import sys
+import time
+import tracemalloc
+
+from synth import ROOT, program
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.parsing.parser import build_parser  # noqa: E402
+from cool_inference.parsing.stream import StreamParser  # noqa: E402
+
+
+def measure(parse, code):
+    first = []
+    start = time.perf_counter()
+
+    def on_class(cool_class):
+        if not first:
+            first.append(time.perf_counter() - start)
+
+    parse(code, on_class)
+    total = time.perf_counter() - start
+
+    # tracing slows the parse down a lot, so memory is measured separately
+    tracemalloc.start()
+    parse(code, lambda cool_class: None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first[0], total, peak
+
+
+def main(classes=2000):
+    code = program(classes)
+    parser = build_parser(lexer="fast")
+    stream = StreamParser()
+
+    def whole(code, on_class):
+        ast = parser.parse(code)
+        for cool_class in ast.cool_class_list:
+            on_class(cool_class)
+
+    print(f"{classes} classes, {len(code) // 1024} KiB")
+    for name, parse in (("whole file", whole), ("streaming", stream.parse)):
+        first, total, peak = measure(parse, code)
+        print(
+            f"  {name:<10} : first class {first * 1000:8.1f} ms, "
+            f"total {total * 1000:8.1f} ms, peak {peak / 2 ** 20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
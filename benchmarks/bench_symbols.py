@@ -0,0 +1,87 @@
+import copy
+import sys
+import time
+
+from synth import ROOT, program
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.ast import AstNode  # noqa: E402
+from cool_inference.parsing.parser import parser  # noqa: E402
+from cool_inference.semantics.check import (  # noqa: E402
+    TypeCollector,
+    TypeBuilder,
+    TypeChecker,
+)
+from cool_inference.inference.tyinfer import (  # noqa: E402
+    BagsCollector,
+    BagsReducer,
+    BagsReplacer,
+)
+
+
+def fresh(value):
+    # an equal str that is not the interned one
+    return value.encode("utf8").decode("utf8")
+
+
+def uninterned(node):
+    # the tree as the parser built it before names were interned: every name
+    # is a different str object
+    if isinstance(node, list):
+        return [uninterned(item) for item in node]
+    if isinstance(node, tuple):
+        return tuple(uninterned(item) for item in node)
+    if isinstance(node, str):
+        return fresh(node)
+    if not isinstance(node, AstNode):
+        return node
+    for cls in type(node).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name not in ("nid", "spans") and hasattr(node, name):
+                setattr(node, name, uninterned(getattr(node, name)))
+    return node
+
+
+def passes(ast):
+    errors = []
+    collector = TypeCollector(errors)
+    collector.visit(ast)
+    context = collector.context
+    TypeBuilder(context, errors).visit(ast)
+    TypeChecker(context, errors).visit(ast)
+
+    bags = BagsCollector(context, errors).visit(ast)
+    bags = BagsReducer(bags, context, errors).visit(ast)
+    BagsReplacer(bags, context, errors).visit(ast)
+
+
+def best(make, repeat):
+    times = []
+    for _ in range(repeat):
+        ast = make()
+        start = time.perf_counter()
+        passes(ast)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(classes=200, repeat=5):
+    sys.setrecursionlimit(100000)
+    code = program(classes)
+    ast = parser.parse(code)
+
+    # the replacer rewrites the tree, every run gets its own copy
+    t_symbols = best(lambda: copy.deepcopy(ast), repeat)
+    t_strings = best(lambda: uninterned(copy.deepcopy(ast)), repeat)
+
+    print(f"{classes} classes, semantic and inference passes")
+    print(f"  fresh strings : {t_strings * 1000:7.1f} ms")
+    print(
+        f"  symbols       : {t_symbols * 1000:7.1f} ms "
+        f"({(1 - t_symbols / t_strings) * 100:+.1f}%)"
+    )
+
+
+if __name__ == "__main__":
+    main()
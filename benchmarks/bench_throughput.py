@@ -0,0 +1,69 @@
+import sys
+import time
+
+from synth import ROOT, program
+
+sys.path.insert(0, ROOT)
+
+from cool_inference.parsing.parser import build_parser  # noqa: E402
+from cool_inference.parsing.transformer import CoolASTTransformer  # noqa: E402
+
+
+class RecordingTransformer(CoolASTTransformer):
+    # keeps the arguments of every callback, replaying them measures the
+    # transformer alone, without lark
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def __getattribute__(self, name):
+        attr = super().__getattribute__(name)
+        if name.startswith("_") or name in ("mark", "calls", "nodes", "spans"):
+            return attr
+        if not callable(attr):
+            return attr
+        calls = super().__getattribute__("calls")
+
+        def record(children):
+            calls.append((name, list(children)))
+            return attr(children)
+
+        return record
+
+
+def best(run, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(classes=500, repeat=5):
+    code = program(classes)
+    size = len(code) / 2**20
+    print(f"{classes} classes, {size:.2f} MiB")
+
+    for lexer in ("standard", "fast"):
+        parser = build_parser(lexer=lexer)
+        elapsed = best(lambda: parser.parse(code), repeat)
+        print(f"  {lexer:<10} : {elapsed * 1000:8.1f} ms, {size / elapsed:6.2f} MiB/s")
+
+    recorder = RecordingTransformer()
+    build_parser(cache=False, transformer=recorder).parse(code)
+    transformer = CoolASTTransformer()
+    calls = [
+        (getattr(transformer, name), children) for name, children in recorder.calls
+    ]
+
+    def replay():
+        for callback, children in calls:
+            callback(children)
+
+    elapsed = best(replay, repeat)
+    print(f"  {'ast only':<10} : {elapsed * 1000:8.1f} ms, {len(calls)} callbacks")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,166 @@
+import inspect
+import sys
+import time
+
+from synth import ROOT, program
+
+sys.path.insert(0, ROOT)
+
+import cool_inference.ast as ast  # noqa: E402
+import cool_inference.utils.visitor as visitor  # noqa: E402
+from cool_inference import flat  # noqa: E402
+from cool_inference.parsing.parser import parser  # noqa: E402
+
+
+class legacy:
+    # the dispatcher as it was before the dispatch tables: exact class lookup,
+    # a scan of every target on a miss, and a wrapper function per visit
+    Visitor = object
+
+    @staticmethod
+    def on(param_name):
+        def f(fn):
+            return LegacyDispatcher(param_name, fn)
+
+        return f
+
+    @staticmethod
+    def when(param_type):
+        def f(fn):
+            frame = inspect.currentframe().f_back
+            dispatcher = frame.f_locals[fn.__name__]
+            if not isinstance(dispatcher, LegacyDispatcher):
+                dispatcher = dispatcher.dispatcher
+            dispatcher.add_target(param_type, fn)
+
+            def ff(*args, **kw):
+                return dispatcher(*args, **kw)
+
+            ff.dispatcher = dispatcher
+            return ff
+
+        return f
+
+
+class LegacyDispatcher:
+    def __init__(self, param_name, fn):
+        self.param_index = inspect.getfullargspec(fn).args.index(param_name)
+        self.targets = {}
+
+    def __call__(self, *args, **kw):
+        typ = args[self.param_index].__class__
+        d = self.targets.get(typ)
+        if d is not None:
+            return d(*args, **kw)
+        issub = issubclass
+        t = self.targets
+        ans = [t[k](*args, **kw) for k in t.keys() if issub(typ, k)]
+        if len(ans) == 1:
+            return ans.pop()
+        return ans
+
+    def add_target(self, typ, target):
+        self.targets[typ] = target
+
+
+def counter(module):
+    # counts the nodes of a tree, visiting the children of every node
+    class Counter(module.Visitor):
+        @module.on("node")
+        def visit(self, node):
+            pass
+
+        @module.when(ast.Program)
+        def visit(self, node):  # noqa: F811
+            return 1 + sum(self.visit(c) for c in node.cool_class_list)
+
+        @module.when(ast.CoolClass)
+        def visit(self, node):  # noqa: F811
+            return 1 + sum(self.visit(f) for f in node.feature_list)
+
+        @module.when(ast.AttrDecl)
+        def visit(self, node):  # noqa: F811
+            return 1 + (0 if node.body is None else self.visit(node.body))
+
+        @module.when(ast.FuncDecl)
+        def visit(self, node):  # noqa: F811
+            return 1 + len(node.params) + self.visit(node.body)
+
+        @module.when(ast.Dispatch)
+        def visit(self, node):  # noqa: F811
+            return 1 + self.visit(node.exp) + sum(self.visit(e) for e in node.exp_list)
+
+        @module.when(ast.LetIn)
+        def visit(self, node):  # noqa: F811
+            decls = sum(self.visit(e) for _, _, e in node.decl_list if e is not None)
+            return 1 + decls + self.visit(node.exp)
+
+        @module.when(ast.Case)
+        def visit(self, node):  # noqa: F811
+            cases = sum(self.visit(e) for _, _, e in node.case_list)
+            return 1 + self.visit(node.exp) + cases
+
+        @module.when(ast.Block)
+        def visit(self, node):  # noqa: F811
+            return 1 + sum(self.visit(e) for e in node.expr_list)
+
+        @module.when(ast.Assign)
+        def visit(self, node):  # noqa: F811
+            return 1 + self.visit(node.value)
+
+        @module.when(ast.Binary)
+        def visit(self, node):  # noqa: F811
+            return 1 + self.visit(node.left) + self.visit(node.right)
+
+        @module.when(ast.IfThenElse)
+        def visit(self, node):  # noqa: F811
+            return (
+                1
+                + self.visit(node.first)
+                + self.visit(node.second)
+                + (self.visit(node.third))
+            )
+
+        @module.when(ast.Atom)
+        def visit(self, node):  # noqa: F811
+            return 1
+
+        @module.when(ast.IdExp)
+        def visit(self, node):  # noqa: F811
+            return 1
+
+    return Counter()
+
+
+def best(run, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(classes=200, repeat=5):
+    sys.setrecursionlimit(100000)
+    code = program(classes)
+    trees = (("object tree", parser.parse(code)), ("flat views", flat.parse(code)))
+
+    print(f"{classes} classes, visit calls per second")
+    for name, tree in trees:
+        if name == "flat views":
+            tree = tree.program()
+        rates = []
+        for module in (legacy, visitor):
+            pass_ = counter(module)
+            seconds, visits = best(lambda: pass_.visit(tree), repeat)
+            rates.append(visits / seconds)
+        before, after = rates
+        print(
+            f"  {name:11} : before {before / 1e6:5.2f} M/s, "
+            f"after {after / 1e6:5.2f} M/s ({after / before:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
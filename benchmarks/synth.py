@@ -0,0 +1,37 @@
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES = os.path.join(ROOT, "examples")
+
+
+def examples():
+    names = sorted(os.listdir(EXAMPLES), key=int)
+    for name in names:
+        with open(os.path.join(EXAMPLES, name, "code.cool")) as fp:
+            yield name, fp.read()
+
+
+def cool_class(i, methods=3, depth=8):
+    parent = f" inherits Cls{i - 1}" if i % depth else ""
+    feats = [
+        f"    atr{i} : Int <- {i} ;",
+        f'    str{i} : String <- "cls{i}" ;',
+        f"    fld{i} : AUTO_TYPE <- atr{i} + 1 ;",
+    ]
+    for j in range(methods):
+        call = f"met{i}_{j - 1}(x, y)" if j else "x"
+        feats.append(f"""    met{i}_{j} ( x : Int, y : AUTO_TYPE ) : AUTO_TYPE {{
+        {{
+            let t : Int <- x * 2 + y in t - atr{i} ;
+            if x < y then x else y fi ;
+            while atr{i} <= 0 loop atr{i} <- atr{i} + 1 pool ;
+            case str{i} of q : String => q ; r : Object => str{i} ; esac ;
+            {call} + y + atr{i} ;
+        }}
+    }} ;""")
+    body = "\n".join(feats)
+    return f"class Cls{i}{parent} {{\n{body}\n}} ;\n"
+
+
+def program(classes, methods=3, depth=8):
+    return "\n".join(cool_class(i, methods, depth) for i in range(classes))
@@ -1,20 +1,131 @@
 import sys
 import os
-from cool_inference.cli.pipeline import pipeline
+
+USAGE = """usage: python -m cool_inference [--ast-cache[=DIR]] [--stream] [--recover]
+                               [--jobs=N] [--timings] <path to cool file> [...]
+
+Infers the AUTO_TYPE annotations of a COOL program, printing the result of
+every phase, and writes the inferred program next to the original file with
+the -inferred suffix. Several files are parsed in parallel and then checked
+one after the other.
+
+options:
+  -h, --help         show this help message and exit
+  --ast-cache[=DIR]  reuse the ast of unchanged files, stored in DIR (defaults
+                     to the cool_inference cache directory)
+  --stream           parse the file one class at a time, registering every
+                     class as soon as it is parsed (ignores --ast-cache)
+  --recover          report every syntax error, and check the classes without
+                     errors (ignores --ast-cache and --stream)
+  --jobs=N           number of processes parsing several files (defaults to
+                     the number of cpus), --ast-cache, --stream and --recover
+                     only apply to a single file
+  --timings          print the time spent in every semantic and inference
+                     pass"""
+
+
+def parse_args(args):
+    filenames = []
+    ast_cache = None
+    stream = False
+    recover = False
+    jobs = None
+    timings = False
+    for arg in args:
+        if arg == "--stream":
+            stream = True
+        elif arg == "--recover":
+            recover = True
+        elif arg == "--timings":
+            timings = True
+        elif arg.startswith("--jobs=") and arg[len("--jobs=") :].isdigit():
+            jobs = int(arg[len("--jobs=") :]) or None
+        elif arg == "--ast-cache":
+            ast_cache = ""
+        elif arg.startswith("--ast-cache="):
+            ast_cache = arg[len("--ast-cache=") :]
+        elif arg.startswith("-"):
+            return None
+        else:
+            filenames.append(arg)
+    if not filenames:
+        return None
+    return filenames, ast_cache, stream, recover, jobs, timings
+
+
+def write_inferred(filename, ast_str):
+    basename, extension = os.path.splitext(filename)
+    with open(basename + "-inferred" + extension, "w") as fp:
+        fp.write(ast_str)
+
+
+def main_batch(filenames, jobs, timings=False):
+    from cool_inference.cli.pipeline import get_printers, pipeline
+    from cool_inference.parsing.batch import parse_files
+
+    print_title, print_error, _, print_exit = get_printers()
+
+    for filename, ast, error in parse_files(filenames, jobs):
+        print(filename)
+        print()
+        if error is not None:
+            kind, message = error
+            print_title("Tokenizing/Parsing")
+            print_error(message)
+            print()
+            if kind == "io":
+                print_exit("Stopped because the file could not be read")
+            else:
+                print_exit(f"Stopped because of {kind} error")
+            print()
+            continue
+
+        ast_str = pipeline(None, ast=ast.to_tree(), timings=timings)
+        if ast_str is not None:
+            write_inferred(filename, ast_str)
+        print()
 
 
 def main():
-    filename = sys.argv[1]
+    if "-h" in sys.argv[1:] or "--help" in sys.argv[1:]:
+        print(USAGE)
+        return
+    args = parse_args(sys.argv[1:])
+    if args is None:
+        print(USAGE, file=sys.stderr)
+        sys.exit(2)
+    filenames, ast_cache, stream, recover, jobs, timings = args
+
+    if len(filenames) > 1:
+        main_batch(filenames, jobs, timings)
+        return
+    filename = filenames[0]
+
+    from cool_inference.cli.pipeline import pipeline
+
+    cache = None
+    if ast_cache is not None and not stream and not recover:
+        from cool_inference.parsing.cache import AstCache
+
+        cache = AstCache(ast_cache or None)
+
     with open(filename) as fp:
         code = fp.read()
-    ast_str = pipeline(code)
+    ast_str = pipeline(
+        code, cache, stream and not recover, recover=recover, timings=timings
+    )
+
+    if cache is not None:
+        cache.evict()
+        print(
+            "AST cache: {hits} hits, {misses} misses, "
+            "{entries} entries, {bytes} bytes".format(**cache.stats())
+        )
 
     if ast_str is None:
         return
 
-    basename, extension = os.path.splitext(filename)
-    with open(basename + "-inferred" + extension, "w") as fp:
-        fp.write(ast_str)
+    write_inferred(filename, ast_str)
 
 
 if __name__ == "__main__":
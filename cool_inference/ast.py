@@ -1,10 +1,36 @@
+# kinds of child slots: a node (or None), a list of nodes, and a list of
+# (id, type, node) declarations of let and case
+NODE, NODES, DECLS = range(3)
+
+
 class AstNode:
-    pass
+    # id assigned by the parser, indexes the span table of the program, and
+    # summary, the kind bits (see kind_mask) of every node in the subtree
+    __slots__ = ("nid", "summary")
+
+    # (attribute, kind) of the slots holding the children, in walking order
+    child_slots = ()
+
+    def children(self):
+        result = []
+        for name, kind in self.child_slots:
+            value = getattr(self, name)
+            if kind == NODE:
+                result.append(value)
+            elif kind == NODES:
+                result.extend(value)
+            else:
+                result.extend(exp for _, _, exp in value)
+        return result
 
 
 class Program(AstNode):
-    def __init__(self, class_list):
+    __slots__ = ("cool_class_list", "spans")
+    child_slots = (("cool_class_list", NODES),)
+
+    def __init__(self, class_list, spans=None):
         self.cool_class_list = class_list
+        self.spans = spans
 
     def __str__(self):
         for cl in self.cool_class_list:
@@ -12,6 +38,9 @@ class Program(AstNode):
 
 
 class CoolClass(AstNode):
+    __slots__ = ("feature_list", "id", "inherit")
+    child_slots = (("feature_list", NODES),)
+
     def __init__(self, feature_list, name, inherit=None):
         self.feature_list = feature_list
         self.id = name
@@ -27,10 +56,13 @@ class CoolClass(AstNode):
 
 
 class Feature(AstNode):
-    pass
+    __slots__ = ()
 
 
 class AttrDecl(Feature):
+    __slots__ = ("id", "type", "body")
+    child_slots = (("body", NODE),)
+
     def __init__(self, idx, typex, body):
         self.id = idx
         self.type = typex
@@ -41,6 +73,9 @@ class AttrDecl(Feature):
 
 
 class FuncDecl(Feature):
+    __slots__ = ("id", "params", "body", "type")
+    child_slots = (("params", NODES), ("body", NODE))
+
     def __init__(self, idx, params, body, typex):
         self.id = idx
         self.params = params
@@ -61,6 +96,8 @@ class FuncDecl(Feature):
 
 
 class Param(AstNode):
+    __slots__ = ("id", "type")
+
     def __init__(self, typex, idx):
         self.id = idx
         self.type = typex
@@ -70,10 +107,13 @@ class Param(AstNode):
 
 
 class Expression(AstNode):
-    pass
+    __slots__ = ()
 
 
 class Dispatch(Expression):
+    __slots__ = ("id", "exp", "exp_list")
+    child_slots = (("exp", NODE), ("exp_list", NODES))
+
     def __init__(self, exp, idx, exp_list):
         self.id = idx
         self.exp = exp
@@ -84,6 +124,9 @@ class Dispatch(Expression):
 
 
 class StaticDispatch(Expression):
+    __slots__ = ("id", "exp", "specific_type", "exp_list")
+    child_slots = (("exp", NODE), ("exp_list", NODES))
+
     def __init__(self, exp, specific_type, idx, exp_list):
         self.id = idx
         self.exp = exp
@@ -96,6 +139,9 @@ class StaticDispatch(Expression):
 
 
 class LetIn(Expression):
+    __slots__ = ("decl_list", "exp")
+    child_slots = (("decl_list", DECLS), ("exp", NODE))
+
     def __init__(self, decl_list, exp):
         self.decl_list = decl_list
         self.exp = exp
@@ -105,6 +151,9 @@ class LetIn(Expression):
 
 
 class Case(Expression):
+    __slots__ = ("exp", "case_list")
+    child_slots = (("exp", NODE), ("case_list", DECLS))
+
     def __init__(self, exp, case_list):
         self.exp = exp
         self.case_list = case_list
@@ -114,6 +163,8 @@ class Case(Expression):
 
 
 class NewType(Expression):
+    __slots__ = ("type",)
+
     def __init__(self, typex):
         self.type = typex
 
@@ -122,6 +173,9 @@ class NewType(Expression):
 
 
 class Block(Expression):
+    __slots__ = ("expr_list",)
+    child_slots = (("expr_list", NODES),)
+
     def __init__(self, expr_list):
         self.expr_list = expr_list
 
@@ -130,6 +184,9 @@ class Block(Expression):
 
 
 class Assign(Expression):
+    __slots__ = ("id", "value")
+    child_slots = (("value", NODE),)
+
     def __init__(self, idx, value):
         self.id = idx
         self.value = value
@@ -144,26 +201,37 @@ class Assign(Expression):
 
 
 class Unary(Expression):
+    __slots__ = ("exp",)
+    child_slots = (("exp", NODE),)
+
     def __init__(self, exp):
         self.exp = exp
 
 
 class Not(Unary):
+    __slots__ = ()
+
     def __str__(self):
         return str("Not " + str(self.exp))
 
 
 class IsVoid(Unary):
+    __slots__ = ()
+
     def __str__(self):
         return str("IsVoid? " + str(self.exp))
 
 
 class Tilde(Unary):
+    __slots__ = ()
+
     def __str__(self):
         return str("Tilde")
 
 
 class ParenthExp(Unary):
+    __slots__ = ()
+
     def __str__(self):
         return str("(" + str(self.exp) + ")")
 
@@ -174,55 +242,74 @@ class ParenthExp(Unary):
 
 
 class Binary(Expression):
+    __slots__ = ("left", "right")
+    child_slots = (("left", NODE), ("right", NODE))
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
 
 
 class Comparisson(Binary):
-    pass
+    __slots__ = ()
 
 
 class Leq(Comparisson):
+    __slots__ = ()
+
     def __str__(self):
         return str("Leq")
 
 
 class Eq(Comparisson):
+    __slots__ = ()
+
     def __str__(self):
         return str("Eq")
 
 
 class Le(Comparisson):
+    __slots__ = ()
+
     def __str__(self):
         return str("Le")
 
 
 class Arithmetic(Binary):
-    pass
+    __slots__ = ()
 
 
 class Plus(Arithmetic):
+    __slots__ = ()
+
     def __str__(self):
         return str("Plus")
 
 
 class Minus(Arithmetic):
+    __slots__ = ()
+
     def __str__(self):
         return str("Minus")
 
 
 class Mult(Arithmetic):
+    __slots__ = ()
+
     def __str__(self):
         return str("Mult")
 
 
 class Div(Arithmetic):
+    __slots__ = ()
+
     def __str__(self):
         return str("Div")
 
 
 class WhileLoop(Binary):
+    __slots__ = ()
+
     def __str__(self):
         return str("While")
 
@@ -233,6 +320,9 @@ class WhileLoop(Binary):
 
 
 class Ternary(Expression):
+    __slots__ = ("first", "second", "third")
+    child_slots = (("first", NODE), ("second", NODE), ("third", NODE))
+
     def __init__(self, first, second, third):
         self.first = first
         self.second = second
@@ -240,6 +330,8 @@ class Ternary(Expression):
 
 
 class IfThenElse(Ternary):
+    __slots__ = ()
+
     def __str__(self):
         return str("IfThenElse")
 
@@ -250,28 +342,73 @@ class IfThenElse(Ternary):
 
 
 class Atom(Expression):
+    __slots__ = ("lex",)
+
     def __init__(self, lex):
         self.lex = lex
 
 
 class IntExp(Atom):
+    __slots__ = ()
+
     def __str__(self):
         return str("Int")
 
 
 class StringExp(Atom):
+    __slots__ = ()
+
     def __str__(self):
         return str("String")
 
 
 class BoolExp(Atom):
+    __slots__ = ()
+
     def __str__(self):
         return str("Bool")
 
 
 class IdExp(Expression):
+    __slots__ = ("id",)
+
     def __init__(self, lex):
         self.id = lex
 
     def __str__(self):
         return str("Id")
+
+
+# every node class has a bit, the summary of a node is the union of the bits of
+# the nodes in its subtree, so a pass looking for some kinds of nodes skips the
+# subtrees whose summary has none of their bits
+NODE_CLASSES = [
+    cls
+    for cls in list(globals().values())
+    if isinstance(cls, type) and issubclass(cls, AstNode)
+]
+for bit, cls in enumerate(NODE_CLASSES):
+    cls.kind_bit = 1 << bit
+
+# the summary of nodes built without one (by hand, or flat ast views)
+ALL_KINDS = (1 << len(NODE_CLASSES)) - 1
+
+
+def kind_mask(types):
+    # the bits of the node classes that are subclasses of any of types
+    types = tuple(types)
+    mask = 0
+    for cls in NODE_CLASSES:
+        if issubclass(cls, types):
+            mask |= cls.kind_bit
+    return mask
+
+
+def summarize(node):
+    # sets the summary of node, the summaries of its children are already set
+    summary = node.kind_bit
+    for child in node.children():
+        if child is not None:
+            summary |= getattr(child, "summary", ALL_KINDS)
+    node.summary = summary
+    return node
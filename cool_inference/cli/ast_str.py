@@ -1,4 +1,4 @@
-import cool_inference.utils.visitor as visitor
+import cool_inference.utils.traverse as traverse
 from cool_inference.ast import (
     Assign,
     AttrDecl,
@@ -32,86 +32,85 @@ from cool_inference.ast import (
 )
 
 
-class AstStr(object):
-    @visitor.on("node")
+def binary(op):
+    def post(self, node, indent, values):
+        return "{left} {op} {right}".format(left=values[0], op=op, right=values[1])
+
+    return post
+
+
+class AstStr(traverse.Walker):
+    # walks the tree with an explicit stack, so deep expressions are printed
+    # without hitting the recursion limit; the state is the indentation level
     def visit(self, node, indent):
-        pass
+        return self.walk(node, indent)
+
+    @traverse.pre(CoolClass, Block)
+    def deeper(self, node, indent):
+        return [(child, indent + 1) for child in traverse.children(node)]
 
-    @visitor.when(Assign)
-    def visit(self, node: Assign, indent):  # noqa: F811
-        return "{id} <- {exp}".format(id=node.id, exp=self.visit(node.value, indent))
+    @traverse.pre(FuncDecl)
+    def deeper_body(self, node: FuncDecl, indent):
+        return [(param, indent) for param in node.params] + [(node.body, indent + 1)]
 
-    @visitor.when(AttrDecl)
-    def visit(self, node: AttrDecl, indent):  # noqa: F811
+    @traverse.pre(Case)
+    def deeper_cases(self, node: Case, indent):
+        cases = [(exp, indent + 1) for _, _, exp in node.case_list]
+        return [(node.exp, indent)] + cases
+
+    @traverse.post(Assign)
+    def assign(self, node: Assign, indent, values):
+        return "{id} <- {exp}".format(id=node.id, exp=values[0])
+
+    @traverse.post(AttrDecl)
+    def attr_decl(self, node: AttrDecl, indent, values):
         decl = "{id}: {type}".format(id=node.id, type=node.type)
-        init = (
-            " <- {value}".format(value=self.visit(node.body, indent))
-            if node.body
-            else ""
-        )
+        init = " <- {value}".format(value=values[0]) if node.body else ""
         return decl + init + ";"
 
-    @visitor.when(Block)
-    def visit(self, node: Block, indent):  # noqa: F811
-        expr_list = (self.visit(exp, indent + 1) for exp in node.expr_list)
-        expr_list = ("    " * (indent + 1) + exp + ";" for exp in expr_list)
+    @traverse.post(Block)
+    def block(self, node: Block, indent, values):
+        expr_list = ("    " * (indent + 1) + exp + ";" for exp in values)
         body = "\n".join(expr_list)
         return "{{\n{body}\n{indent}}}".format(body=body, indent="    " * indent)
 
-    @visitor.when(BoolExp)
-    def visit(self, node: BoolExp, indent):  # noqa: F811
+    @traverse.post(BoolExp, IntExp, StringExp)
+    def atom(self, node, indent, values):
         return node.lex
 
-    @visitor.when(Case)
-    def visit(self, node: Case, indent):  # noqa: F811
-        cases = (
-            (idx, typex, self.visit(exp, indent + 1))
-            for (idx, typex, exp) in node.case_list
-        )
+    @traverse.post(Case)
+    def case(self, node: Case, indent, values):
         cases = (
             "{id}: {type} => {exp}".format(id=idx, type=typex, exp=exp)
-            for (idx, typex, exp) in cases
+            for (idx, typex, _), exp in zip(node.case_list, values[1:])
         )
         cases = ("    " * (indent + 1) + case + ";" for case in cases)
         cases = "\n".join(cases)
         return "case {exp} of\n{cases}\n{indent}esac".format(
-            exp=self.visit(node.exp, indent), cases=cases, indent="    " * indent
+            exp=values[0], cases=cases, indent="    " * indent
         )
 
-    @visitor.when(CoolClass)
-    def visit(self, node: CoolClass, indent):  # noqa: F811
+    @traverse.post(CoolClass)
+    def cool_class(self, node: CoolClass, indent, values):
         decl = "class {id}".format(id=node.id) + (
             " inherits {parent}".format(parent=node.inherit) if node.inherit else ""
         )
-        features = (self.visit(feat, indent + 1) for feat in node.feature_list)
-        features = ("    " * (indent + 1) + feat for feat in features)
+        features = ("    " * (indent + 1) + feat for feat in values)
         features = "\n".join(features)
         return "{decl} {{\n{feats}\n{indent}}};\n".format(
             decl=decl, feats=features, indent="    " * indent
         )
 
-    @visitor.when(Dispatch)
-    def visit(self, node: Dispatch, indent):  # noqa: F811
-        arg_list = ", ".join((self.visit(exp, indent) for exp in node.exp_list))
-        exp = "{exp}.".format(exp=self.visit(node.exp, indent)) if node.exp else ""
+    @traverse.post(Dispatch)
+    def dispatch(self, node: Dispatch, indent, values):
+        arg_list = ", ".join(values[1:])
+        exp = "{exp}.".format(exp=values[0]) if node.exp else ""
         return exp + "{id}({arg_list})".format(id=node.id, arg_list=arg_list)
 
-    @visitor.when(Div)
-    def visit(self, node: Div, indent):  # noqa: F811
-        return "{left} / {right}".format(
-            left=self.visit(node.left, indent), right=self.visit(node.right, indent)
-        )
-
-    @visitor.when(Eq)
-    def visit(self, node: Eq, indent):  # noqa: F811
-        return "{left} = {right}".format(
-            left=self.visit(node.left, indent), right=self.visit(node.right, indent)
-        )
-
-    @visitor.when(FuncDecl)
-    def visit(self, node: FuncDecl, indent):  # noqa: F811
-        params = ", ".join((self.visit(p, indent) for p in node.params))
-        body = "    " * (indent + 1) + self.visit(node.body, indent + 1)
+    @traverse.post(FuncDecl)
+    def func_decl(self, node: FuncDecl, indent, values):
+        params = ", ".join(values[:-1])
+        body = "    " * (indent + 1) + values[-1]
         return "{id}({params}): {type} {{\n{body}\n{indent}}};".format(
             id=node.id,
             params=params,
@@ -120,107 +119,73 @@ class AstStr(object):
             indent="    " * indent,
         )
 
-    @visitor.when(IdExp)
-    def visit(self, node: IdExp, indent):  # noqa: F811
+    @traverse.post(IdExp)
+    def id_exp(self, node: IdExp, indent, values):
         return node.id
 
-    @visitor.when(IfThenElse)
-    def visit(self, node: IfThenElse, indent):  # noqa: F811
-        cond = self.visit(node.first, indent)
-        then_exp = self.visit(node.second, indent)
-        else_exp = self.visit(node.third, indent)
+    @traverse.post(IfThenElse)
+    def if_then_else(self, node: IfThenElse, indent, values):
+        cond, then_exp, else_exp = values
         return "if {cond} then {then_exp} else {else_exp} fi".format(
             cond=cond, then_exp=then_exp, else_exp=else_exp
         )
 
-    @visitor.when(IntExp)
-    def visit(self, node: IntExp, indent):  # noqa: F811
-        return node.lex
-
-    @visitor.when(IsVoid)
-    def visit(self, node: IsVoid, indent):  # noqa: F811
-        return "isvoid {exp}".format(exp=self.visit(node.exp, indent))
-
-    @visitor.when(Le)
-    def visit(self, node: Le, indent):  # noqa: F811
-        return "{left} < {right}".format(
-            left=self.visit(node.left, indent), right=self.visit(node.right, indent)
-        )
-
-    @visitor.when(Leq)
-    def visit(self, node: Leq, indent):  # noqa: F811
-        return "{left} <= {right}".format(
-            left=self.visit(node.left, indent), right=self.visit(node.right, indent)
-        )
+    @traverse.post(IsVoid)
+    def is_void(self, node: IsVoid, indent, values):
+        return "isvoid {exp}".format(exp=values[0])
 
-    @visitor.when(LetIn)
-    def visit(self, node: LetIn, indent):  # noqa: F811
+    @traverse.post(LetIn)
+    def let_in(self, node: LetIn, indent, values):
         decls = ", ".join(
             (
                 "{id}: {type}".format(id=idx, type=typex)
-                + (" <- {value}".format(value=self.visit(init, indent)) if init else "")
-                for (idx, typex, init) in node.decl_list
+                + (" <- {value}".format(value=value) if init else "")
+                for (idx, typex, init), value in zip(node.decl_list, values)
             )
         )
-        expr = self.visit(node.exp, indent)
-        return "let {decls} in {expr}".format(decls=decls, expr=expr)
-
-    @visitor.when(Minus)
-    def visit(self, node: Minus, indent):  # noqa: F811
-        return "{left} - {right}".format(
-            left=self.visit(node.left, indent), right=self.visit(node.right, indent)
-        )
+        return "let {decls} in {expr}".format(decls=decls, expr=values[-1])
 
-    @visitor.when(Mult)
-    def visit(self, node: Mult, indent):  # noqa: F811
-        return "{left} * {right}".format(
-            left=self.visit(node.left, indent), right=self.visit(node.right, indent)
-        )
-
-    @visitor.when(NewType)
-    def visit(self, node: NewType, indent):  # noqa: F811
+    @traverse.post(NewType)
+    def new_type(self, node: NewType, indent, values):
         return "new {type}".format(type=node.type)
 
-    @visitor.when(Not)
-    def visit(self, node: Not, indent):  # noqa: F811
-        return "not {exp}".format(exp=self.visit(node.exp, indent))
+    @traverse.post(Not)
+    def not_exp(self, node: Not, indent, values):
+        return "not {exp}".format(exp=values[0])
 
-    @visitor.when(Param)
-    def visit(self, node: Param, indent):  # noqa: F811
+    @traverse.post(Param)
+    def param(self, node: Param, indent, values):
         return "{id}: {type}".format(id=node.id, type=node.type)
 
-    @visitor.when(ParenthExp)
-    def visit(self, node: ParenthExp, indent):  # noqa: F811
-        return "({exp})".format(exp=self.visit(node.exp, indent))
-
-    @visitor.when(Plus)
-    def visit(self, node: Plus, indent):  # noqa: F811
-        return "{left} + {right}".format(
-            left=self.visit(node.left, indent), right=self.visit(node.right, indent)
-        )
+    @traverse.post(ParenthExp)
+    def parenth_exp(self, node: ParenthExp, indent, values):
+        return "({exp})".format(exp=values[0])
 
-    @visitor.when(Program)
-    def visit(self, node: Program, indent):  # noqa: F811
-        return "\n".join((self.visit(cl, indent) for cl in node.cool_class_list))
+    @traverse.post(Program)
+    def program(self, node: Program, indent, values):
+        return "\n".join(values)
 
-    @visitor.when(StaticDispatch)
-    def visit(self, node: StaticDispatch, indent):  # noqa: F811
-        arg_list = ", ".join((self.visit(exp, indent) for exp in node.exp_list))
-        exp = self.visit(node.exp, indent)
+    @traverse.post(StaticDispatch)
+    def static_dispatch(self, node: StaticDispatch, indent, values):
         return "{exp}@{type}.{id}({arg_list})".format(
-            exp=exp, type=node.specific_type, id=node.id, arg_list=arg_list
+            exp=values[0],
+            type=node.specific_type,
+            id=node.id,
+            arg_list=", ".join(values[1:]),
         )
 
-    @visitor.when(StringExp)
-    def visit(self, node: StringExp, indent):  # noqa: F811
-        return node.lex
+    @traverse.post(Tilde)
+    def tilde(self, node: Tilde, indent, values):
+        return "~{exp}".format(exp=values[0])
 
-    @visitor.when(Tilde)
-    def visit(self, node: Tilde, indent):  # noqa: F811
-        return "~{exp}".format(exp=self.visit(node.exp, indent))
+    @traverse.post(WhileLoop)
+    def while_loop(self, node: WhileLoop, indent, values):
+        return "while {left} loop {right} pool".format(left=values[0], right=values[1])
 
-    @visitor.when(WhileLoop)
-    def visit(self, node: WhileLoop, indent):  # noqa: F811
-        return "while {left} loop {right} pool".format(
-            left=self.visit(node.left, indent), right=self.visit(node.right, indent)
-        )
+    div = traverse.post(Div)(binary("/"))
+    eq = traverse.post(Eq)(binary("="))
+    le = traverse.post(Le)(binary("<"))
+    leq = traverse.post(Leq)(binary("<="))
+    minus = traverse.post(Minus)(binary("-"))
+    mult = traverse.post(Mult)(binary("*"))
+    plus = traverse.post(Plus)(binary("+"))
@@ -1,10 +1,5 @@
-from lark import UnexpectedCharacters, UnexpectedToken
-from cool_inference.parsing.parser import parser
-from cool_inference.semantics.check import TypeCollector, TypeBuilder, TypeChecker
-from cool_inference.inference.tyinfer import BagsCollector, BagsReducer, BagsReplacer
-from cool_inference.cli.ast_str import AstStr
-
-
+# phases are imported inside pipeline, so that importing this module (or
+# running the cli with --help) does not load lark, rich or the visitors
 def get_rich_printers():
     from rich import print
 
@@ -46,187 +41,136 @@ def get_std_printers():
     return print_title, print_error, print_success, print_exit
 
 
-def pipeline(code):
-    try:
-        printers = get_rich_printers()
-    except ImportError:
-        printers = get_std_printers()
-
-    print_title, print_error, print_success, print_exit = printers
-
-    # parsing
-
-    print_title("Tokenizing/Parsing")
-
-    try:
-        ast = parser.parse(code)
-    except UnexpectedCharacters as e:
-        print_error(
-            f"Unexpected character {code[e.pos_in_stream]} at ({e.line}, {e.column})"
-        )
-        print()
-        print_exit("Stopped because of lexical error")
-        return None
-    except UnexpectedToken as e:
-        print_error(f"Unexpected token {e.token} at ({e.line}, {e.column})")
-        print()
-        print_exit("Stopped because of parsing error")
-        return None
-
-    print_success("Finished without errors")
-    print()
-
-    # type collection
-
-    print_title("Type collection")
-
-    type_collector_errors = []
-
-    collector = TypeCollector(type_collector_errors)
-    collector.visit(ast)
-
-    if type_collector_errors:
-        for e in type_collector_errors:
-            print_error(e)
-    else:
-        print_success("Finished without errors")
-    print()
-
-    context = collector.context
-
-    # type building
-
-    print_title("Type building")
-
-    type_builder_errors = []
-
-    builder = TypeBuilder(context, type_builder_errors)
-    builder.visit(ast)
-
-    if type_builder_errors:
-        for e in type_builder_errors:
-            print_error(e)
-    else:
-        print_success("Finished without errors")
-    print()
-
-    # type checking
-
-    print_title("Type checking")
-
-    type_checker_errors = []
-
-    checker = TypeChecker(context, type_checker_errors)
-    checker.visit(ast)
-
-    if type_checker_errors:
-        for e in type_checker_errors:
-            print_error(e)
-    else:
-        print_success("Finished without errors")
-    print()
-
-    if type_collector_errors or type_builder_errors or type_checker_errors:
-        print_exit("Stopped because of semantic errors")
-        return None
+_printers = None
 
-    # bags collection
 
-    print_title("Collecting tybags")
+def get_printers():
+    global _printers
+    if _printers is None:
+        try:
+            _printers = get_rich_printers()
+        except ImportError:
+            _printers = get_std_printers()
+    return _printers
 
-    bags_collector_errors = []
 
-    bags_collector = BagsCollector(context, bags_collector_errors)
-    bags = bags_collector.visit(ast)
+def pipeline(code, cache=None, stream=False, ast=None, recover=False, timings=False):
+    print_title, print_error, print_success, print_exit = get_printers()
 
-    if bags_collector_errors:
-        for e in bags_collector_errors:
-            print_error(e)
-    else:
-        print_success("Finished without errors")
-    print()
-
-    # bags reducing
-
-    print_title("Reducing tybags")
-
-    bags_reducer_errors = []
-
-    bags_reducer = BagsReducer(bags, context, bags_reducer_errors)
-    bags = bags_reducer.visit(ast)
-
-    if bags_reducer_errors:
-        for e in bags_reducer_errors:
-            print_error(e)
-    else:
-        print_success("Finished without errors")
-    print()
-
-    # bags replacing
-
-    print_title("Replacing tybags in ast")
-
-    bags_replacer_errors = []
-
-    bags_replacer = BagsReplacer(bags, context, bags_replacer_errors)
-    bags_replacer.visit(ast)
-
-    if bags_replacer_errors:
-        for e in bags_replacer_errors:
-            print_error(e)
-    else:
-        print_success("Finished without errors")
-    print()
-
-    # type collection
+    # parsing
 
-    print_title("Type collection")
+    print_title("Tokenizing/Parsing")
 
+    syntax_errors = []
     type_collector_errors = []
+    collector = None
 
-    collector = TypeCollector(type_collector_errors)
-    collector.visit(ast)
-
-    if type_collector_errors:
-        for e in type_collector_errors:
-            print_error(e)
-    else:
-        print_success("Finished without errors")
-    print()
-
-    context = collector.context
-
-    # type building
-
-    print_title("Type building")
-
-    type_builder_errors = []
-
-    builder = TypeBuilder(context, type_builder_errors)
-    builder.visit(ast)
-
-    if type_builder_errors:
-        for e in type_builder_errors:
-            print_error(e)
+    try:
+        if ast is not None:
+            # parsed by the caller, see cool_inference.parsing.batch
+            pass
+        elif stream:
+            from cool_inference.parsing.stream import parse
+            from cool_inference.semantics.check import TypeCollector
+
+            # every class is collected as soon as it is parsed
+            collector = TypeCollector(type_collector_errors)
+            collector.begin()
+            ast = parse(code, collector.visit)
+        elif recover:
+            from cool_inference.parsing.recover import parse
+
+            # every syntax error is reported, and the classes without errors
+            # go through the semantic phases
+            ast, syntax_errors = parse(code)
+        elif cache is not None:
+            ast = cache.parse(code)
+        else:
+            from cool_inference.parsing.parser import parser
+
+            ast = parser.parse(code)
+    except Exception as e:
+        if stream:
+            from lark import UnexpectedCharacters, UnexpectedToken
+        else:
+            from cool_inference.parsing.parser import (
+                UnexpectedCharacters,
+                UnexpectedToken,
+            )
+
+        if isinstance(e, UnexpectedCharacters):
+            char = code[e.pos_in_stream]
+            print_error(f"Unexpected character {char} at ({e.line}, {e.column})")
+            print()
+            print_exit("Stopped because of lexical error")
+            return None
+        if isinstance(e, UnexpectedToken):
+            print_error(f"Unexpected token {e.token} at ({e.line}, {e.column})")
+            print()
+            print_exit("Stopped because of parsing error")
+            return None
+        raise
+
+    if syntax_errors:
+        from lark import UnexpectedToken
+
+        for e in syntax_errors:
+            if isinstance(e, UnexpectedToken):
+                print_error(f"Unexpected token {e.token} at ({e.line}, {e.column})")
+            else:
+                print_error(f"Unexpected character {e.char} at ({e.line}, {e.column})")
     else:
         print_success("Finished without errors")
     print()
 
-    # type checking
-
-    print_title("Type checking")
-
-    type_checker_errors = []
-
-    checker = TypeChecker(context, type_checker_errors)
-    checker.visit(ast)
+    from cool_inference.passes import CheckTypes, PassManager, Unit, inference_passes
+
+    # semantic and inference phases, the passes that can share a sweep over
+    # the classes are run together and then reported in order
+
+    unit = Unit(ast)
+    passes = inference_passes(collector)
+    manager = PassManager(passes)
+
+    def print_timings():
+        if not timings:
+            return
+        print_title("Timings")
+        sweeps = manager.schedule()
+        for sweep in sweeps:
+            for pass_ in sweep:
+                if pass_.name in unit.timings:
+                    spent = unit.timings[pass_.name] * 1000
+                    print(f"{pass_.name:40} {spent:9.2f} ms")
+        print(f"{len(passes)} passes in {len(sweeps)} sweeps")
+        print()
 
-    if type_checker_errors:
-        for e in type_checker_errors:
-            print_error(e)
-    else:
-        print_success("Finished without errors")
-    print()
+    checked = [pass_ for pass_ in passes if pass_.key == "context"][:3]
+    for sweep in manager.run(unit):
+        for pass_ in sweep:
+            print_title(pass_.title)
+            if pass_.errors:
+                for e in pass_.errors:
+                    print_error(e)
+            else:
+                print_success("Finished without errors")
+            print()
+
+            if isinstance(pass_, CheckTypes) and pass_.key == "context":
+                if any(checked_pass.errors for checked_pass in checked):
+                    print_timings()
+                    print_exit("Stopped because of semantic errors")
+                    return None
+
+                if syntax_errors:
+                    # types are not inferred for a partial program
+                    print_timings()
+                    print_exit("Stopped because of syntax errors")
+                    return None
+
+    print_timings()
+
+    from cool_inference.cli.ast_str import AstStr
 
     ast_str = AstStr()
     return ast_str.visit(ast, 0)
@@ -0,0 +1,494 @@
+import mmap
+import struct
+from array import array
+import cool_inference.ast as ast
+from cool_inference.parsing.spans import SpanTable
+from cool_inference.utils.symbols import symbol
+
+# Struct-of-arrays representation of the ast. Every node has a kind (index in
+# KINDS) and FIELDS integer fields, interpreted according to the kind's
+# LAYOUT. Strings are indices into an interned string table, nodes are node
+# indices, lists are offsets into items where a length is followed by the
+# elements (node indices, or (id, type, node) triples for let and case
+# declarations). Missing strings and nodes are -1.
+
+FIELDS = 4
+
+NODE, STR, NODES, DECLS = range(4)
+
+# attribute names in the order the constructors of cool_inference.ast take them
+ARGS = {
+    ast.Program: ("cool_class_list",),
+    ast.CoolClass: ("feature_list", "id", "inherit"),
+    ast.AttrDecl: ("id", "type", "body"),
+    ast.FuncDecl: ("id", "params", "body", "type"),
+    ast.Param: ("type", "id"),
+    ast.Dispatch: ("exp", "id", "exp_list"),
+    ast.StaticDispatch: ("exp", "specific_type", "id", "exp_list"),
+    ast.LetIn: ("decl_list", "exp"),
+    ast.Case: ("exp", "case_list"),
+    ast.NewType: ("type",),
+    ast.Block: ("expr_list",),
+    ast.Assign: ("id", "value"),
+    ast.Unary: ("exp",),
+    ast.Binary: ("left", "right"),
+    ast.Ternary: ("first", "second", "third"),
+    ast.Atom: ("lex",),
+    ast.IdExp: ("id",),
+}
+
+FIELD_KINDS = {
+    "cool_class_list": NODES,
+    "feature_list": NODES,
+    "id": STR,
+    "inherit": STR,
+    "type": STR,
+    "body": NODE,
+    "params": NODES,
+    "exp": NODE,
+    "exp_list": NODES,
+    "specific_type": STR,
+    "decl_list": DECLS,
+    "case_list": DECLS,
+    "expr_list": NODES,
+    "value": NODE,
+    "left": NODE,
+    "right": NODE,
+    "first": NODE,
+    "second": NODE,
+    "third": NODE,
+    "lex": STR,
+}
+
+KINDS = (
+    ast.Program,
+    ast.CoolClass,
+    ast.AttrDecl,
+    ast.FuncDecl,
+    ast.Param,
+    ast.Dispatch,
+    ast.StaticDispatch,
+    ast.LetIn,
+    ast.Case,
+    ast.NewType,
+    ast.Block,
+    ast.Assign,
+    ast.Not,
+    ast.IsVoid,
+    ast.Tilde,
+    ast.ParenthExp,
+    ast.Leq,
+    ast.Eq,
+    ast.Le,
+    ast.Plus,
+    ast.Minus,
+    ast.Mult,
+    ast.Div,
+    ast.WhileLoop,
+    ast.IfThenElse,
+    ast.IntExp,
+    ast.StringExp,
+    ast.BoolExp,
+    ast.IdExp,
+)
+
+KIND = {cls: kind for kind, cls in enumerate(KINDS)}
+
+
+def args_of(cls):
+    return next(ARGS[base] for base in cls.__mro__ if base in ARGS)
+
+
+# kind -> ((attribute, field, kind of value), ...), fields are numbered in
+# constructor order
+LAYOUT = tuple(
+    tuple((name, field, FIELD_KINDS[name]) for field, name in enumerate(args_of(cls)))
+    for cls in KINDS
+)
+
+# the span count is -1 for a tree without spans
+HEADER = struct.Struct("<8sIiIIIIiI")
+MAGIC = b"COOLFLAT"
+VERSION = 2
+
+
+class FlatAst:
+    def __init__(self):
+        self.kinds = array("B")
+        self.fields = array("i")
+        self.items = array("i")
+        self.strings = []
+        self.string_index = {}
+        self.root = -1
+        self.spans = None
+
+    def __len__(self):
+        return len(self.kinds)
+
+    # building
+
+    def intern(self, string):
+        if string is None:
+            return -1
+        string = symbol(str(string))
+        try:
+            return self.string_index[string]
+        except KeyError:
+            index = self.string_index[string] = len(self.strings)
+            self.strings.append(string)
+            return index
+
+    def add_list(self, values):
+        start = len(self.items)
+        self.items.append(len(values))
+        self.items.extend(values)
+        return start
+
+    def add_decls(self, decls):
+        start = len(self.items)
+        self.items.append(len(decls))
+        for idx, typex, exp in decls:
+            self.items.append(self.intern(idx))
+            self.items.append(self.intern(typex))
+            self.items.append(-1 if exp is None else exp)
+        return start
+
+    def encode(self, value_kind, value):
+        if value_kind == NODE:
+            return -1 if value is None else value
+        if value_kind == STR:
+            return self.intern(value)
+        if value_kind == NODES:
+            return self.add_list(value)
+        return self.add_decls(value)
+
+    def add(self, kind, args):
+        fields = [-1] * FIELDS
+        for (_, field, value_kind), value in zip(LAYOUT[kind], args):
+            fields[field] = self.encode(value_kind, value)
+        self.kinds.append(kind)
+        self.fields.extend(fields)
+        return len(self.kinds) - 1
+
+    @classmethod
+    def from_tree(cls, tree):
+        flat = cls()
+        spans = tree.spans
+        if spans is not None:
+            flat.spans = SpanTable()
+
+        def convert(value, value_kind):
+            if value_kind == NODE:
+                return None if value is None else add(value)
+            if value_kind == NODES:
+                return [add(v) for v in value]
+            if value_kind == DECLS:
+                return [
+                    (idx, typex, None if exp is None else add(exp))
+                    for idx, typex, exp in value
+                ]
+            return value
+
+        def add(node):
+            kind = KIND[type(node)]
+            args = [
+                convert(getattr(node, name), value_kind)
+                for name, _, value_kind in LAYOUT[kind]
+            ]
+            if spans is not None:
+                flat.spans.add(*spans.span(node.nid))
+            return flat.add(kind, args)
+
+        flat.root = add(tree)
+        return flat
+
+    # reading
+
+    def view(self, index):
+        if index < 0:
+            return None
+        return VIEWS[self.kinds[index]](self, index)
+
+    def program(self):
+        return self.view(self.root)
+
+    def field(self, index, field):
+        return self.fields[index * FIELDS + field]
+
+    def string(self, index):
+        return None if index < 0 else self.strings[index]
+
+    def list(self, start):
+        items = self.items
+        return items[start + 1 : start + 1 + items[start]]
+
+    def decls(self, start):
+        items = self.items
+        count = items[start]
+        return [
+            (
+                self.strings[items[i]],
+                self.strings[items[i + 1]],
+                self.view(items[i + 2]),
+            )
+            for i in range(start + 1, start + 1 + 3 * count, 3)
+        ]
+
+    def to_tree(self, index=None):
+        index = self.root if index is None else index
+        if index < 0:
+            return None
+        kind = self.kinds[index]
+        node = KINDS[kind].__new__(KINDS[kind])
+        node.nid = index
+        if kind == KIND[ast.Program]:
+            node.spans = self.spans
+        for name, field, value_kind in LAYOUT[kind]:
+            value = self.field(index, field)
+            if value_kind == NODE:
+                value = self.to_tree(value)
+            elif value_kind == STR:
+                value = self.string(value)
+            elif value_kind == NODES:
+                value = [self.to_tree(i) for i in self.list(value)]
+            else:
+                value = [
+                    (idx, typex, self.to_tree(exp.index) if exp is not None else None)
+                    for idx, typex, exp in self.decls(value)
+                ]
+            setattr(node, name, value)
+        return ast.summarize(node)
+
+    # writing, through the views
+
+    def writable(self):
+        for name in ("kinds", "fields", "items"):
+            buffer = getattr(self, name)
+            if isinstance(buffer, memoryview):
+                setattr(self, name, array(buffer.format, buffer))
+
+    def set_field(self, index, field, value_kind, value):
+        self.writable()
+        if value_kind == NODE:
+            value = None if value is None else value.index
+        elif value_kind == NODES:
+            value = [v.index for v in value]
+        elif value_kind == DECLS:
+            value = [
+                (idx, typex, None if exp is None else exp.index)
+                for idx, typex, exp in value
+            ]
+        self.fields[index * FIELDS + field] = self.encode(value_kind, value)
+
+    # serialization
+
+    def to_bytes(self):
+        blobs = [s.encode("utf8") for s in self.strings]
+        offsets = array("i", [0])
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        kinds = self.kinds.tobytes()
+        kinds += b"\0" * (-len(kinds) % 4)
+        # the spans follow the other sections: the start, end, line and column
+        # arrays, then the (class nid, first nid) pairs of SpanTable.first
+        spans = self.spans
+        if spans is None:
+            span_blobs, span_count, classes = (), -1, 0
+        else:
+            first = array("i", [n for pair in spans.first.items() for n in pair])
+            span_blobs = tuple(
+                array("i", column).tobytes()
+                for column in (spans.start, spans.end, spans.line, spans.column)
+            ) + (first.tobytes(),)
+            span_count, classes = len(spans), len(spans.first)
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.root,
+            len(self.kinds),
+            len(self.items),
+            len(self.strings),
+            offsets[-1],
+            span_count,
+            classes,
+        )
+        return b"".join(
+            (
+                header,
+                kinds,
+                self.fields.tobytes(),
+                self.items.tobytes(),
+                offsets.tobytes(),
+                b"".join(blobs),
+            )
+            + span_blobs
+        )
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        buffer = memoryview(buffer)
+        magic, version, root, nodes, items, strings, blob, span_count, classes = (
+            HEADER.unpack_from(buffer)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a flat ast buffer")
+
+        def take(start, size, fmt):
+            end = start + size * struct.calcsize(fmt)
+            return buffer[start:end].cast(fmt), end
+
+        flat = cls.__new__(cls)
+        flat.root = root
+        flat.kinds, end = take(HEADER.size, nodes, "B")
+        end += -nodes % 4
+        flat.fields, end = take(end, nodes * FIELDS, "i")
+        flat.items, end = take(end, items, "i")
+        offsets, end = take(end, strings + 1, "i")
+        data = bytes(buffer[end : end + blob])
+        end += blob
+        flat.strings = [
+            symbol(data[offsets[i] : offsets[i + 1]].decode("utf8"))
+            for i in range(strings)
+        ]
+        flat.string_index = {s: i for i, s in enumerate(flat.strings)}
+
+        # the spans are copied, the parsers append to them and truncate them
+        flat.spans = None
+        if span_count >= 0:
+            flat.spans = SpanTable()
+            for name in ("start", "end", "line", "column"):
+                column, end = take(end, span_count, "i")
+                getattr(flat.spans, name).frombytes(column.cast("B"))
+            first, end = take(end, 2 * classes, "i")
+            flat.spans.first = dict(zip(first[::2], first[1::2]))
+        return flat
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as fp:
+            return cls.from_buffer(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save(self, path):
+        with open(path, "wb") as fp:
+            fp.write(self.to_bytes())
+
+    def __reduce__(self):
+        return FlatAst.from_buffer, (self.to_bytes(),)
+
+
+class FlatBuilder:
+    """Node constructors for CoolASTTransformer that add rows to a FlatAst."""
+
+    def __init__(self):
+        self.flat = FlatAst()
+
+    def reset(self):
+        # drops the rows of a parse that failed
+        self.flat = FlatAst()
+
+    def finish(self, root, spans=None):
+        flat, self.flat = self.flat, FlatAst()
+        flat.root = root
+        flat.spans = spans
+        return flat
+
+
+def builder_method(kind):
+    def build(self, *args):
+        return self.flat.add(kind, args)
+
+    return build
+
+
+for kind, cls in enumerate(KINDS):
+    setattr(FlatBuilder, cls.__name__, builder_method(kind))
+
+
+class FlatNode:
+    """Mixin of the views, which are subclasses of the cool_inference.ast
+    classes reading their attributes from a FlatAst."""
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, FlatNode)
+            and self.flat is other.flat
+            and self.index == other.index
+        )
+
+    def __hash__(self):
+        return hash((id(self.flat), self.index))
+
+
+def view_property(field, value_kind):
+    if value_kind == NODE:
+
+        def get(self):
+            return self.flat.view(self.flat.fields[self.index * FIELDS + field])
+
+    elif value_kind == STR:
+
+        def get(self):
+            return self.flat.string(self.flat.fields[self.index * FIELDS + field])
+
+    elif value_kind == NODES:
+
+        def get(self):
+            flat = self.flat
+            items = flat.list(flat.fields[self.index * FIELDS + field])
+            return [flat.view(i) for i in items]
+
+    else:
+
+        def get(self):
+            return self.flat.decls(self.flat.fields[self.index * FIELDS + field])
+
+    def set(self, value):
+        self.flat.set_field(self.index, field, value_kind, value)
+
+    return property(get, set)
+
+
+def view_init(self, flat, index):
+    self.flat = flat
+    self.index = index
+
+
+def view_class(cls, layout):
+    namespace = {
+        "__slots__": ("flat", "index"),
+        "__init__": view_init,
+        "nid": property(lambda self: self.index),
+    }
+    if cls is ast.Program:
+        namespace["spans"] = property(lambda self: self.flat.spans)
+    for name, field, value_kind in layout:
+        namespace[name] = view_property(field, value_kind)
+    return type("Flat" + cls.__name__, (FlatNode, cls), namespace)
+
+
+VIEWS = tuple(view_class(cls, layout) for cls, layout in zip(KINDS, LAYOUT))
+
+_parser = None
+
+
+def get_parser():
+    global _parser
+    if _parser is None:
+        from cool_inference.parsing.parser import build_parser
+        from cool_inference.parsing.transformer import CoolASTTransformer
+
+        transformer = CoolASTTransformer(FlatBuilder())
+        _parser = transformer, build_parser(transformer=transformer)
+    return _parser
+
+
+def parse(code):
+    transformer, parser = get_parser()
+    try:
+        root = parser.parse(code)
+    except BaseException:
+        transformer.reset()
+        raise
+    return transformer.nodes.finish(root, transformer.last_spans)
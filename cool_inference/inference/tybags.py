@@ -1,8 +1,14 @@
+from cool_inference.utils.symbols import symbol
+
+
 class TyBags:
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, name=None):
         self.vars = {}
         self.parent = parent
+        # keyed by the node id of the class, method, let or case branch
+        # expression owning the child
         self.children = {}
+        self.name = name
 
     def __len__(self):
         return len(self.vars)
@@ -14,9 +20,9 @@ class TyBags:
             output += "\t" + str(key) + ":" + str(value) + "\n"
         for key, chil in self.children.items():
             output += "\n"
-            try:
-                output += key.id + "--->"
-            except AttributeError:
+            if chil.name is not None:
+                output += chil.name + "--->"
+            else:
                 output += "let or case --->"
             output += "\n"
             output += str(chil)
@@ -25,8 +31,8 @@ class TyBags:
     def __repr__(self):
         return str(self)
 
-    def create_child(self, key):
-        child = TyBags(self)
+    def create_child(self, key, name=None):
+        child = TyBags(self, name)
         self.children[key] = child
         return child
 
@@ -64,6 +70,7 @@ class TyBags:
                 self.modify_variable(var_name, intersection)
 
     def define_variable(self, name, types, lock=False):
+        name = symbol(name)
         if lock:
             self.vars[name] = set.union(set(types), {"@lock"})
         else:
@@ -123,6 +130,7 @@ class TyBags:
 
     def clone(self, ty_bags):
         self.parent = ty_bags.parent
+        self.name = ty_bags.name
         for key, value in ty_bags.vars.items():
             self.vars[key] = value.copy()
         for key, value in ty_bags.children.items():
@@ -1,5 +1,7 @@
 from cool_inference.inference.tybags import TyBags
+from cool_inference.semantics.semantics import METHODS
 from cool_inference.utils.lca import solve_bag
+from cool_inference.utils.tables import NodeTable
 import cool_inference.utils.visitor as visitor
 from cool_inference.ast import (
     Program,
@@ -33,7 +35,7 @@ from cool_inference.ast import (
 )
 
 
-class BagsCollector:
+class BagsCollector(visitor.Visitor):
     def __init__(self, context, errors=[]):
         self.context = context
         self.errors = errors
@@ -57,7 +59,7 @@ class BagsCollector:
         met = io.get_method("in_string")
         met = io.get_method("in_int")
 
-    @visitor.on("node")
+    @visitor.on("node", walk=True)
     def visit(self, node, bags):
         pass
 
@@ -71,7 +73,7 @@ class BagsCollector:
 
     @visitor.when(CoolClass)
     def visit(self, node, tybags):  # noqa: F811
-        tybags = tybags.create_child(node)
+        tybags = tybags.create_child(node.nid, node.id)
 
         self.current_type = self.context.get_type(node.id)
 
@@ -99,15 +101,10 @@ class BagsCollector:
 
         return tybags
 
-    @visitor.when(AttrDecl)
-    def visit(self, node, tybags):  # noqa: F811
-        if node.body is not None:
-            self.visit(node.body, tybags)
-
     @visitor.when(FuncDecl)
     def visit(self, node, tybags):  # noqa: F811
         self.current_method = self.current_type.get_method(node.id)
-        method_tybags = tybags.create_child(node)
+        method_tybags = tybags.create_child(node.nid, node.id)
         self.current_method.tybags = method_tybags
 
         for pname, ptype in zip(
@@ -122,24 +119,9 @@ class BagsCollector:
 
         self.current_method = None
 
-    @visitor.when(Assign)
-    def visit(self, node, tybags):  # noqa: F811
-        if node.value is not None:
-            self.visit(node.value, tybags)
-
-    @visitor.when(Dispatch)
-    def visit(self, node, tybags):  # noqa: F811
-        if node.exp is not None:
-            self.visit(node.exp, tybags)
-
-    @visitor.when(StaticDispatch)
-    def visit(self, node, tybags):  # noqa: F811
-        if node.exp is not None:
-            self.visit(node.exp, tybags)
-
     @visitor.when(LetIn)
     def visit(self, node, tybags):  # noqa: F811
-        let_tybags = tybags.create_child(node)
+        let_tybags = tybags.create_child(node.nid)
         decl_list, exp = node.decl_list, node.exp
 
         for idx, _type, decl in decl_list:
@@ -161,7 +143,7 @@ class BagsCollector:
 
         for idx, typex, case_exp in node.case_list:
 
-            new_tybags = tybags.create_child(case_exp)
+            new_tybags = tybags.create_child(case_exp.nid)
 
             typex = self.context.get_type(typex)
 
@@ -172,91 +154,8 @@ class BagsCollector:
 
             self.visit(case_exp, new_tybags)
 
-    @visitor.when(Block)
-    def visit(self, node, tybags):  # noqa: F811
-        for exp in node.expr_list:
-            self.visit(exp, tybags)
-
-    @visitor.when(Not)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.exp, tybags)
-
-    @visitor.when(Tilde)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.exp, tybags)
-
-    @visitor.when(IsVoid)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.exp, tybags)
-
-    @visitor.when(ParenthExp)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.exp, tybags)
-
-    def binary_visit(self, node, tybags):
-        self.visit(node.left, tybags)
-        self.visit(node.right, tybags)
-
-    @visitor.when(Plus)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Minus)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Div)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Mult)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Leq)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Eq)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Le)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(WhileLoop)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(IfThenElse)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.first, tybags)
-        self.visit(node.second, tybags)
-        self.visit(node.third, tybags)
-
-    @visitor.when(StringExp)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
-
-    @visitor.when(BoolExp)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
-
-    @visitor.when(IntExp)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
-
-    @visitor.when(IdExp)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
-
-    @visitor.when(NewType)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
-
 
-class BagsReducer:
+class BagsReducer(visitor.Visitor):
     def __init__(self, tybags, context, errors=[]):
         self.current_type = None
         self.current_method = None
@@ -286,7 +185,7 @@ class BagsReducer:
     @visitor.when(CoolClass)
     def visit(self, node, tybags, restriction):  # noqa: F811
         self.current_type = self.context.get_type(node.id)
-        tybags = tybags.children[node]
+        tybags = tybags.children[node.nid]
 
         for feat in node.feature_list:
             self.visit(feat, tybags, [])
@@ -300,7 +199,7 @@ class BagsReducer:
     @visitor.when(FuncDecl)
     def visit(self, node, tybags, restriction):  # noqa: F811
         self.current_method = self.current_type.get_method(node.id)
-        method_tybags = tybags.children[node]
+        method_tybags = tybags.children[node.nid]
 
         return_types = self.visit(node.body, method_tybags, [])
 
@@ -328,18 +227,17 @@ class BagsReducer:
         if len(exp_types) > 1:
             types_whith_method = []
             return_types = set([])
-            for key, value in self.context.types.items():
-                for method in value.methods:
-                    if (
-                        key in exp_types
-                        and method.name == node.id
-                        and len(method.param_names) == len(node.exp_list)
-                    ):
-                        types_whith_method.append(key)
-                        return_types = set.union(
-                            return_types, (method.tybags.parent.vars[method.name])
-                        )
-                        break
+            types = self.context.types
+            for key in exp_types:
+                value = types.get(key)
+                if value is None:
+                    continue
+                method = value.tables[METHODS].get(node.id)
+                if method is not None and len(method.param_names) == len(node.exp_list):
+                    types_whith_method.append(key)
+                    return_types = set.union(
+                        return_types, (method.tybags.parent.vars[method.name])
+                    )
 
             if len(types_whith_method) == 0:
                 error = f"""
@@ -382,18 +280,17 @@ class BagsReducer:
         if len(exp_types) > 1:
             types_whith_method = []
             return_types = set([])
-            for key, value in self.context.types.items():
-                for method in value.methods:
-                    if (
-                        key in exp_types
-                        and method.name == node.id
-                        and len(method.param_names) == len(node.exp_list)
-                    ):
-                        types_whith_method.append(key)
-                        return_types = set.union(
-                            return_types, (method.tybags.parent.vars[method.name])
-                        )
-                        break
+            types = self.context.types
+            for key in exp_types:
+                value = types.get(key)
+                if value is None:
+                    continue
+                method = value.tables[METHODS].get(node.id)
+                if method is not None and len(method.param_names) == len(node.exp_list):
+                    types_whith_method.append(key)
+                    return_types = set.union(
+                        return_types, (method.tybags.parent.vars[method.name])
+                    )
 
             if len(types_whith_method) == 0:
                 error = f"""
@@ -430,7 +327,7 @@ class BagsReducer:
 
     @visitor.when(LetIn)
     def visit(self, node, tybags, restriction):  # noqa: F811
-        let_tybags = tybags.children[node]
+        let_tybags = tybags.children[node.nid]
         decl_list, exp = node.decl_list, node.exp
 
         for idx, _type, expx in decl_list:
@@ -451,7 +348,7 @@ class BagsReducer:
 
         for idx, typex, case_exp in node.case_list:
 
-            new_tybags = tybags.children[case_exp]
+            new_tybags = tybags.children[case_exp.nid]
 
             typex = self.context.get_type(typex)
 
@@ -577,15 +474,18 @@ class BagsReducer:
         return set([node.type])
 
 
-class BagsReplacer:
-    def __init__(self, tybags, context, errors=[]):
+class BagsReplacer(visitor.Visitor):
+    def __init__(self, tybags, context, errors=[], types=None):
         self.current_type = None
         self.current_method = None
         self.context = context
         self.errors = errors
         self.tybags = tybags
+        # the inferred types by node id: the type of attributes, methods and
+        # params, and the list of declared types of lets and cases
+        self.types = NodeTable() if types is None else types
 
-    @visitor.on("node")
+    @visitor.on("node", walk=True)
     def visit(self, node, tybags):
         pass
 
@@ -597,7 +497,7 @@ class BagsReplacer:
     @visitor.when(CoolClass)
     def visit(self, node, tybags):  # noqa: F811
         self.current_type = self.context.get_type(node.id)
-        tybags = tybags.children[node]
+        tybags = tybags.children[node.nid]
 
         for feat in node.feature_list:
             self.visit(feat, tybags)
@@ -605,48 +505,36 @@ class BagsReplacer:
 
     @visitor.when(AttrDecl)
     def visit(self, node, tybags):  # noqa: F811
-        node.type = solve_bag(tybags.vars[node.id], self.context)
+        node.type = self.types[node.nid] = solve_bag(tybags.vars[node.id], self.context)
         if node.body is not None:
             self.visit(node.body, tybags)
 
     @visitor.when(FuncDecl)
     def visit(self, node, tybags):  # noqa: F811
         self.current_method = self.current_type.get_method(node.id)
-        method_tybags = tybags.children[node]
+        method_tybags = tybags.children[node.nid]
 
         self.visit(node.body, method_tybags)
-        node.type = solve_bag(tybags.vars[node.id], self.context)
+        types = self.types
+        node.type = types[node.nid] = solve_bag(tybags.vars[node.id], self.context)
         for param in node.params:
-            param.type = solve_bag(method_tybags.vars[param.id], self.context)
+            param.type = types[param.nid] = solve_bag(
+                method_tybags.vars[param.id], self.context
+            )
 
         self.current_method = None
 
-    @visitor.when(Assign)
-    def visit(self, node, tybags):  # noqa: F811
-        if node.value is not None:
-            self.visit(node.value, tybags)
-
-    @visitor.when(Dispatch)
-    def visit(self, node, tybags):  # noqa: F811
-        if node.exp is not None:
-            self.visit(node.exp, tybags)
-
-    @visitor.when(StaticDispatch)
-    def visit(self, node, tybags):  # noqa: F811
-        if node.exp is not None:
-            self.visit(node.exp, tybags)
-
     @visitor.when(LetIn)
     def visit(self, node, tybags):  # noqa: F811
-        let_tybags = tybags.children[node]
+        let_tybags = tybags.children[node.nid]
         decl_list, exp = node.decl_list, node.exp
 
         new_decl_list = []
+        self.types[node.nid] = new_types = []
 
         for idx, _type, expx in decl_list:
-            new_decl_list.append(
-                (idx, solve_bag(let_tybags.vars[idx], self.context), expx)
-            )
+            new_types.append(solve_bag(let_tybags.vars[idx], self.context))
+            new_decl_list.append((idx, new_types[-1], expx))
 
         node.decl_list = new_decl_list
         self.visit(exp, let_tybags)
@@ -656,97 +544,14 @@ class BagsReplacer:
         self.visit(node.exp, tybags)
 
         new_case_list = []
+        self.types[node.nid] = new_types = []
 
         for idx, typex, case_exp in node.case_list:
 
-            new_tybags = tybags.children[case_exp]
+            new_tybags = tybags.children[case_exp.nid]
 
-            new_case_list.append(
-                (idx, solve_bag(new_tybags.vars[idx], self.context), case_exp)
-            )
+            new_types.append(solve_bag(new_tybags.vars[idx], self.context))
+            new_case_list.append((idx, new_types[-1], case_exp))
 
             self.visit(case_exp, new_tybags)
         node.case_list = new_case_list
-
-    @visitor.when(Block)
-    def visit(self, node, tybags):  # noqa: F811
-        for exp in node.expr_list:
-            self.visit(exp, tybags)
-
-    @visitor.when(Not)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.exp, tybags)
-
-    @visitor.when(Tilde)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.exp, tybags)
-
-    @visitor.when(IsVoid)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.exp, tybags)
-
-    @visitor.when(ParenthExp)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.exp, tybags)
-
-    def binary_visit(self, node, tybags):
-        self.visit(node.left, tybags)
-        self.visit(node.right, tybags)
-
-    @visitor.when(Plus)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Minus)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Div)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Mult)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Leq)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Eq)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(Le)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(WhileLoop)
-    def visit(self, node, tybags):  # noqa: F811
-        self.binary_visit(node, tybags)
-
-    @visitor.when(IfThenElse)
-    def visit(self, node, tybags):  # noqa: F811
-        self.visit(node.first, tybags)
-        self.visit(node.second, tybags)
-        self.visit(node.third, tybags)
-
-    @visitor.when(StringExp)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
-
-    @visitor.when(BoolExp)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
-
-    @visitor.when(IntExp)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
-
-    @visitor.when(IdExp)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
-
-    @visitor.when(NewType)
-    def visit(self, node, tybags):  # noqa: F811
-        pass
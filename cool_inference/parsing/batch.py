@@ -0,0 +1,43 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cool_inference import flat
+
+
+def warm():
+    # builds the parser once per worker, before the first file arrives
+    flat.get_parser()
+
+
+def parse_file(path):
+    # runs in the workers, the tree goes back to the parent as the bytes of a
+    # FlatAst, which are much smaller and faster to unpickle than the objects;
+    # errors go back as a (kind, message) pair, flat.parse drops the rows of
+    # a failed parse so the next file of the worker starts clean
+    from lark import UnexpectedCharacters, UnexpectedToken
+
+    try:
+        with open(path, encoding="utf8") as fp:
+            code = fp.read()
+        return path, flat.parse(code).to_bytes(), None
+    except (OSError, ValueError) as e:
+        # a missing file, or one that is not utf8 (UnicodeDecodeError)
+        error = "io", str(e)
+    except UnexpectedCharacters as e:
+        char = code[e.pos_in_stream]
+        error = "lexical", f"Unexpected character {char} at ({e.line}, {e.column})"
+    except UnexpectedToken as e:
+        error = "parsing", f"Unexpected token {e.token} at ({e.line}, {e.column})"
+    return path, None, error
+
+
+def parse_files(paths, workers=None):
+    # parses the files in a pool of processes, yields (path, ast, error) in
+    # the order of paths, where ast is a FlatAst, or None if error is set
+    paths = list(paths)
+    workers = min(workers or os.cpu_count() or 1, max(len(paths), 1))
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=warm) as executor:
+        for path, data, error in executor.map(parse_file, paths, chunksize=chunksize):
+            ast = None if data is None else flat.FlatAst.from_buffer(data)
+            yield path, ast, error
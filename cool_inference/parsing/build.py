@@ -0,0 +1,36 @@
+import io
+import os
+import sys
+from lark import Lark
+from lark.tools.standalone import gen_standalone
+from cool_inference.parsing.parser import (
+    GRAMMAR,
+    OPTIONS,
+    STANDARD_LEXER,
+    grammar_digest,
+)
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standalone.py")
+
+
+def build(path=OUTPUT):
+    out = io.StringIO()
+    # the standard lexer of the generated module uses suppress without
+    # importing it
+    out.write("from contextlib import suppress\n")
+    gen_standalone(
+        Lark(GRAMMAR, lexer=STANDARD_LEXER, **OPTIONS), out=out, compress=True
+    )
+    out.write('GRAMMAR_DIGEST = "%s"\n' % grammar_digest())
+    with open(path, "w") as fp:
+        fp.write(out.getvalue())
+    return path
+
+
+def main():
+    path = build(*sys.argv[1:2])
+    print(f"Standalone parser written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import contextlib
+import hashlib
+import os
+import pickle
+import time
+import zlib
+from cool_inference import __version__
+from cool_inference.parsing.parser import grammar_digest
+from cool_inference.utils.cache import cache_dir
+
+# bumped whenever the layout of the serialized trees changes
+FORMAT = 5
+
+
+class AstCache:
+    def __init__(self, path=None, max_bytes=256 * 2**20, max_age=30 * 24 * 3600):
+        self.path = path if path is not None else os.path.join(cache_dir(), "ast")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def key(self, code):
+        salt = f"{FORMAT}:{__version__}:{grammar_digest()}:"
+        return hashlib.sha256((salt + code).encode("utf8")).hexdigest()
+
+    def file(self, code):
+        return os.path.join(self.path, self.key(code) + ".ast")
+
+    def get(self, code):
+        filename = self.file(code)
+        try:
+            with open(filename, "rb") as fp:
+                ast = pickle.loads(zlib.decompress(fp.read()))
+            os.utime(filename)
+        except Exception:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return ast
+
+    def put(self, code, ast):
+        filename = self.file(code)
+        data = zlib.compress(pickle.dumps(ast, pickle.HIGHEST_PROTOCOL))
+        tmp = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp, filename)
+
+    def parse(self, code):
+        ast = self.get(code)
+        if ast is None:
+            from cool_inference.parsing.parser import parser
+
+            ast = parser.parse(code)
+            self.put(code, ast)
+        return ast
+
+    def entries(self):
+        # another process sharing the cache may remove an entry at any time
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".ast"):
+                with contextlib.suppress(FileNotFoundError):
+                    yield entry.path, entry.stat()
+
+    def evict(self):
+        now = time.time()
+        entries = []
+        for path, stat in self.entries():
+            if now - stat.st_mtime > self.max_age:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(s for _, s, _ in entries)
+        entries.sort()
+        removed = 0
+        while size > self.max_bytes and removed < len(entries):
+            _, entry_size, path = entries[removed]
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            size -= entry_size
+            removed += 1
+
+    def stats(self):
+        sizes = [stat.st_size for _, stat in self.entries()]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(sizes),
+            "bytes": sum(sizes),
+        }
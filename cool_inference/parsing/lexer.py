@@ -0,0 +1,144 @@
+import re
+from lark.exceptions import UnexpectedCharacters
+from lark.lexer import Lexer, Token
+
+KEYWORDS = {
+    "class": "CLASS",
+    "inherits": "INHERITS",
+    "not": "NOT",
+    "isvoid": "ISVOID",
+    "if": "IF",
+    "then": "THEN",
+    "else": "ELSE",
+    "fi": "FI",
+    "while": "WHILE",
+    "loop": "LOOP",
+    "pool": "POOL",
+    "let": "LET",
+    "in": "IN",
+    "case": "CASE",
+    "of": "OF",
+    "new": "NEW",
+    "true": "TRUE",
+    "false": "FALSE",
+    "esac": "ESAC",
+}
+
+# two character symbols are looked up before single character ones
+SYMBOLS = {
+    "<-": "LEFT_ARROW",
+    "=>": "RIGHT_ARROW",
+    "<=": "LEQ",
+    ";": "SEMICOLON",
+    "{": "OCURLY",
+    "}": "CCURLY",
+    "(": "OPAR",
+    ")": "CPAR",
+    ",": "COMMA",
+    ":": "COLON",
+    "<": "LE",
+    "=": "EQ",
+    "+": "PLUS",
+    "-": "MINUS",
+    "*": "STAR",
+    "/": "SLASH",
+    "~": "TILDE",
+    ".": "DOT",
+    "@": "AT",
+}
+
+# same languages as TYPE, ID, INT, ESCAPED_STRING and WS in the grammar
+NAME = re.compile(r"[A-Za-z](?:[A-Za-z_][A-Za-z0-9_]*)?")
+INT = re.compile(r"[0-9]+")
+STRING = re.compile(r'"(?:.*?(?<!\\)(?:\\\\)*?)"')
+WS = re.compile(r"[ \t\f\r\n]+")
+
+WS_START, NAME_START, INT_START, STRING_START = range(4)
+
+FIRST = {}
+FIRST.update((c, WS_START) for c in " \t\f\r\n")
+FIRST.update((c, NAME_START) for c in "abcdefghijklmnopqrstuvwxyz")
+FIRST.update((c, NAME_START) for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+FIRST.update((c, INT_START) for c in "0123456789")
+FIRST['"'] = STRING_START
+
+
+def tokenize(text, pos=0, end=None, line=1):
+    # pos, end and line allow lexing a slice of text (starting at the given
+    # line) with token positions relative to the whole text
+    first = FIRST
+    keywords = KEYWORDS
+    symbols = SYMBOLS
+
+    line_start = text.rfind("\n", 0, pos) + 1
+    if end is None:
+        end = len(text)
+
+    while pos < end:
+        char = text[pos]
+        kind = first.get(char)
+
+        if kind is WS_START:
+            match = WS.match(text, pos, end)
+            newlines = match.group().count("\n")
+            if newlines:
+                line += newlines
+                line_start = text.rindex("\n", pos, match.end()) + 1
+            pos = match.end()
+            continue
+
+        if kind is NAME_START:
+            match = NAME.match(text, pos, end)
+            value = match.group()
+            type_ = keywords.get(value)
+            if type_ is None:
+                type_ = "TYPE" if char.isupper() else "ID"
+        elif kind is INT_START:
+            value = INT.match(text, pos, end).group()
+            type_ = "INT"
+        elif kind is STRING_START:
+            match = STRING.match(text, pos, end)
+            if match is None:
+                raise UnexpectedCharacters(text, pos, line, pos - line_start + 1)
+            value = match.group()
+            type_ = "ESCAPED_STRING"
+        else:
+            value = text[pos : min(pos + 2, end)]
+            type_ = symbols.get(value)
+            if type_ is None:
+                value = char
+                type_ = symbols.get(value)
+                if type_ is None:
+                    raise UnexpectedCharacters(text, pos, line, pos - line_start + 1)
+
+        column = pos - line_start + 1
+        size = len(value)
+        yield Token(
+            type_,
+            value,
+            pos,
+            line,
+            column,
+            line,
+            column + size,
+            pos + size,
+        )
+        pos += size
+
+
+class CoolLexer(Lexer):
+    def __init__(self, lexer_conf):
+        pass
+
+    def lex(self, data):
+        return tokenize(data)
+
+
+class TokenLexer(Lexer):
+    # hands the parser tokens that were already produced by tokenize, used by
+    # the streaming front end to parse the file one class at a time
+    def __init__(self, lexer_conf):
+        pass
+
+    def lex(self, data):
+        return iter(data)
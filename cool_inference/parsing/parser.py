@@ -1,36 +1,38 @@
-from lark import Lark
-from cool_inference.parsing.transformer import CoolASTTransformer
+import os
+from cool_inference.utils.cache import cache_dir
 
 # flake8: noqa
 
-parser = Lark(
-    """
-          ?start : (class SEMICOLON)+
+# string literals in the rules (punctuation and most keywords) are filtered
+# out of the children passed to the transformer, named terminals are kept:
+# the values, and the first and last token of a rule, which give its span
+GRAMMAR = """
+          ?start : (class ";")* class SEMICOLON
 
-          ?class : CLASS TYPE [INHERITS TYPE] OCURLY (feature SEMICOLON)* CCURLY -> cool_class
+          ?class : CLASS TYPE ["inherits" TYPE] "{" (feature ";")* CCURLY -> cool_class
 
-        ?feature : ID OPAR [param (COMMA param)*] CPAR COLON TYPE OCURLY expr CCURLY -> func_decl
-                 | ID COLON TYPE [LEFT_ARROW expr]  -> attr_decl
+        ?feature : ID "(" (param ("," param)*)? ")" ":" TYPE "{" expr CCURLY -> func_decl
+                 | ID ":" TYPE ["<-" expr]  -> attr_decl
 
-          ?param : ID COLON TYPE -> param
+          ?param : ID ":" TYPE -> param
 
-           ?expr : ID LEFT_ARROW expr -> assign
+           ?expr : ID "<-" expr -> assign
                  | not
 
             ?not : NOT not -> not_expr
                  | comparison
 
-     ?comparison : arithmetic LEQ arithmetic -> comparison_leq
-                 | arithmetic LE arithmetic -> comparison_le
-                 | arithmetic EQ arithmetic -> comparison_eq
+     ?comparison : arithmetic "<=" arithmetic -> comparison_leq
+                 | arithmetic "<" arithmetic -> comparison_le
+                 | arithmetic "=" arithmetic -> comparison_eq
                  | arithmetic
 
-     ?arithmetic : arithmetic PLUS term -> arithmetic_add
-                 | arithmetic MINUS term -> arithmetic_sub
+     ?arithmetic : arithmetic "+" term -> arithmetic_add
+                 | arithmetic "-" term -> arithmetic_sub
                  | term
 
-           ?term : term STAR factor -> term_mul
-                 | term SLASH factor -> term_div
+           ?term : term "*" factor -> term_mul
+                 | term "/" factor -> term_div
                  | factor
 
          ?factor : ISVOID factor -> isvoid_expr
@@ -39,21 +41,21 @@ parser = Lark(
           ?tilde : TILDE tilde -> tilde_expr
                  | dispatch
 
-       ?dispatch : dispatch DOT ID OPAR [expr (COMMA expr)*] CPAR -> dispatch
-                 | ID OPAR [expr (COMMA expr)*] CPAR -> dispatch
+       ?dispatch : dispatch "." ID "(" (expr ("," expr)*)? CPAR -> dispatch
+                 | ID "(" (expr ("," expr)*)? CPAR -> self_dispatch
                  | static_dispatch
 
-?static_dispatch : static_dispatch AT TYPE DOT ID OPAR [expr (COMMA expr)*] CPAR -> static_dispatch
+?static_dispatch : static_dispatch "@" TYPE "." ID "(" (expr ("," expr)*)? CPAR -> static_dispatch
                  | atom
 
-           ?atom : IF expr THEN expr ELSE expr FI -> if_expr
-                 | WHILE expr LOOP expr POOL -> while_expr
-                 | LET ID COLON TYPE [LEFT_ARROW expr] [(COMMA ID COLON TYPE [LEFT_ARROW expr])*] IN expr -> let_expr
-                 | CASE expr OF (ID COLON TYPE RIGHT_ARROW expr SEMICOLON)+ ESAC -> case_expr
+           ?atom : IF expr "then" expr "else" expr FI -> if_expr
+                 | WHILE expr "loop" expr POOL -> while_expr
+                 | LET ID ":" TYPE ["<-" expr] ("," ID ":" TYPE ["<-" expr])* "in" expr -> let_expr
+                 | CASE expr "of" (ID ":" TYPE "=>" expr ";")+ ESAC -> case_expr
                  | NEW TYPE -> new_expr
                  | OPAR expr CPAR -> parenthized_expr
                  | ID -> var_expr
-                 | OCURLY expr SEMICOLON [(expr SEMICOLON)*] CCURLY -> block_expr
+                 | OCURLY (expr ";")+ CCURLY -> block_expr
                  | constant
 
        ?constant : INT  -> integer_atom
@@ -115,7 +117,144 @@ ESAC : "esac"
 
 
 %ignore WS
-""",
-    parser="lalr",
-    transformer=CoolASTTransformer(),
-)
+"""
+
+# an optional [...] that is not matched gives None, so the children of every
+# rule are at fixed positions
+OPTIONS = dict(parser="lalr", maybe_placeholders=True)
+
+# lark's standard lexer reserves the keywords everywhere, like the hand written
+# one used by --stream, --recover and reparse, so every front end accepts the
+# same programs (the contextual lexer reads "classC" as class C, and "in" as
+# an identifier where no keyword is expected)
+STANDARD_LEXER = "standard"
+
+_grammar_digest = None
+
+
+def grammar_digest():
+    # the digest of the grammar and of its options, computed the first time
+    # it is needed so importing this module does not pay for hashlib
+    global _grammar_digest
+    if _grammar_digest is None:
+        import hashlib
+
+        text = GRAMMAR + repr(sorted(OPTIONS.items())) + STANDARD_LEXER
+        _grammar_digest = hashlib.sha256(text.encode("utf8")).hexdigest()
+    return _grammar_digest
+
+
+# "auto" uses the generated standalone module when it is present and up to
+# date, "lark" always builds the parser with lark, "standalone" requires the
+# generated module (see cool_inference.parsing.build)
+BACKEND = os.environ.get("COOL_INFERENCE_PARSER", "auto")
+
+# "standard" is lark's own lexer, "fast" is the hand written one in
+# cool_inference.parsing.lexer (only available with the lark backend)
+LEXER = os.environ.get("COOL_INFERENCE_LEXER", STANDARD_LEXER)
+
+
+def cache_file(lexer=STANDARD_LEXER):
+    import hashlib
+    import lark
+
+    key = hashlib.sha256((grammar_digest() + lark.__version__).encode("utf8"))
+    return os.path.join(cache_dir(), "lalr-%s-%s.tmp" % (lexer, key.hexdigest()[:16]))
+
+
+def build_parser(cache=True, lexer=STANDARD_LEXER, transformer=None):
+    from lark import Lark
+
+    from cool_inference.parsing.transformer import CoolASTTransformer
+
+    if transformer is None:
+        transformer = CoolASTTransformer()
+
+    options = dict(OPTIONS, lexer=lexer, transformer=transformer)
+    if lexer == "fast":
+        from cool_inference.parsing.lexer import CoolLexer
+
+        options["lexer"] = CoolLexer
+    elif lexer == "tokens":
+        from cool_inference.parsing.lexer import TokenLexer
+
+        options["lexer"] = TokenLexer
+
+    if cache:
+        try:
+            return Lark(GRAMMAR, cache=cache_file(lexer), **options)
+        except OSError:
+            pass
+    return Lark(GRAMMAR, **options)
+
+
+class Parser:
+    # the parser of the module, a parse that raises drops the spans of the
+    # nodes it built so the ids of the next one start at 0 again
+    def __init__(self, parser, transformer):
+        self.parser = parser
+        self.transformer = transformer
+
+    def parse(self, text, *args, **kw):
+        try:
+            return self.parser.parse(text, *args, **kw)
+        except BaseException:
+            self.transformer.reset()
+            raise
+
+    def __getattr__(self, name):
+        return getattr(self.parser, name)
+
+
+def load_standalone():
+    try:
+        from cool_inference.parsing import standalone
+    except ImportError:
+        return None
+    if getattr(standalone, "GRAMMAR_DIGEST", None) != grammar_digest():
+        return None
+    return standalone
+
+
+def load():
+    global parser, standalone, UnexpectedCharacters, UnexpectedToken
+    from cool_inference.parsing.transformer import CoolASTTransformer
+
+    if LEXER == STANDARD_LEXER and BACKEND != "lark":
+        standalone = load_standalone()
+    else:
+        standalone = None
+
+    if standalone is not None:
+        UnexpectedCharacters = standalone.UnexpectedCharacters
+        UnexpectedToken = standalone.UnexpectedToken
+        transformer = CoolASTTransformer()
+        parser = Parser(
+            standalone.Lark_StandAlone(transformer=transformer), transformer
+        )
+    elif BACKEND == "standalone":
+        raise ImportError(
+            "Standalone parser is missing or out of date, "
+            "run `python -m cool_inference.parsing.build`"
+        )
+    else:
+        from lark import UnexpectedCharacters, UnexpectedToken
+
+        transformer = CoolASTTransformer()
+        parser = Parser(
+            build_parser(
+                cache=os.environ.get("COOL_INFERENCE_NO_CACHE") is None,
+                lexer=LEXER,
+                transformer=transformer,
+            ),
+            transformer,
+        )
+
+
+# the parser is built the first time it is requested, so importing this module
+# does not pay for loading lark or the parsing tables
+def __getattr__(name):
+    if name in ("parser", "standalone", "UnexpectedCharacters", "UnexpectedToken"):
+        load()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,160 @@
+from lark import Token, UnexpectedCharacters, UnexpectedToken
+
+from cool_inference.ast import Program
+from cool_inference.parsing.lexer import tokenize
+from cool_inference.parsing.spans import SpanTable
+from cool_inference.parsing.stream import ClassTransformer
+
+
+def tokenize_all(code, errors):
+    # like tokenize, but unexpected characters are recorded and skipped
+    pos, line = 0, 1
+    while True:
+        try:
+            yield from tokenize(code, pos, None, line)
+            return
+        except UnexpectedCharacters as e:
+            errors.append(e)
+            pos, line = e.pos_in_stream + 1, e.line
+
+
+def split_classes(tokens):
+    # like stream.split, but the class keyword always starts a new class, so
+    # a class that is not closed does not swallow the next ones
+    chunk = []
+    depth = 0
+    closed = False
+    for token in tokens:
+        if token.type == "CLASS" and chunk:
+            yield chunk
+            chunk, depth, closed = [], 0, False
+        chunk.append(token)
+        if token.type == "OCURLY":
+            depth += 1
+        elif token.type == "CCURLY":
+            depth -= 1
+            closed = depth == 0
+        elif token.type == "SEMICOLON" and closed:
+            yield chunk
+            chunk, depth, closed = [], 0, False
+    if chunk:
+        yield chunk
+
+
+class RecoveringParser:
+    def __init__(self):
+        from cool_inference.parsing.parser import build_parser
+
+        self.transformer = ClassTransformer()
+        self.parser = build_parser(lexer="tokens", transformer=self.transformer)
+
+    def parse(self, code):
+        # returns a program with every class that could be parsed, and the
+        # list of syntax errors (UnexpectedCharacters and UnexpectedToken)
+        errors = []
+        spans = self.transformer.spans = SpanTable()
+        class_list = []
+        for chunk in split_classes(tokenize_all(code, errors)):
+            first = len(spans)
+            cool_class = self.parse_class(chunk, errors)
+            if cool_class is not None:
+                spans.first[cool_class.nid] = first
+                class_list.append(cool_class)
+                end = chunk[-1].end_pos
+
+        if not class_list and not errors:
+            # an empty program
+            try:
+                self.parser.parse([])
+            except UnexpectedToken as e:
+                errors.append(e)
+
+        program = Program(class_list, spans)
+        if class_list:
+            start, _, line, column = spans.span(class_list[0].nid)
+            program.nid = spans.add(start, end, line, column)
+        else:
+            program.nid = spans.add(0, 0, 1, 1)
+        return program, errors
+
+    def parse_class(self, tokens, errors):
+        # the parser stacks are saved after the opening brace of the class and
+        # after every feature; after an error the tokens are skipped up to the
+        # end of the feature (a semicolon in the class body) or of the class,
+        # and parsing resumes from the last saved stacks. lark's own copy of
+        # the interactive parser deep copies the nodes, so it is not used
+        interactive = self.parser.parse_interactive()
+        state = interactive.parser_state
+        saved = None
+        depth = 0
+        skipping = False
+
+        for token in tokens:
+            if token.type == "OCURLY":
+                depth += 1
+            elif token.type == "CCURLY":
+                depth -= 1
+            feature_end = token.type == "SEMICOLON" and depth == 1
+            class_end = token.type == "CCURLY" and depth == 0
+
+            if skipping:
+                if not (feature_end or class_end):
+                    continue
+                skipping = False
+                state.state_stack, state.value_stack = map(list, saved)
+                if feature_end:
+                    continue
+
+            try:
+                interactive.feed_token(token)
+            except UnexpectedToken as e:
+                errors.append(e)
+                if saved is None:
+                    return None
+                state.state_stack, state.value_stack = map(list, saved)
+                if class_end:
+                    interactive.feed_token(token)
+                else:
+                    skipping = not feature_end
+                continue
+
+            if (feature_end or token.type == "OCURLY" and depth == 1) and (
+                "CCURLY" in interactive.choices()
+            ):
+                saved = list(state.state_stack), list(state.value_stack)
+
+        last = tokens[-1]
+        pending = list(state.state_stack), list(state.value_stack)
+        try:
+            return interactive.feed_eof(last)
+        except UnexpectedToken as e:
+            if not skipping:
+                errors.append(e)
+
+        # the class was not closed, it keeps the features parsed so far, and
+        # the last one too if it is complete
+        attempts = [(saved, ("CCURLY", "SEMICOLON"))]
+        if not skipping:
+            attempts.insert(0, (pending, ("SEMICOLON", "CCURLY", "SEMICOLON")))
+        for stacks, closing in attempts:
+            if stacks is None:
+                continue
+            state.state_stack, state.value_stack = map(list, stacks)
+            try:
+                for kind in closing:
+                    value = "}" if kind == "CCURLY" else ";"
+                    interactive.feed_token(Token.new_borrow_pos(kind, value, last))
+                return interactive.feed_eof(last)
+            except UnexpectedToken:
+                pass
+        return None
+
+
+_parser = None
+
+
+def parse(code):
+    global _parser
+    if _parser is None:
+        _parser = RecoveringParser()
+    return _parser.parse(code)
@@ -0,0 +1,55 @@
+from array import array
+
+
+class SpanTable:
+    """Source span of every node, indexed by the node id (nid) assigned by
+    the parser: start and end offsets, and line and column of the start."""
+
+    def __init__(self):
+        self.start = array("i")
+        self.end = array("i")
+        self.line = array("i")
+        self.column = array("i")
+        # nid of the first node of each class, keyed by the class nid, the
+        # nodes of a class are created one after the other and the class last
+        self.first = {}
+
+    def __len__(self):
+        return len(self.start)
+
+    def add(self, start, end, line, column):
+        self.start.append(start)
+        self.end.append(end)
+        self.line.append(line)
+        self.column.append(column)
+        return len(self.start) - 1
+
+    def truncate(self, size):
+        # drops the nodes from the nid size on, the ones of a failed parse
+        del self.start[size:], self.end[size:], self.line[size:], self.column[size:]
+        for nid in [nid for nid in self.first if nid >= size]:
+            del self.first[nid]
+
+    def shift(self, first, last, delta, lines):
+        # moves the nodes in the [first, last) nid range after an edit before
+        # them that inserted delta characters and lines newlines
+        start, end, line = self.start, self.end, self.line
+        if delta:
+            start[first:last] = array("i", [pos + delta for pos in start[first:last]])
+            end[first:last] = array("i", [pos + delta for pos in end[first:last]])
+        if lines:
+            line[first:last] = array("i", [row + lines for row in line[first:last]])
+
+    def shift_columns(self, first, last, line, columns):
+        # moves the nodes in the [first, last) nid range that start in the
+        # given line, after an edit in that line before them
+        column = self.column
+        for nid in range(first, last):
+            if self.line[nid] == line:
+                column[nid] += columns
+
+    def span(self, nid):
+        return self.start[nid], self.end[nid], self.line[nid], self.column[nid]
+
+    def text(self, code, nid):
+        return code[self.start[nid] : self.end[nid]]
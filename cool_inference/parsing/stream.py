@@ -0,0 +1,174 @@
+from bisect import bisect_right
+
+from cool_inference.ast import Program
+from cool_inference.parsing.lexer import tokenize
+from cool_inference.parsing.spans import SpanTable
+from cool_inference.parsing.transformer import CoolASTTransformer
+
+
+def split(tokens):
+    # groups the tokens of every top level class, a class ends at the first
+    # semicolon found after its braces are closed; only the tokens of the
+    # class being parsed are kept alive
+    chunk = []
+    depth = 0
+    closed = False
+    for token in tokens:
+        chunk.append(token)
+        if token.type == "OCURLY":
+            depth += 1
+        elif token.type == "CCURLY":
+            depth -= 1
+            closed = depth == 0
+        elif token.type == "SEMICOLON" and closed:
+            yield chunk
+            chunk = []
+            closed = False
+    if chunk:
+        yield chunk
+
+
+class ClassTransformer(CoolASTTransformer):
+    # each parse holds a single class, spans are kept in the same table for
+    # the whole file so node ids stay unique
+    def start(self, children):
+        return children[0]
+
+
+class StreamParser:
+    def __init__(self):
+        from cool_inference.parsing.parser import build_parser
+
+        self.transformer = ClassTransformer()
+        self.parser = build_parser(lexer="tokens", transformer=self.transformer)
+
+    def classes(self, code):
+        spans = self.transformer.spans = SpanTable()
+        for chunk in split(tokenize(code)):
+            self.end = chunk[-1].end_pos
+            yield self.parse_class(chunk, spans)
+
+    def parse_class(self, tokens, spans):
+        first = len(spans)
+        cool_class = self.parser.parse(tokens)
+        spans.first[cool_class.nid] = first
+        return cool_class
+
+    def parse(self, code, on_class=None):
+        class_list = []
+        for cool_class in self.classes(code):
+            if on_class is not None:
+                on_class(cool_class)
+            class_list.append(cool_class)
+
+        if not class_list:
+            # raises the same error as parsing the empty program at once
+            self.parser.parse([])
+
+        spans = self.transformer.spans
+        start, _, line, column = spans.span(class_list[0].nid)
+        program = Program(class_list, spans)
+        program.nid = spans.add(start, self.end, line, column)
+        return program
+
+    def reparse(self, program, code, edit):
+        # edit is a (start, end, text) tuple replacing code[start:end] with
+        # text; only the classes touched by the edit are parsed again and
+        # spliced into program, which is updated in place. Returns the new
+        # code, a syntax error leaves program as it was
+        edit_start, edit_end, text = edit
+        new_code = code[:edit_start] + text + code[edit_end:]
+        delta = len(text) - (edit_end - edit_start)
+
+        spans = program.spans
+        class_list = program.cool_class_list
+        starts = [spans.start[cool_class.nid] for cool_class in class_list]
+
+        # the text of a class runs from its start to the start of the next one,
+        # the first one also owns whatever comes before it
+        lo = max(bisect_right(starts, edit_start) - 1, 0)
+        hi = max(bisect_right(starts, edit_end) - 1, lo)
+        if lo:
+            region_start, line = starts[lo], spans.line[class_list[lo].nid]
+        else:
+            region_start, line = 0, 1
+        if hi + 1 < len(class_list):
+            old_end = starts[hi + 1]
+        else:
+            old_end = len(code)
+        new_end = old_end + delta
+
+        if not spans.first:
+            # a whole file parse creates the nodes of every class in a row
+            first = 0
+            for cool_class in class_list:
+                spans.first[cool_class.nid] = first
+                first = cool_class.nid + 1
+
+        self.transformer.spans = spans
+        size = len(spans)
+        classes = []
+        try:
+            for chunk in split(tokenize(new_code, region_start, new_end, line)):
+                classes.append(self.parse_class(chunk, spans))
+            if not classes and hi - lo + 1 == len(class_list):
+                self.parser.parse([])
+        except BaseException:
+            spans.truncate(size)
+            raise
+
+        end = spans.end[program.nid]
+        if hi + 1 < len(class_list):
+            lines = new_code.count("\n", region_start, new_end) - code.count(
+                "\n", region_start, old_end
+            )
+            columns = (new_end - new_code.rfind("\n", 0, new_end)) - (
+                old_end - code.rfind("\n", 0, old_end)
+            )
+            # the classes that start in the line where the edit ends also
+            # change their column
+            line = spans.line[class_list[hi + 1].nid]
+            ranges = []
+            for cool_class in class_list[hi + 1 :]:
+                first = spans.first[cool_class.nid]
+                if columns and spans.line[cool_class.nid] == line:
+                    spans.shift_columns(first, cool_class.nid + 1, line, columns)
+                if ranges and ranges[-1][1] == first:
+                    ranges[-1][1] = cool_class.nid + 1
+                else:
+                    ranges.append([first, cool_class.nid + 1])
+            for first, last in ranges:
+                spans.shift(first, last, delta, lines)
+            end += delta
+        elif classes:
+            end = chunk[-1].end_pos
+        else:
+            end = new_code.index(";", spans.end[class_list[lo - 1].nid]) + 1
+
+        for cool_class in class_list[lo : hi + 1]:
+            del spans.first[cool_class.nid]
+        class_list[lo : hi + 1] = classes
+        first = class_list[0].nid
+        spans.start[program.nid] = spans.start[first]
+        spans.end[program.nid] = end
+        spans.line[program.nid] = spans.line[first]
+        spans.column[program.nid] = spans.column[first]
+        return new_code
+
+
+_parser = None
+
+
+def get_parser():
+    global _parser
+    if _parser is None:
+        _parser = StreamParser()
+    return _parser
+
+
+def parse(code, on_class=None):
+    return get_parser().parse(code, on_class)
+
+
+def reparse(program, code, edit):
+    return get_parser().reparse(program, code, edit)
@@ -1,252 +1,196 @@
-from lark import Transformer
-from cool_inference.ast import (
-    Program,
-    CoolClass,
-    FuncDecl,
-    AttrDecl,
-    Param,
-    Assign,
-    Not,
-    Le,
-    Leq,
-    Eq,
-    Plus,
-    Minus,
-    Mult,
-    Div,
-    IsVoid,
-    Dispatch,
-    StaticDispatch,
-    IfThenElse,
-    WhileLoop,
-    LetIn,
-    Case,
-    NewType,
-    ParenthExp,
-    IdExp,
-    Block,
-    IntExp,
-    StringExp,
-    BoolExp,
-    Tilde,
-)
-
-
-class CoolASTTransformer(Transformer):
-    def start(self, children):
-        class_list = []
-        for item in children:
-            try:
-                if item.value == ";":
-                    pass
-            except AttributeError:
-                class_list.append(item)
-        return Program(class_list)
-
-    def cool_class(self, children):
-        name = children[1].value
-        if children[2].value == "inherits":
-            inherit = children[3].value
-            n = 5
+import cool_inference.ast as ast
+from cool_inference.parsing.spans import SpanTable
+from cool_inference.utils.symbols import symbol
+
+
+class CoolASTTransformer:
+    def __init__(self, nodes=ast):
+        # nodes provides the constructors, cool_inference.ast builds the usual
+        # object tree and cool_inference.flat.FlatBuilder builds a flat one
+        self.nodes = nodes
+        self.spans = SpanTable()
+        self.last_spans = None
+
+    def __getstate__(self):
+        # lark pickles its options, the transformer included, when it writes
+        # the parser cache; the transformer given when loading replaces it
+        return None
+
+    def reset(self):
+        # drops the spans (and the flat rows) of a parse that failed, so the
+        # next parse numbers its nodes from 0
+        self.spans = SpanTable()
+        reset = getattr(self.nodes, "reset", None)
+        if reset is not None:
+            reset()
+
+    def mark(self, node, children):
+        # the node spans from its first to its last child, which are either
+        # tokens or already marked nodes (the flat builder uses the node
+        # index, equal to its nid, instead of a node object)
+        spans = self.spans
+        first, last = children[0], children[-1]
+        if isinstance(first, str):
+            start, line, column = first.start_pos, first.line, first.column
         else:
-            inherit = None
-            n = 3
-
-        feat_list = []
+            nid = first if isinstance(first, int) else first.nid
+            start, line, column = spans.start[nid], spans.line[nid], spans.column[nid]
+        if isinstance(last, str):
+            end = last.end_pos
+        else:
+            end = spans.end[last if isinstance(last, int) else last.nid]
 
-        while n < len(children):
-            try:
-                if children[n].value == "}":
-                    break
-            except AttributeError:
-                feat_list.append(children[n])
+        nid = spans.add(start, end, line, column)
+        if not isinstance(node, int):
+            node.nid = nid
+            ast.summarize(node)
+        return node
 
-            n += 1
+    def start(self, children):
+        # the classes and the last semicolon
+        program = self.mark(self.nodes.Program(children[:-1]), children)
+        self.last_spans, self.spans = self.spans, SpanTable()
+        if not isinstance(program, int):
+            program.spans = self.last_spans
+        return program
 
-        return CoolClass(feat_list, name, inherit)
+    def cool_class(self, children):
+        # class TYPE [inherits TYPE] { (feature ;)* }
+        name, inherit = symbol(children[1].value), children[2]
+        if inherit is not None:
+            inherit = symbol(inherit.value)
+        return self.mark(self.nodes.CoolClass(children[3:-1], name, inherit), children)
 
     def func_decl(self, children):
-        idx = children[0].value
-        param_list = []
-        n = 2
-        while n < len(children):
-            try:
-                if children[n].value == ")":
-                    break
-                elif children[n].value == ",":
-                    n += 1
-            except AttributeError:
-                param_list.append(children[n])
-                n += 1
-
-        n += 2
-        return_type = children[n].value
-        n += 2
-        expr_body = children[n]
-        return FuncDecl(idx, param_list, expr_body, return_type)
+        # ID ( param, ... ) : TYPE { expr }
+        return self.mark(
+            self.nodes.FuncDecl(
+                symbol(children[0].value),
+                children[1:-3],
+                children[-2],
+                symbol(children[-3].value),
+            ),
+            children,
+        )
 
     def attr_decl(self, children):
-        idx = children[0].value
-        typex = children[2].value
-        if len(children) > 3:
-            body = children[4]
-        else:
-            body = None
-
-        return AttrDecl(idx, typex, body)
+        # ID : TYPE [<- expr]
+        idx, typex, body = children
+        if body is None:
+            children = children[:-1]
+        return self.mark(
+            self.nodes.AttrDecl(symbol(idx.value), symbol(typex.value), body), children
+        )
 
     def param(self, children):
-        return Param(children[2].value, children[0].value)
+        return self.mark(
+            self.nodes.Param(symbol(children[1].value), symbol(children[0].value)),
+            children,
+        )
 
     def assign(self, children):
-        return Assign(children[0].value, children[2])
+        return self.mark(
+            self.nodes.Assign(symbol(children[0].value), children[1]), children
+        )
 
     def not_expr(self, children):
-        return Not(children[1])
+        return self.mark(self.nodes.Not(children[1]), children)
 
     def comparison_leq(self, children):
-        return Leq(children[0], children[2])
+        return self.mark(self.nodes.Leq(children[0], children[1]), children)
 
     def comparison_le(self, children):
-        return Le(children[0], children[2])
+        return self.mark(self.nodes.Le(children[0], children[1]), children)
 
     def comparison_eq(self, children):
-        return Eq(children[0], children[2])
+        return self.mark(self.nodes.Eq(children[0], children[1]), children)
 
     def arithmetic_add(self, children):
-        return Plus(children[0], children[2])
+        return self.mark(self.nodes.Plus(children[0], children[1]), children)
 
     def arithmetic_sub(self, children):
-        return Minus(children[0], children[2])
+        return self.mark(self.nodes.Minus(children[0], children[1]), children)
 
     def term_mul(self, children):
-        return Mult(children[0], children[2])
+        return self.mark(self.nodes.Mult(children[0], children[1]), children)
 
     def term_div(self, children):
-        return Div(children[0], children[2])
+        return self.mark(self.nodes.Div(children[0], children[1]), children)
 
     def isvoid_expr(self, children):
-        return IsVoid(children[1])
+        return self.mark(self.nodes.IsVoid(children[1]), children)
 
     def tilde_expr(self, children):
-        return Tilde(children[1])
+        return self.mark(self.nodes.Tilde(children[1]), children)
 
     def dispatch(self, children):
-        if children[1].value == ".":
-            exp = children[0]
-            idx = children[2]
-            n = 4
-        elif children[1].value == "(":
-            exp = IdExp("self")
-            idx = children[0]
-            n = 2
-
-        args = []
-        while n < len(children):
-            try:
-                if children[n].value == ")":
-                    break
-            except AttributeError:
-                args.append(children[n])
-                n += 2
-
-        return Dispatch(exp, idx, args)
-
-    def staticDispatch(self, children):
-        exp_type = children[0]
-        static_type = children[2]
-        idx = children[4]
-
-        args = []
-        n = 6
-        while n < len(children):
-            try:
-                if children[n].value == ")":
-                    break
-            except AttributeError:
-                args.append(children[n])
-                n += 2
-
-        return StaticDispatch(exp_type, static_type, idx, args)
+        # expr . ID ( expr, ... )
+        return self.mark(
+            self.nodes.Dispatch(children[0], symbol(children[1].value), children[2:-1]),
+            children,
+        )
+
+    def self_dispatch(self, children):
+        # ID ( expr, ... )
+        exp = self.mark(self.nodes.IdExp(symbol("self")), children[:1])
+        return self.mark(
+            self.nodes.Dispatch(exp, symbol(children[0].value), children[1:-1]),
+            children,
+        )
+
+    def static_dispatch(self, children):
+        # expr @ TYPE . ID ( expr, ... )
+        return self.mark(
+            self.nodes.StaticDispatch(
+                children[0],
+                symbol(children[1].value),
+                symbol(children[2].value),
+                children[3:-1],
+            ),
+            children,
+        )
 
     def if_expr(self, children):
-        return IfThenElse(children[1], children[3], children[5])
+        return self.mark(
+            self.nodes.IfThenElse(children[1], children[2], children[3]), children
+        )
 
     def while_expr(self, children):
-        return WhileLoop(children[1], children[3])
+        return self.mark(self.nodes.WhileLoop(children[1], children[2]), children)
 
     def let_expr(self, children):
-        decl_list = []
-
-        n = 1
-
-        while True:
-
-            idx = children[n].value
-            n += 2
-            typex = children[n]
-
-            if children[n + 1].value == "<-":
-                n += 2
-                expr = children[n]
-            else:
-                expr = None
-
-            decl_list.append((idx, typex, expr))
-            n += 1
-
-            if children[n].value == "in":
-                break
-
-            n += 1
-
-        body = children[n + 1]
-
-        return LetIn(decl_list, body)
+        # let (ID : TYPE [<- expr]), ... in expr
+        decl_list = [
+            (symbol(children[n].value), symbol(children[n + 1].value), children[n + 2])
+            for n in range(1, len(children) - 1, 3)
+        ]
+        return self.mark(self.nodes.LetIn(decl_list, children[-1]), children)
 
     def case_expr(self, children):
-        expr = children[1]
-
-        n = 3
-
-        case_list = []
-        while children[n].value != "esac":
-            idx = children[n].value
-            typex = children[n + 2].value
-            case_expr = children[n + 4]
-            case_list.append((idx, typex, case_expr))
-            n += 6
-        return Case(expr, case_list)
+        # case expr of (ID : TYPE => expr ;)+ esac
+        case_list = [
+            (symbol(children[n].value), symbol(children[n + 1].value), children[n + 2])
+            for n in range(2, len(children) - 1, 3)
+        ]
+        return self.mark(self.nodes.Case(children[1], case_list), children)
 
     def new_expr(self, children):
-        return NewType(children[1].value)
+        return self.mark(self.nodes.NewType(symbol(children[1].value)), children)
 
     def parenthized_expr(self, children):
-        return ParenthExp(children[1])
+        return self.mark(self.nodes.ParenthExp(children[1]), children)
 
     def var_expr(self, children):
-        return IdExp(children[0].value)
+        return self.mark(self.nodes.IdExp(symbol(children[0].value)), children)
 
     def block_expr(self, children):
-        expr_list = []
-
-        n = 1
-        while True:
-            expr_list.append(children[n])
-            n += 2
-            try:
-                if children[n].value == "}":
-                    break
-            except AttributeError:
-                continue
-
-        return Block(expr_list)
+        return self.mark(self.nodes.Block(children[1:-1]), children)
 
-    def integer_atom(self, chidren):
-        return IntExp(chidren[0].value)
+    def integer_atom(self, children):
+        return self.mark(self.nodes.IntExp(children[0].value), children)
 
-    def string_atom(self, chidren):
-        return StringExp(chidren[0].value)
+    def string_atom(self, children):
+        return self.mark(self.nodes.StringExp(children[0].value), children)
 
-    def bool_atom(self, chidren):
-        return BoolExp(chidren[0].value)
+    def bool_atom(self, children):
+        return self.mark(self.nodes.BoolExp(children[0].value), children)
@@ -0,0 +1,239 @@
+import time
+
+from cool_inference.inference.tybags import TyBags
+from cool_inference.inference.tyinfer import BagsCollector, BagsReducer, BagsReplacer
+from cool_inference.semantics.check import TypeBuilder, TypeChecker, TypeCollector
+from cool_inference.semantics.semantics import Scope
+from cool_inference.utils.tables import NodeTable, node_count, number_nodes
+
+# The semantic and inference phases as passes for a PassManager. A pass works
+# class by class: begin runs once before the classes are visited, visit_class
+# once per class (in program order) and end once after them. Passes declare
+# the facts they need and provide:
+#
+#   requires        needed by begin, for the whole program
+#   class_requires  needed by visit_class, only for the class being visited
+#   begin_provides  true for the whole program once begin has run
+#   provides        true once end has run, and for every class already visited
+#
+# Consecutive passes whose needs are met at the start of a sweep (or by the
+# begin and the visits of the passes before them in the sweep) are fused:
+# they share a single sweep over cool_class_list, every class going through
+# all of them in turn.
+
+
+class Unit:
+    # the program going through the passes and their results
+    def __init__(self, ast):
+        if getattr(ast, "nid", None) is None:
+            number_nodes(ast)
+        self.ast = ast
+        self.contexts = {}
+        self.bags = None
+        # side tables indexed by node id: the scope of every class by context
+        # key, and the types the inference gave to the AUTO_TYPE annotations
+        self.scopes = {}
+        self.types = None
+        self.timings = {}
+
+
+class Pass:
+    title = None
+    requires = ()
+    class_requires = ()
+    begin_provides = ()
+    provides = ()
+
+    def __init__(self, key="context"):
+        # key names the context the pass works on, the inferred program is
+        # checked again with a context of its own
+        self.key = key
+        self.errors = []
+
+    @property
+    def name(self):
+        if self.key == "context":
+            return self.title
+        return f"{self.title} ({self.key})"
+
+    def begin(self, unit):
+        pass
+
+    def visit_class(self, unit, cool_class):
+        pass
+
+    def end(self, unit):
+        pass
+
+
+class CollectTypes(Pass):
+    title = "Type collection"
+
+    def __init__(self, key="context", collector=None):
+        # collector has already registered the classes (see --stream)
+        super().__init__(key)
+        self.collector = collector
+        if collector is not None:
+            self.errors = collector.errors
+        self.begin_provides = self.provides = (("names", key),)
+
+    def begin(self, unit):
+        collector = self.collector
+        if collector is None:
+            collector = TypeCollector(self.errors)
+            collector.begin()
+            for cool_class in unit.ast.cool_class_list:
+                collector.visit(cool_class)
+        unit.contexts[self.key] = collector.context
+
+
+class BuildTypes(Pass):
+    title = "Type building"
+
+    def __init__(self, key="context", class_requires=()):
+        super().__init__(key)
+        self.requires = (("names", key),)
+        self.class_requires = class_requires
+        self.provides = (("headers", key),)
+
+    def begin(self, unit):
+        self.builder = TypeBuilder(unit.contexts[self.key], self.errors)
+
+    def visit_class(self, unit, cool_class):
+        self.builder.visit(cool_class)
+
+
+class CheckTypes(Pass):
+    title = "Type checking"
+
+    def __init__(self, key="context"):
+        super().__init__(key)
+        self.requires = (("headers", key),)
+        self.provides = (("checked", key),)
+
+    def begin(self, unit):
+        self.checker = TypeChecker(unit.contexts[self.key], self.errors)
+        self.scope = Scope()
+        self.scopes = unit.scopes[self.key] = NodeTable(node_count(unit.ast))
+
+    def visit_class(self, unit, cool_class):
+        scope = self.scopes[cool_class.nid] = self.scope.create_child()
+        self.checker.visit(cool_class, scope)
+
+
+class CollectBags(Pass):
+    title = "Collecting tybags"
+    requires = (("checked", "context"),)
+    provides = ("bags",)
+
+    def begin(self, unit):
+        self.collector = BagsCollector(unit.contexts[self.key], self.errors)
+        unit.bags = TyBags()
+
+    def visit_class(self, unit, cool_class):
+        self.collector.visit(cool_class, unit.bags)
+
+
+class ReduceBags(Pass):
+    # the reduction runs to a fixed point over the whole program
+    title = "Reducing tybags"
+    requires = ("bags",)
+    begin_provides = provides = ("reduced",)
+
+    def begin(self, unit):
+        reducer = BagsReducer(unit.bags, unit.contexts[self.key], self.errors)
+        unit.bags = reducer.visit(unit.ast)
+
+
+class ReplaceBags(Pass):
+    title = "Replacing tybags in ast"
+    requires = ("reduced",)
+    provides = ("replaced",)
+
+    def begin(self, unit):
+        context = unit.contexts[self.key]
+        unit.types = NodeTable(node_count(unit.ast))
+        self.replacer = BagsReplacer(unit.bags, context, self.errors, unit.types)
+
+    def visit_class(self, unit, cool_class):
+        self.replacer.visit(cool_class, unit.bags)
+
+
+def inference_passes(collector=None):
+    # the phases of the pipeline in order: check the program, infer the
+    # AUTO_TYPE annotations and check the inferred program
+    return [
+        CollectTypes(collector=collector),
+        BuildTypes(),
+        CheckTypes(),
+        CollectBags(),
+        ReduceBags(),
+        ReplaceBags(),
+        # the classes keep their names, they are registered before the
+        # replacement and every class is built once it is replaced
+        CollectTypes("inferred"),
+        BuildTypes("inferred", class_requires=("replaced",)),
+        CheckTypes("inferred"),
+    ]
+
+
+class PassManager:
+    def __init__(self, passes, facts=()):
+        self.passes = list(passes)
+        self.facts = set(facts)
+
+    def schedule(self):
+        # the passes grouped in sweeps, in order
+        sweeps = []
+        known = set(self.facts)
+        sweep, begun, visited = [], set(), set()
+        for pass_ in self.passes:
+            if (
+                sweep
+                and known | begun >= set(pass_.requires)
+                and known | begun | visited >= set(pass_.class_requires)
+            ):
+                sweep.append(pass_)
+            else:
+                if sweep:
+                    sweeps.append(sweep)
+                    known |= begun | visited
+                missing = set(pass_.requires) | set(pass_.class_requires)
+                missing -= known
+                if missing:
+                    raise ValueError(f"{pass_.name} requires {sorted(missing)}")
+                sweep, begun, visited = [pass_], set(), set()
+            begun.update(pass_.begin_provides)
+            visited.update(pass_.provides)
+        if sweep:
+            sweeps.append(sweep)
+        return sweeps
+
+    def run_sweep(self, sweep, unit):
+        timings = unit.timings
+        clock = time.perf_counter
+        spent = [0.0] * len(sweep)
+
+        for i, pass_ in enumerate(sweep):
+            start = clock()
+            pass_.begin(unit)
+            spent[i] += clock() - start
+
+        visits = [pass_.visit_class for pass_ in sweep]
+        if any(type(pass_).visit_class is not Pass.visit_class for pass_ in sweep):
+            for cool_class in unit.ast.cool_class_list:
+                for i, visit in enumerate(visits):
+                    start = clock()
+                    visit(unit, cool_class)
+                    spent[i] += clock() - start
+
+        for i, pass_ in enumerate(sweep):
+            start = clock()
+            pass_.end(unit)
+            spent[i] += clock() - start
+            timings[pass_.name] = timings.get(pass_.name, 0.0) + spent[i]
+
+    def run(self, unit):
+        for sweep in self.schedule():
+            self.run_sweep(sweep, unit)
+            yield sweep
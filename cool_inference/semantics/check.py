@@ -1,5 +1,5 @@
 import cool_inference.utils.visitor as visitor
-from cool_inference.utils.lca import lowest_common_ancestor
+from cool_inference.utils.lca import lca_of_set, lowest_common_ancestor
 from cool_inference.semantics.semantics import (
     SemanticError,
     ErrorType,
@@ -55,17 +55,12 @@ BOOL_EXPECTED = 'Was expected a bool, not "%s".'
 STATIC_DISPATCH_ERROR = 'Type "%s" is not descendent of "%s"'
 
 
-class TypeCollector(object):
+class TypeCollector(visitor.Visitor):
     def __init__(self, errors=[]):
         self.context = None
         self.errors = errors
 
-    @visitor.on("node")
-    def visit(self, node):
-        pass
-
-    @visitor.when(Program)
-    def visit(self, node):  # noqa: F811
+    def begin(self):
         self.context = Context()
 
         object_type = ObjectType()
@@ -99,6 +94,13 @@ class TypeCollector(object):
         io_type.set_parent(object_type)
         self.context.types["IO"] = io_type
 
+    @visitor.on("node")
+    def visit(self, node):
+        pass
+
+    @visitor.when(Program)
+    def visit(self, node):  # noqa: F811
+        self.begin()
         for cl in node.cool_class_list:
             self.visit(cl)
 
@@ -110,7 +112,7 @@ class TypeCollector(object):
             self.errors.append(err.text)
 
 
-class TypeBuilder:
+class TypeBuilder(visitor.Visitor):
     def __init__(self, context, errors=[]):
         self.context = context
         self.current_type = None
@@ -188,9 +190,11 @@ class TypeBuilder:
             self.errors.append(e.text)
 
 
-class TypeChecker:
+class TypeChecker(visitor.Visitor):
     def __init__(self, context, errors=[]):
         self.context = context
+        # the inheritance is fixed once the types are built
+        context.label()
         self.current_type = None
         self.current_method = None
         self.errors = errors
@@ -263,14 +267,11 @@ class TypeChecker:
             )
 
         if self.current_type.parent is not None:
-            try:
-                parent_method = self.current_type.parent.get_method(
-                    self.current_method.name
-                )
-                if parent_method != self.current_method:
-                    self.errors.append(WRONG_SIGNATURE % (parent_method.name, "parent"))
-            except SemanticError:
-                pass
+            parent_method = self.current_type.parent.find_method(
+                self.current_method.name
+            )
+            if parent_method is not None and parent_method != self.current_method:
+                self.errors.append(WRONG_SIGNATURE % (parent_method.name, "parent"))
 
         self.current_method = None
 
@@ -369,8 +370,7 @@ class TypeChecker:
     @visitor.when(Case)
     def visit(self, node, scope):  # noqa: F811
         _ = self.visit(node.exp, scope)
-        return_type = None
-        first = True
+        static_types = []
 
         for idx, _type, case_exp in node.case_list:
             try:
@@ -381,17 +381,9 @@ class TypeChecker:
 
             new_scope = scope.create_child()
             new_scope.define_variable(idx, typex)
-            static_type = self.visit(case_exp, new_scope)
-
-            if first:
-                return_type = static_type
-                first = False
-            else:
-                return_type = lowest_common_ancestor(
-                    return_type, static_type, self.context
-                )
+            static_types.append(self.visit(case_exp, new_scope))
 
-        return return_type
+        return lca_of_set(static_types, self.context)
 
     @visitor.when(Block)
     def visit(self, node, scope):  # noqa: F811
@@ -1,5 +1,7 @@
-import itertools as itt
 from collections import OrderedDict
+from types import MappingProxyType
+
+from cool_inference.utils.symbols import symbol
 
 
 class SemanticError(Exception):
@@ -42,81 +44,180 @@ class Method:
         )
 
 
+# the member kinds of a type, an index in Type.tables and Type.resolved
+ATTRIBUTES, METHODS = 0, 1
+
+
 class Type:
     def __init__(self, name: str):
         self.name = name
         self.attributes = []
         self.methods = []
         self.parent = None
+        self.subtypes = []
+        # the members defined by the type by name, and the members resolved
+        # through the parents (None when not defined), filled on demand and
+        # emptied when the type or an ancestor gains a member or a parent;
+        # clean means that no cache of the type or its subtypes holds a name
+        self.tables = ({}, {})
+        self.resolved = ({}, {})
+        # the members of the type and its ancestors, see all_members
+        self.flattened = [None, None]
+        self.clean = True
+        # the hierarchy labels, see Context.label
+        self.labels = None
+        self.pre = self.post = 0
+        self.wild = False
 
     def set_parent(self, parent):
         if self.parent is not None:
             raise SemanticError(f"Parent type is already set for {self.name}.")
         self.parent = parent
+        parent.subtypes.append(self)
+        self.invalidate()
+        if self.labels is not None:
+            self.labels.valid = False
+
+    def invalidate(self):
+        pending = [self]
+        while pending:
+            typex = pending.pop()
+            if typex.clean:
+                continue
+            typex.clean = True
+            for resolved in typex.resolved:
+                resolved.clear()
+            typex.flattened[ATTRIBUTES] = typex.flattened[METHODS] = None
+            pending.extend(typex.subtypes)
+
+    def mark(self):
+        # the type holds a cache: neither it nor its ancestors are clean
+        typex = self
+        while typex is not None and typex.clean:
+            typex.clean = False
+            typex = typex.parent
+
+    def resolve(self, kind, name):
+        # the member of the type or of its closest ancestor defining it
+        resolved = self.resolved[kind]
+        if name in resolved:
+            return resolved[name]
+
+        # a miss is only remembered by the type itself, the walk stops early
+        # on an inheritance cycle (slow follows it at half the speed)
+        chain = []
+        member = None
+        typex = slow = self
+        while typex is not None:
+            resolved = typex.resolved[kind]
+            if name in resolved:
+                member = resolved[name]
+                break
+            chain.append(typex)
+            member = typex.tables[kind].get(name)
+            if member is not None:
+                break
+            typex = typex.parent
+            if len(chain) & 1 == 0:
+                slow = slow.parent
+                if typex is slow:
+                    break
+
+        if member is None:
+            self.resolved[kind][name] = None
+        else:
+            for typex in chain:
+                typex.resolved[kind][name] = member
+        self.mark()
+        return member
+
+    def find_attribute(self, name: str):
+        return self.resolve(ATTRIBUTES, name)
 
     def get_attribute(self, name: str):
-        try:
-            return next(attr for attr in self.attributes if attr.name == name)
-        except StopIteration:
-            if self.parent is None:
-                raise SemanticError(
-                    f'Attribute "{name}" is not defined in {self.name}.'
-                )
-            try:
-                return self.parent.get_attribute(name)
-            except SemanticError:
-                raise SemanticError(
-                    f'Attribute "{name}" is not defined in {self.name}.'
-                )
+        attribute = self.resolve(ATTRIBUTES, name)
+        if attribute is None:
+            raise SemanticError(f'Attribute "{name}" is not defined in {self.name}.')
+        return attribute
 
     def define_attribute(self, name: str, typex):
-        try:
-            self.get_attribute(name)
-        except SemanticError:
-            attribute = Attribute(name, typex)
-            self.attributes.append(attribute)
-            return attribute
-        else:
+        if self.resolve(ATTRIBUTES, name) is not None:
             raise SemanticError(
                 f'Attribute "{name}" is already defined in {self.name}.'
             )
+        attribute = Attribute(symbol(name), typex)
+        self.attributes.append(attribute)
+        self.tables[ATTRIBUTES][attribute.name] = attribute
+        self.invalidate()
+        return attribute
+
+    def find_method(self, name: str):
+        return self.resolve(METHODS, name)
 
     def get_method(self, name: str):
-        try:
-            return next(method for method in self.methods if method.name == name)
-        except StopIteration:
-            if self.parent is None:
-                raise SemanticError(f'Method "{name}" is not defined in {self.name}.')
-            try:
-                return self.parent.get_method(name)
-            except SemanticError:
-                raise SemanticError(f'Method "{name}" is not defined in {self.name}.')
+        method = self.resolve(METHODS, name)
+        if method is None:
+            raise SemanticError(f'Method "{name}" is not defined in {self.name}.')
+        return method
 
     def define_method(
         self, name: str, param_names: list, param_types: list, return_type
     ):
-        if name in (method.name for method in self.methods):
+        if name in self.tables[METHODS]:
             raise SemanticError(f'Method "{name}" already defined in {self.name}')
 
-        method = Method(name, param_names, param_types, return_type)
+        method = Method(
+            symbol(name), [symbol(n) for n in param_names], param_types, return_type
+        )
         self.methods.append(method)
+        self.tables[METHODS][method.name] = method
+        self.invalidate()
         return method
 
+    def all_members(self, kind):
+        # name -> (member, defining type) in definition order, the parents'
+        # first, built from the closest ancestor already flattened and kept
+        # until the type or an ancestor gains a member or a parent
+        plain = self.flattened[kind]
+        if plain is not None:
+            return plain
+
+        chain, seen = [], set()
+        typex = self
+        while typex is not None and typex.flattened[kind] is None:
+            if id(typex) in seen:
+                raise SemanticError(f"Inheritance cycle through {typex.name}.")
+            seen.add(id(typex))
+            chain.append(typex)
+            typex = typex.parent
+
+        plain = OrderedDict() if typex is None else typex.flattened[kind]
+        for typex in reversed(chain):
+            plain = OrderedDict(plain)
+            for member in (typex.attributes, typex.methods)[kind]:
+                plain[member.name] = (member, typex)
+            typex.flattened[kind] = plain
+        self.mark()
+        return plain
+
     def all_attributes(self, clean=True):
-        plain = (
-            OrderedDict() if self.parent is None else self.parent.all_attributes(False)
-        )
-        for attr in self.attributes:
-            plain[attr.name] = (attr, self)
-        return plain.values() if clean else plain
+        # the result is shared by the calls until invalidated, not a copy
+        plain = self.all_members(ATTRIBUTES)
+        return plain.values() if clean else MappingProxyType(plain)
 
     def all_methods(self, clean=True):
-        plain = OrderedDict() if self.parent is None else self.parent.all_methods(False)
-        for method in self.methods:
-            plain[method.name] = (method, self)
-        return plain.values() if clean else plain
+        plain = self.all_members(METHODS)
+        return plain.values() if clean else MappingProxyType(plain)
 
     def conforms_to(self, other):
+        labels = self.labels
+        if labels is not None and labels is other.labels and labels.valid:
+            return (
+                other.bypass()
+                or self.wild
+                or other.pre <= self.pre
+                and self.post <= other.post
+            )
         return (
             other.bypass()
             or self == other
@@ -224,13 +325,63 @@ class AutoType(Type):
         return other.name == self.name or isinstance(other, AutoType)
 
 
+class Labels:
+    # a numbering of the hierarchy of a context, it stops being valid when a
+    # labelled type gets a new parent
+    __slots__ = ("valid",)
+
+    def __init__(self):
+        self.valid = True
+
+
 class Context:
     def __init__(self):
         self.types = {}
+        self.labels = None
+        # the lowest common ancestor index of utils.lca, built on demand
+        self.lca = None
+
+    def label(self):
+        # number the types in pre and post order of the inheritance tree, so
+        # that a type conforms to another when its interval is inside the
+        # interval of the other (or when itself or an ancestor bypasses the
+        # checks, wild). Types out of the tree, the ones in an inheritance
+        # cycle or with an ancestor that is not in the context, are not
+        # labelled and conforms_to walks their parents.
+        if self.labels is not None:
+            self.labels.valid = False
+        labels = self.labels = Labels()
+
+        roots, children = [], {}
+        for typex in self.types.values():
+            if typex.parent is None:
+                roots.append(typex)
+            else:
+                children.setdefault(id(typex.parent), []).append(typex)
+
+        counter = 0
+        stack = [(typex, False) for typex in reversed(roots)]
+        while stack:
+            typex, done = stack.pop()
+            if done:
+                typex.post = counter
+                counter += 1
+                continue
+            parent = typex.parent
+            typex.labels = labels
+            typex.pre = counter
+            typex.wild = typex.bypass() or parent is not None and parent.wild
+            counter += 1
+            stack.append((typex, True))
+            stack.extend(
+                (child, False) for child in reversed(children.get(id(typex), ()))
+            )
+        return labels
 
     def create_type(self, name: str):
         if name in self.types:
             raise SemanticError(f"Type with the same name ({name}) already in context.")
+        name = symbol(name)
         typex = self.types[name] = Type(name)
         return typex
 
@@ -263,6 +414,11 @@ class Scope:
         self.parent = parent
         self.children = []
         self.index = 0 if parent is None else len(parent)
+        # name -> position of its first definition in locals, and the
+        # variables found in the parents (None when not defined), which never
+        # change: a scope only sees the first index variables of its parent
+        self.names = {}
+        self.inherited = {}
 
     def __len__(self):
         return len(self.locals)
@@ -273,27 +429,35 @@ class Scope:
         return child
 
     def define_variable(self, vname, vtype):
-        info = VariableInfo(vname, vtype)
+        info = VariableInfo(symbol(vname), vtype)
+        self.names.setdefault(info.name, len(self.locals))
         self.locals.append(info)
         return info
 
     def find_variable(self, vname, index=None):
-        locals = self.locals if index is None else itt.islice(self.locals, index)
-        try:
-            return next(x for x in locals if x.name == vname)
-        except StopIteration:
-            if self.parent is not None:
-                return self.parent.find_variable(vname, self.index)
-            else:
-                return None
-            # return (
-            #     self.parent.find_variable(vname, self.index)
-            #     if self.parent is None
-            #     else None
-            # )
+        # the first definition of vname among the first index variables (all
+        # when None), or else the one seen from the parent
+        scopes = []
+        scope, limit = self, index
+        info = None
+        while scope is not None:
+            position = scope.names.get(vname)
+            if position is not None and (limit is None or position < limit):
+                info = scope.locals[position]
+                break
+            inherited = scope.inherited
+            if vname in inherited:
+                info = inherited[vname]
+                break
+            scopes.append(scope)
+            scope, limit = scope.parent, scope.index
+
+        for scope in scopes:
+            scope.inherited[vname] = info
+        return info
 
     def is_defined(self, vname):
         return self.find_variable(vname) is not None
 
     def is_local(self, vname):
-        return any(True for x in self.locals if x.name == vname)
+        return vname in self.names
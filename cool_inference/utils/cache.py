@@ -0,0 +1,18 @@
+import os
+
+
+def cache_dir():
+    path = os.environ.get("COOL_INFERENCE_CACHE_DIR")
+    if path is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        path = os.path.join(base, "cool_inference")
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        import tempfile
+
+        path = os.path.join(tempfile.gettempdir(), "cool_inference")
+        os.makedirs(path, exist_ok=True)
+    return path
@@ -1,4 +1,7 @@
-def lowest_common_ancestor(type_1, type_2, context):
+def walk_ancestors(type_1, type_2, context):
+    # the join by walking the parents of both types, for the types out of the
+    # labelled hierarchy and the ones bypassing the checks (see Type.wild),
+    # where conforms_to is not the ancestor relation
     object_type = context.get_type("Object")
     if type_1 == object_type or type_2 == object_type:
         return object_type
@@ -18,9 +21,107 @@ def lowest_common_ancestor(type_1, type_2, context):
     return object_type
 
 
+class LcaIndex:
+    # lowest common ancestors of the labelled hierarchy of a context (see
+    # Context.label) in constant time: the euler tour of the inheritance
+    # forest, under a virtual root None, and a sparse table of the positions
+    # of the minimum depth of every power of two long range of the tour
+    def __init__(self, context):
+        labels = context.labels
+        if labels is None or not labels.valid:
+            labels = context.label()
+        self.labels = labels
+        self.object_type = context.get_type("Object")
+
+        roots, children = [], {}
+        for typex in context.types.values():
+            if typex.labels is not labels:
+                continue
+            if typex.parent is None:
+                roots.append(typex)
+            else:
+                children.setdefault(id(typex.parent), []).append(typex)
+
+        # first maps the pre order number of a type to its first position
+        euler, depths, first = [None], [-1], {}
+        for root in roots:
+            first[root.pre] = len(euler)
+            euler.append(root)
+            depths.append(0)
+            stack = [(root, 0, iter(children.get(id(root), ())))]
+            while stack:
+                typex, depth, rest = stack[-1]
+                child = next(rest, None)
+                if child is None:
+                    stack.pop()
+                    euler.append(stack[-1][0] if stack else None)
+                    depths.append(depth - 1)
+                else:
+                    first[child.pre] = len(euler)
+                    euler.append(child)
+                    depths.append(depth + 1)
+                    stack.append((child, depth + 1, iter(children.get(id(child), ()))))
+
+        table = [list(range(len(euler)))]
+        step = 1
+        while 2 * step <= len(euler):
+            last = table[-1]
+            table.append(
+                [i if depths[i] <= depths[j] else j for i, j in zip(last, last[step:])]
+            )
+            step *= 2
+
+        self.euler, self.depths, self.first, self.table = euler, depths, first, table
+
+    def is_valid(self, context):
+        return self.labels is context.labels and self.labels.valid
+
+    def fast(self, typex):
+        # the types whose conformance is the ancestor relation of the index
+        return typex.labels is self.labels and not typex.wild
+
+    def query(self, i, j):
+        # the type of minimum depth between the positions i <= j of the tour
+        k = (j - i + 1).bit_length() - 1
+        row, depths = self.table[k], self.depths
+        a, b = row[i], row[j - (1 << k) + 1]
+        ancestor = self.euler[a if depths[a] <= depths[b] else b]
+        return self.object_type if ancestor is None else ancestor
+
+    def join(self, type_1, type_2, context):
+        if self.labels.valid and self.fast(type_1) and self.fast(type_2):
+            i, j = self.first[type_1.pre], self.first[type_2.pre]
+            return self.query(i, j) if i <= j else self.query(j, i)
+        return walk_ancestors(type_1, type_2, context)
+
+    def join_all(self, types, context):
+        # the lowest common ancestor of a set is the one of its types first and
+        # last visited by the tour
+        if self.labels.valid and all(self.fast(typex) for typex in types):
+            first = self.first
+            positions = [first[typex.pre] for typex in types]
+            return self.query(min(positions), max(positions))
+        result = types[0]
+        for typex in types:
+            result = walk_ancestors(result, typex, context)
+        return result
+
+
+def lca_index(context):
+    # the index of the context, built again once its labels are stale
+    index = context.lca
+    if index is None or not index.is_valid(context):
+        index = context.lca = LcaIndex(context)
+    return index
+
+
+def lowest_common_ancestor(type_1, type_2, context):
+    return lca_index(context).join(type_1, type_2, context)
+
+
+def lca_of_set(types, context):
+    return lca_index(context).join_all(list(types), context)
+
+
 def solve_bag(bag, context):
-    result = context.get_type(list(bag)[0])
-    for ty in bag:
-        ty = context.get_type(ty)
-        result = lowest_common_ancestor(result, ty, context)
-    return result.name
+    return lca_of_set([context.get_type(ty) for ty in bag], context).name
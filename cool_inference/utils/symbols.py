@@ -0,0 +1,18 @@
+import sys
+
+# Identifiers and type names are interned when they are read (by the parser,
+# the flat ast loader and the semantic tables), so all the occurrences of a
+# name are the same str object. A Symbol is such a str: it caches its hash,
+# dict and set lookups with it succeed on the identity check without
+# comparing characters, and it still compares equal to the names written as
+# literals in the passes ("Object", "AUTO_TYPE", "self"...), which python
+# interns as well. A wrapper class would lose both the fast str paths of dict
+# lookups and the comparisons with literals.
+Symbol = str
+
+
+def symbol(name):
+    # the Symbol of name, None stays None (a class without inherits)
+    if name is None:
+        return None
+    return sys.intern(name)
@@ -0,0 +1,77 @@
+# Side tables of analysis results indexed by node id (AstNode.nid). The ids
+# are dense and assigned at parse time, so a table is a list: it is cheap to
+# serialize, to send to another process and to compare between runs, and
+# looking a node up does not hash the node object.
+
+
+def node_count(program):
+    # an upper bound of the node ids of program, the program node is the last
+    # one created unless classes were reparsed (which keeps the span table)
+    if program.spans is not None:
+        return len(program.spans)
+    return program.nid + 1
+
+
+def number_nodes(program):
+    # gives an id to the nodes of a tree built by hand, which the parser did
+    # not number: children before their parent and the program last, as the
+    # parser does, after the largest id already in the tree
+    order, missing, last = [], [], -1
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(child for child in node.children() if child is not None)
+    for node in reversed(order):
+        nid = getattr(node, "nid", None)
+        if nid is None:
+            missing.append(node)
+        else:
+            last = max(last, nid)
+    for nid, node in enumerate(missing, last + 1):
+        node.nid = nid
+    return program
+
+
+class NodeTable:
+    # missing entries are None, the list grows when a larger id is stored; ids
+    # are never negative, so -1 does not read the last entry
+    __slots__ = ("values",)
+
+    def __init__(self, size=0):
+        self.values = [None] * size
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, nid):
+        if nid < 0:
+            return None
+        try:
+            return self.values[nid]
+        except IndexError:
+            return None
+
+    def __setitem__(self, nid, value):
+        if nid < 0:
+            raise IndexError(f"negative node id {nid}")
+        values = self.values
+        if nid >= len(values):
+            values.extend([None] * (nid + 1 - len(values)))
+        values[nid] = value
+
+    def items(self):
+        return (
+            (nid, value) for nid, value in enumerate(self.values) if value is not None
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, NodeTable) and dict(self.items()) == dict(
+            other.items()
+        )
+
+    def __getstate__(self):
+        return self.values
+
+    def __setstate__(self, values):
+        self.values = values
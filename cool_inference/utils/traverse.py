@@ -0,0 +1,104 @@
+__all__ = ["Walker", "children", "pre", "post"]
+
+# An explicit stack traversal engine for passes that must not be limited by
+# the depth of the tree (long arithmetic chains, nested lets or blocks from
+# code generators), where every level of a recursive visitor costs python
+# frames. A Walker declares hooks per node kind:
+#
+#   pre(self, node, state) runs before the children are walked, it returns
+#   None to walk children(node) with the same state, or the list of
+#   (child, state) pairs to walk instead
+#
+#   post(self, node, state, values) runs after them, values holds the value
+#   of every walked child in order (None for a missing child) and the value
+#   it returns is the value of node
+#
+# Nodes without a post hook have the value None.
+
+
+class Hooks(dict):
+    # node class -> hook, resolved through the mro of the classes (like the
+    # flat ast views) the first time they are walked
+    def __init__(self, targets):
+        self.targets = targets
+
+    def __missing__(self, typ):
+        targets = self.targets
+        hook = self[typ] = next(
+            (targets[cls] for cls in typ.__mro__ if cls in targets), None
+        )
+        return hook
+
+
+def children(node):
+    return node.children()
+
+
+def pre(*types):
+    def f(fn):
+        fn.pre_types = types
+        return fn
+
+    return f
+
+
+def post(*types):
+    def f(fn):
+        fn.post_types = types
+        return fn
+
+    return f
+
+
+class Walker:
+    pre_targets = {}
+    post_targets = {}
+
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        cls.pre_targets = dict(cls.pre_targets)
+        cls.post_targets = dict(cls.post_targets)
+        for value in cls.__dict__.values():
+            for typ in getattr(value, "pre_types", ()):
+                cls.pre_targets[typ] = value
+            for typ in getattr(value, "post_types", ()):
+                cls.post_targets[typ] = value
+        cls.pre_hooks = Hooks(cls.pre_targets)
+        cls.post_hooks = Hooks(cls.post_targets)
+
+    def walk(self, root, state=None):
+        pre_hooks, post_hooks = self.pre_hooks, self.post_hooks
+        # entries are (node, state, None) before the children of node are
+        # pushed, and (node, state, number of children) after
+        stack = [(root, state, None)]
+        values = []
+        push, pop = stack.append, stack.pop
+
+        while stack:
+            node, state, count = pop()
+            if count is None:
+                if node is None:
+                    values.append(None)
+                    continue
+                typ = node.__class__
+                hook = pre_hooks[typ]
+                pairs = None if hook is None else hook(self, node, state)
+                if pairs is None:
+                    nodes = node.children()
+                    push((node, state, len(nodes)))
+                    for child in reversed(nodes):
+                        push((child, state, None))
+                else:
+                    push((node, state, len(pairs)))
+                    for child, child_state in reversed(pairs):
+                        push((child, child_state, None))
+            else:
+                if count:
+                    args = values[-count:]
+                    del values[-count:]
+                else:
+                    args = []
+                hook = post_hooks[node.__class__]
+                values.append(None if hook is None else hook(self, node, state, args))
+
+        return values.pop()
@@ -20,66 +20,190 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-import inspect
+__all__ = ["Visitor", "on", "when"]
 
-__all__ = ["on", "when"]
 
+# on and when only tag the functions, the namespace of a Visitor class
+# gathers the functions sharing a name into a Dispatcher, and the class is
+# given a function looking the target up in the dispatch table of the
+# dispatcher: a visit is a dict lookup and a direct call
+#
+# A node is given to the target of the nearest class in its mro. As with the
+# original dispatcher, the body of the function decorated with on is never
+# called: a visit of a node without a target returns []
+#
+# With on(param_name, walk=True) the nodes without a target are walked
+# instead: their children are visited with the same arguments, skipping the
+# children whose subtree (according to the summary set by the parser) has no
+# node with a target
 
-def on(param_name):
+
+def on(param_name, walk=False):
     def f(fn):
-        dispatcher = Dispatcher(param_name, fn)
-        return dispatcher
+        fn.dispatch_param = param_name
+        fn.dispatch_walk = walk
+        return fn
 
     return f
 
 
 def when(param_type):
     def f(fn):
-        frame = inspect.currentframe().f_back
-        func_name = fn.func_name if "func_name" in dir(fn) else fn.__name__
-        dispatcher = frame.f_locals[func_name]
-        if not isinstance(dispatcher, Dispatcher):
-            dispatcher = dispatcher.dispatcher
-        dispatcher.add_target(param_type, fn)
+        fn.dispatch_type = param_type
+        return fn
+
+    return f
 
-        def ff(*args, **kw):
-            return dispatcher(*args, **kw)
 
-        ff.dispatcher = dispatcher
-        return ff
+def no_target(*args, **kw):
+    return []
 
-    return f
+
+class Table(dict):
+    # node class -> target, filled with the node classes and the registered
+    # ones when the visitor class is defined; other classes (like the flat
+    # ast views) are resolved when they are first visited
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+
+    def __missing__(self, typ):
+        target = self[typ] = self.dispatcher.resolve(typ)
+        return target
 
 
 class Dispatcher(object):
-    def __init__(self, param_name, fn):
-        frame = inspect.currentframe().f_back.f_back
-        _ = frame.f_locals == frame.f_globals
-        self.param_index = self.__argspec(fn).args.index(param_name)
-        self.param_name = param_name
+    def __init__(self, name):
+        self.name = name
+        self.param_index = None
+        self.default = None
+        self.walk = False
+        self.walker = None
+        self.mask = 0
         self.targets = {}
+        self.table = Table(self)
 
-    def __call__(self, *args, **kw):
-        typ = args[self.param_index].__class__
-        d = self.targets.get(typ)
-        if d is not None:
-            return d(*args, **kw)
+    def add(self, fn):
+        param_name = getattr(fn, "dispatch_param", None)
+        if param_name is not None:
+            code = fn.__code__
+            self.param_index = code.co_varnames.index(param_name)
+            self.default = fn
+            self.walk = fn.dispatch_walk
         else:
-            issub = issubclass
-            t = self.targets
-            ks = t.keys()
-            ans = [t[k](*args, **kw) for k in ks if issub(typ, k)]
-            if len(ans) == 1:
-                return ans.pop()
-            return ans
+            self.add_target(fn.dispatch_type, fn)
+
+    def extend(self, other):
+        # adds the targets of other, replacing the ones already there
+        if other.default is not None:
+            self.param_index = other.param_index
+            self.default = other.default
+            self.walk = other.walk
+        self.targets.update(other.targets)
+
+    def resolve(self, typ):
+        # the target of the nearest class in the mro of typ, no_target (or the
+        # walker) when there is none
+        targets = self.targets
+        default = self.walker if self.walk else no_target
+        return next((targets[cls] for cls in typ.__mro__ if cls in targets), default)
 
     def add_target(self, typ, target):
         self.targets[typ] = target
+        if self.walk:
+            self.update_mask()
+        self.fill()
+
+    def fill(self):
+        from cool_inference.ast import NODE_CLASSES
+
+        table = self.table
+        table.clear()
+        for typ in NODE_CLASSES:
+            table[typ] = self.resolve(typ)
+        for typ in self.targets:
+            table[typ] = self.resolve(typ)
+
+    def update_mask(self):
+        from cool_inference.ast import kind_mask
+
+        self.mask = kind_mask(self.targets)
+
+    def compile(self):
+        table = self.table
+        index = self.param_index
+        if index == 1:
+
+            def dispatch(self, node, *args, **kw):
+                return table[node.__class__](self, node, *args, **kw)
 
-    @staticmethod
-    def __argspec(fn):
-        # Support for Python 3 type hints requires inspect.getfullargspec
-        if hasattr(inspect, "getfullargspec"):
-            return inspect.getfullargspec(fn)
         else:
-            return inspect.getargspec(fn)
+
+            def dispatch(*args, **kw):
+                return table[args[index].__class__](*args, **kw)
+
+        if self.walk:
+            self.walker = self.compile_walker(dispatch)
+            self.update_mask()
+        self.fill()
+        dispatch.__name__ = dispatch.__qualname__ = self.name
+        dispatch.dispatcher = self
+        return dispatch
+
+    def compile_walker(self, dispatch):
+        from cool_inference.ast import ALL_KINDS
+
+        dispatcher = self
+
+        def walk(self, node, *args, **kw):
+            mask = dispatcher.mask
+            for child in node.children():
+                if child is not None and getattr(child, "summary", ALL_KINDS) & mask:
+                    dispatch(self, child, *args, **kw)
+
+        return walk
+
+
+def is_visit(value):
+    return hasattr(value, "dispatch_type") or hasattr(value, "dispatch_param")
+
+
+class VisitorNamespace(dict):
+    # every definition of a name decorated with on or when is added to the
+    # same dispatcher instead of replacing the previous one
+    def __setitem__(self, name, value):
+        if is_visit(value):
+            dispatcher = self.get(name)
+            if not isinstance(dispatcher, Dispatcher):
+                dispatcher = Dispatcher(name)
+                dict.__setitem__(self, name, dispatcher)
+            dispatcher.add(value)
+        else:
+            dict.__setitem__(self, name, value)
+
+
+class VisitorMeta(type):
+    @classmethod
+    def __prepare__(mcs, name, bases, **kw):
+        return VisitorNamespace()
+
+    def __new__(mcs, name, bases, namespace, **kw):
+        attrs = dict(namespace)
+        for key, value in namespace.items():
+            if not isinstance(value, Dispatcher):
+                continue
+            inherited = [
+                getattr(base, key).dispatcher
+                for base in reversed(bases)
+                if hasattr(getattr(base, key, None), "dispatcher")
+            ]
+            if inherited:
+                # the targets of the bases, overridden by the ones of the class
+                own, value = value, Dispatcher(key)
+                for dispatcher in inherited + [own]:
+                    value.extend(dispatcher)
+            attrs[key] = value.compile()
+        return super().__new__(mcs, name, bases, attrs, **kw)
+
+
+class Visitor(metaclass=VisitorMeta):
+    pass
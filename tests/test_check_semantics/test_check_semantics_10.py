@@ -0,0 +1,38 @@
+from cool_inference.semantics.semantics import ATTRIBUTES, METHODS, Context
+
+
+def names(members):
+    return [(member.name, typex.name) for member, typex in members]
+
+
+def test10():
+    context = Context()
+    a, b, c = (context.create_type(name) for name in "ABC")
+    b.set_parent(a)
+    int_type = context.create_type("Int")
+
+    a.define_attribute("x", int_type)
+    a.define_method("f", [], [], int_type)
+    b.define_attribute("y", int_type)
+    b.define_method("f", [], [], int_type)
+    b.define_method("g", [], [], int_type)
+
+    assert names(b.all_attributes()) == [("x", "A"), ("y", "B")]
+    assert names(b.all_methods()) == [("f", "B"), ("g", "B")]
+    # repeated queries share the result
+    assert b.all_methods(False) == b.all_members(METHODS)
+    assert b.all_members(METHODS) is b.all_members(METHODS)
+    assert list(b.all_attributes(False)) == ["x", "y"]
+
+    # an ancestor gaining a member
+    cached = b.all_members(ATTRIBUTES)
+    a.define_attribute("z", int_type)
+    assert b.all_members(ATTRIBUTES) is not cached
+    assert names(b.all_attributes()) == [("x", "A"), ("z", "A"), ("y", "B")]
+
+    # a new parent
+    c.define_method("h", [], [], int_type)
+    assert names(c.all_methods()) == [("h", "C")]
+    c.set_parent(b)
+    assert names(c.all_methods()) == [("f", "B"), ("g", "B"), ("h", "C")]
+    assert names(a.all_methods()) == [("f", "A")]
@@ -0,0 +1,37 @@
+from cool_inference.semantics.semantics import Scope
+
+
+def test11():
+    root = Scope()
+    x = root.define_variable("x", "Int")
+    child = root.create_child()
+    # defined in the parent after the child was created, not visible
+    y = root.define_variable("y", "Int")
+    assert child.find_variable("x") is x
+    assert child.find_variable("y") is None
+    assert root.find_variable("y") is y
+
+    # the first definition wins, shadowing the parent
+    x1 = child.define_variable("x", "String")
+    child.define_variable("x", "Bool")
+    assert child.find_variable("x") is x1
+    assert child.is_local("x") and not child.is_local("y")
+    assert root.find_variable("x") is x
+
+    # the lookups remembered by a scope do not hide its later definitions
+    grandchild = child.create_child()
+    assert grandchild.find_variable("z") is None
+    z = grandchild.define_variable("z", "Int")
+    assert grandchild.find_variable("z") is z
+    assert grandchild.find_variable("x") is x1
+    assert child.find_variable("z") is None
+
+    # a scope sees the first index variables of its parents
+    deep = root
+    for i in range(2000):
+        deep.define_variable(f"v_{i}", i)
+        deep = deep.create_child()
+    assert deep.find_variable("v_0").type == 0
+    assert deep.find_variable("x") is x
+    assert deep.find_variable("y") is y
+    assert deep.is_defined("v_1999") and not deep.is_defined("w")
@@ -0,0 +1,51 @@
+from cool_inference.parsing.parser import parser
+from cool_inference.semantics.check import TypeCollector, TypeBuilder, TypeChecker
+
+
+def test7():
+    test7 = """
+    class A { } ;
+    class B inherits A { } ;
+    class C inherits B { } ;
+    class D inherits A { } ;
+    class E inherits Missing { } ;
+    class F inherits E { } ;
+    """
+
+    ast = parser.parse(test7)
+    errors = []
+    collector = TypeCollector(errors)
+    collector.visit(ast)
+    context = collector.context
+    TypeBuilder(context, errors).visit(ast)
+    assert errors == ['Type "Missing" is not defined.']
+
+    names = ["Object", "IO", "Int", "A", "B", "C", "D", "E", "F"]
+    types = [context.get_type(name) for name in names]
+
+    # the answers of the parent walks, before the hierarchy is labelled
+    expected = {(t1.name, t2.name): t1.conforms_to(t2) for t1 in types for t2 in types}
+    assert expected["C", "A"] and not expected["A", "C"] and not expected["C", "D"]
+    # E and F inherit from the error type, they conform to everything
+    assert expected["F", "Int"] and not expected["Int", "F"]
+
+    # a class without parent yet is a root of its own, labelled too
+    g, h = context.create_type("G"), context.create_type("H")
+    h.set_parent(g)
+
+    TypeChecker(context, errors)
+    labels = context.labels
+    assert all(t.labels is labels for t in types)
+    for t1 in types:
+        for t2 in types:
+            assert t1.conforms_to(t2) == expected[t1.name, t2.name]
+
+    # a new parent invalidates the labels, the parents are walked again
+    io = context.get_type("IO")
+    assert g.labels is labels and not h.conforms_to(io)
+    g.set_parent(io)
+    assert not labels.valid
+    assert h.conforms_to(io)
+    context.label()
+    assert h.conforms_to(io) and not io.conforms_to(h)
+    assert not h.conforms_to(context.get_type("A"))
@@ -0,0 +1,57 @@
+import random
+
+from cool_inference.semantics.check import TypeCollector
+from cool_inference.utils.lca import (
+    lca_index,
+    lca_of_set,
+    lowest_common_ancestor,
+    solve_bag,
+    walk_ancestors,
+)
+
+
+def test8():
+    collector = TypeCollector([])
+    collector.begin()
+    context = collector.context
+
+    rng = random.Random(0)
+    parents = ["Object", "IO", "ERROR", "AUTO_TYPE"]
+    for i in range(200):
+        typex = context.create_type(f"T{i}")
+        typex.set_parent(context.get_type(rng.choice(parents)))
+        parents.append(typex.name)
+    # out of the hierarchy: without parent, and in a cycle
+    context.create_type("Alone")
+    u, v = context.create_type("U"), context.create_type("V")
+    u.set_parent(v)
+    v.set_parent(u)
+
+    types = [t for t in context.types.values() if t not in (u, v)]
+    pairs = [(rng.choice(types), rng.choice(types)) for _ in range(2000)]
+    expected = [walk_ancestors(t1, t2, context) for t1, t2 in pairs]
+
+    context.label()
+    index = lca_index(context)
+    assert all(
+        lowest_common_ancestor(t1, t2, context) is ancestor
+        for (t1, t2), ancestor in zip(pairs, expected)
+    )
+    assert lca_index(context) is index
+
+    for _ in range(200):
+        group = rng.sample(types, rng.randint(1, 6))
+        result = group[0]
+        for typex in group:
+            result = walk_ancestors(result, typex, context)
+        assert lca_of_set(group, context) is result
+
+    assert solve_bag({"IO", "Int"}, context) == "Object"
+    assert solve_bag({"Alone", "IO"}, context) == "Object"
+    assert solve_bag({"Int"}, context) == "Int"
+
+    # a new parent of a labelled type makes the index stale
+    alone, io = context.get_type("Alone"), context.get_type("IO")
+    alone.set_parent(io)
+    assert lca_index(context) is not index
+    assert lowest_common_ancestor(alone, io, context) is io
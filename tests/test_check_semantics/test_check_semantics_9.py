@@ -0,0 +1,60 @@
+import pytest
+
+from cool_inference.semantics.semantics import Context, SemanticError
+
+
+def test9():
+    context = Context()
+    a, b, c = (context.create_type(name) for name in "ABC")
+    b.set_parent(a)
+    c.set_parent(b)
+    int_type = context.create_type("Int")
+
+    f = a.define_method("f", [], [], int_type)
+    x = a.define_attribute("x", int_type)
+    assert c.get_method("f") is f and c.get_attribute("x") is x
+    assert c.find_method("g") is None and c.find_attribute("y") is None
+    with pytest.raises(SemanticError) as error:
+        c.get_method("g")
+    assert error.value.text == 'Method "g" is not defined in C.'
+    with pytest.raises(SemanticError) as error:
+        c.define_attribute("x", int_type)
+    assert error.value.text == 'Attribute "x" is already defined in C.'
+
+    # members gained after the lookups are resolved
+    g = a.define_method("g", [], [], int_type)
+    y = b.define_attribute("y", int_type)
+    assert c.get_method("g") is g and c.get_attribute("y") is y
+    assert a.find_attribute("y") is None
+
+    # overriding, the closest definition wins
+    f_b = b.define_method("f", [], [], int_type)
+    assert c.get_method("f") is f_b and a.get_method("f") is f
+    with pytest.raises(SemanticError):
+        b.define_method("f", [], [], int_type)
+
+    # a parent set after the lookups
+    d = context.create_type("D")
+    assert d.find_method("f") is None
+    d.set_parent(c)
+    assert d.get_method("f") is f_b
+
+    # an inheritance cycle ends the lookup
+    u, v = context.create_type("U"), context.create_type("V")
+    u.set_parent(v)
+    v.set_parent(u)
+    assert u.find_method("f") is None
+
+
+def test10():
+    context = Context()
+    int_type = context.create_type("Int")
+    parent = context.create_type("T0")
+    parent.define_attribute("a0", int_type)
+    for i in range(1, 1000):
+        typex = context.create_type(f"T{i}")
+        typex.set_parent(parent)
+        typex.define_attribute(f"a{i}", int_type)
+        parent = typex
+    assert parent.get_attribute("a0").name == "a0"
+    assert parent.find_attribute("a1000") is None
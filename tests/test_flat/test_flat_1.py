@@ -0,0 +1,61 @@
+import pickle
+from cool_inference import flat
+from cool_inference.parsing.parser import parser
+from cool_inference.semantics.check import TypeCollector, TypeBuilder, TypeChecker
+from cool_inference.inference.tyinfer import BagsCollector, BagsReducer, BagsReplacer
+from cool_inference.cli.ast_str import AstStr
+
+
+def infer(ast):
+    errors = []
+
+    collector = TypeCollector(errors)
+    collector.visit(ast)
+    context = collector.context
+    TypeBuilder(context, errors).visit(ast)
+    TypeChecker(context, errors).visit(ast)
+
+    bags = BagsCollector(context, errors).visit(ast)
+    bags = BagsReducer(bags, context, errors).visit(ast)
+    BagsReplacer(bags, context, errors).visit(ast)
+
+    assert errors == []
+    return AstStr().visit(ast, 0)
+
+
+def test1(tmp_path):
+    test1 = """
+        class A {
+            d : AUTO_TYPE <- 2 ;
+
+            met1 ( e : String ) : AUTO_TYPE {
+                {
+                    let x : AUTO_TYPE <- d in x + 1 ;
+                    case e of s : String => s ; o : Object => o ; esac ;
+                    b.met2 ( a ) ;
+                }
+            } ;
+
+            a : AUTO_TYPE <- 5 ;
+            b : B <- new B ;
+        } ;
+
+        class B {
+            met2 ( f : AUTO_TYPE ) : Int {
+                f + 5
+            }  ;
+        } ;
+        """
+
+    expected = infer(parser.parse(test1))
+
+    flat_ast = flat.parse(test1)
+    assert len(flat_ast) == len(flat.FlatAst.from_tree(parser.parse(test1)))
+
+    path = str(tmp_path / "test1.flat")
+    flat_ast.save(path)
+    loaded = flat.FlatAst.load(path)
+    assert AstStr().visit(loaded.to_tree(), 0) == AstStr().visit(parser.parse(test1), 0)
+
+    assert infer(loaded.program()) == expected
+    assert infer(pickle.loads(pickle.dumps(flat_ast)).program()) == expected
@@ -0,0 +1,18 @@
+import pytest
+
+from cool_inference import flat
+from lark import UnexpectedToken
+
+
+def test2():
+    code = "class A { } ;"
+    size = len(flat.parse(code))
+
+    with pytest.raises(UnexpectedToken):
+        flat.parse("class A { a : Int <- 1 ; b : Int <- ; } ;")
+
+    # the rows of the failed parse are dropped
+    ast = flat.parse(code)
+    assert len(ast) == size
+    assert ast.program().nid == size - 1
+    assert len(ast.spans) == size
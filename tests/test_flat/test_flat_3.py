@@ -0,0 +1,37 @@
+import pickle
+
+from cool_inference import flat
+from cool_inference.parsing.parser import parser
+
+
+def spans_of(table):
+    return [table.span(nid) for nid in range(len(table))], table.first
+
+
+def test3(tmp_path):
+    code = """
+        class A {
+            a : Int <- 1 ;
+        } ;
+        class B inherits A {
+            f ( x : Int ) : Int { x + a } ;
+        } ;
+    """
+
+    for tree in (flat.parse(code), flat.FlatAst.from_tree(parser.parse(code))):
+        # the first node of every class, as the stream parser records them
+        classes = tree.program().cool_class_list
+        tree.spans.first = {view.index: view.index - 1 for view in classes}
+        expected = spans_of(tree.spans)
+        assert expected[0] and expected[1]
+
+        # the spans survive the bytes, a file and pickle
+        assert spans_of(flat.FlatAst.from_buffer(tree.to_bytes()).spans) == expected
+        tree.save(tmp_path / "tree.flat")
+        assert spans_of(flat.FlatAst.load(tmp_path / "tree.flat").spans) == expected
+        assert spans_of(pickle.loads(pickle.dumps(tree)).spans) == expected
+
+    # and a tree without spans is still loaded without them
+    tree = flat.parse(code)
+    tree.spans = None
+    assert flat.FlatAst.from_buffer(tree.to_bytes()).spans is None
@@ -0,0 +1,33 @@
+import importlib.util
+from cool_inference.parsing.build import build
+from cool_inference.parsing.parser import build_parser
+from cool_inference.parsing.transformer import CoolASTTransformer
+from cool_inference.cli.ast_str import AstStr
+
+
+def test1(tmp_path):
+    test1 = """
+        class A inherits IO {
+            a : AUTO_TYPE <- 5 ;
+            b : String <- "asd" ;
+
+            met ( x : Int, y : AUTO_TYPE ) : AUTO_TYPE {
+                {
+                    let c : Int <- x * 2, d : AUTO_TYPE in c + y ;
+                    if x < y then x else y fi ;
+                    case b of s : String => s ; o : Object => o ; esac ;
+                    self.met ( x , y ) ;
+                }
+            } ;
+        } ;
+    """
+
+    path = build(str(tmp_path / "standalone.py"))
+    spec = importlib.util.spec_from_file_location("standalone", path)
+    standalone = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(standalone)
+
+    parser = standalone.Lark_StandAlone(transformer=CoolASTTransformer())
+    expected = build_parser(cache=False).parse(test1)
+
+    assert AstStr().visit(parser.parse(test1), 0) == AstStr().visit(expected, 0)
@@ -0,0 +1,60 @@
+from cool_inference import flat
+from cool_inference.parsing.parser import parser
+from cool_inference.semantics.check import TypeCollector, TypeBuilder
+from cool_inference.utils.symbols import symbol
+
+
+def test10():
+    test10 = """class Point {
+    x : Int ;
+    move ( dx : Int ) : Point { { x <- x + dx ; self ; } } ;
+} ;
+class Main inherits Point {
+    main ( ) : Object { let p : Point <- new Point in p . move ( 1 ) } ;
+} ;
+"""
+
+    # every occurrence of a name is the same object
+    ast = parser.parse(test10)
+    point, main = ast.cool_class_list
+    x, move = point.feature_list
+    param = move.params[0]
+    assign = move.body.expr_list[0]
+    let = main.feature_list[0].body
+    idx, typex, new = let.decl_list[0]
+
+    assert main.inherit is point.id
+    assert move.type is point.id
+    assert typex is point.id
+    assert new.type is point.id
+    assert assign.id is x.id
+    assert assign.value.left.id is x.id
+    assert assign.value.right.id is param.id
+    assert let.exp.id is move.id
+    assert x.type is param.type is symbol("Int")
+
+    # the semantic tables are keyed by the same symbols
+    errors = []
+    collector = TypeCollector(errors)
+    collector.visit(ast)
+    context = collector.context
+    TypeBuilder(context, errors).visit(ast)
+    assert errors == []
+
+    point_type = context.get_type("Point")
+    assert point_type.name is point.id
+    assert point_type.attributes[0].name is x.id
+    assert point_type.methods[0].param_names[0] is param.id
+    assert next(name for name in context.types if name == "Main") is main.id
+
+    # so are the strings of a flat ast read from its bytes
+    flat_ast = flat.FlatAst.from_buffer(flat.parse(test10).to_bytes())
+    flat_point = flat_ast.program().cool_class_list[0]
+    assert flat_point.id is point.id
+    assert flat_point.feature_list[1].params[0].id is param.id
+
+    # the implicit self of a dispatch too
+    self_exp = move.body.expr_list[1]
+    dispatch = parser.parse("class A { f ( ) : Int { f ( ) } ; } ;")
+    dispatch = dispatch.cool_class_list[0].feature_list[0].body
+    assert dispatch.exp.id is self_exp.id is symbol("self")
@@ -0,0 +1,36 @@
+import lark
+import pytest
+
+from cool_inference.parsing.parser import UnexpectedToken, parser
+from cool_inference.parsing.stream import parse, reparse
+
+
+def test11():
+    code = "class A { a : Int <- 1 ; } ;"
+    ast = parser.parse(code)
+    size = len(ast.spans)
+
+    with pytest.raises(UnexpectedToken):
+        parser.parse("class A { a : Int <- 1 ; b : Int <- ; } ;")
+
+    # the ids of the next parse are dense again
+    ast = parser.parse(code)
+    assert len(ast.spans) == size
+    assert ast.nid == size - 1
+
+
+def test12():
+    code = "class A { a : Int <- 1 ; } ; class B { b : Int <- 2 ; } ;"
+    ast = parse(code)
+    size = len(ast.spans)
+    first = dict(ast.spans.first)
+
+    start = code.index("b : Int")
+    with pytest.raises(lark.UnexpectedToken):
+        reparse(ast, code, (start, start, "c : Int <- 3 ; d : Int <- ; "))
+
+    # the failed reparse leaves the program and its spans as they were
+    assert len(ast.spans) == size
+    assert ast.spans.first == first
+    code = reparse(ast, code, (start, start, "c : Int <- 3 ; "))
+    assert [len(c.feature_list) for c in ast.cool_class_list] == [1, 2]
@@ -0,0 +1,22 @@
+import lark
+import pytest
+
+from cool_inference.parsing import recover, stream
+from cool_inference.parsing.parser import UnexpectedToken, build_parser, parser
+
+KEYWORD_MISUSES = ["classC { } ;", "class C { in : Int ; } ;"]
+
+
+@pytest.mark.parametrize("code", KEYWORD_MISUSES)
+def test12(code):
+    # the keywords are reserved by every front end, whatever the lexer
+    with pytest.raises(UnexpectedToken):
+        parser.parse(code)
+    with pytest.raises(lark.exceptions.UnexpectedInput):
+        build_parser(cache=False).parse(code)
+    with pytest.raises(lark.exceptions.UnexpectedInput):
+        build_parser(cache=False, lexer="fast").parse(code)
+    with pytest.raises(lark.exceptions.UnexpectedInput):
+        stream.parse(code)
+    _, errors = recover.parse(code)
+    assert errors
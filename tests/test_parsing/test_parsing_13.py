@@ -0,0 +1,34 @@
+import os
+from cool_inference.parsing.cache import AstCache
+
+
+def removed_meanwhile(cache):
+    # the entries of the cache, removed by another process once listed
+    entries = list(cache.entries())
+
+    def listed():
+        for path, stat in entries:
+            os.remove(path)
+            yield path, stat
+
+    return listed
+
+
+def test13(tmp_path):
+    cache = AstCache(str(tmp_path))
+    cache.parse("class A { } ;")
+    cache.parse("class B { } ;")
+
+    cache.max_age = -1
+    cache.entries = removed_meanwhile(cache)
+    cache.evict()
+    del cache.entries
+    assert cache.stats()["entries"] == 0
+
+    cache.parse("class A { } ;")
+    cache.max_age = 3600
+    cache.max_bytes = 0
+    cache.entries = removed_meanwhile(cache)
+    cache.evict()
+    del cache.entries
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,33 @@
+import pytest
+from lark.exceptions import UnexpectedCharacters
+from cool_inference.parsing.lexer import tokenize
+from cool_inference.parsing.parser import build_parser
+
+
+def test2():
+    test2 = """
+        class Main inherits IO {
+            main ( ) : AUTO_TYPE {
+                {
+                    out_string ( "a \\"quoted\\" string" ) ;
+                    let x : Int <- ~12, y : Bool <- not isvoid self in
+                        if x <= 3 then x * 2 else x / 2 fi ;
+                    while true loop x <- x - 1 pool ;
+                    case x of i : Int => i = 1 ; o : Object => o < 2 ; esac ;
+                    self@IO.out_int ( x + 1 ) ;
+                    classy + lets + Object + A1 + newx ;
+                }
+            } ;
+        } ;
+    """
+
+    expected = build_parser(cache=False).lex(test2)
+    tokens = list(tokenize(test2))
+
+    assert [(t.type, t.value, t.start_pos, t.line, t.column) for t in tokens] == [
+        (t.type, t.value, t.start_pos, t.line, t.column) for t in expected
+    ]
+
+    with pytest.raises(UnexpectedCharacters) as e:
+        list(tokenize("class A {\n  a : Int <- $ ;\n} ;"))
+    assert (e.value.line, e.value.column) == (2, 14)
@@ -0,0 +1,35 @@
+import os
+from cool_inference.parsing.cache import AstCache
+from cool_inference.cli.ast_str import AstStr
+
+
+def test3(tmp_path):
+    test3 = """
+        class A {
+            a : AUTO_TYPE <- 5 ;
+            met ( x : AUTO_TYPE ) : AUTO_TYPE { x + a } ;
+        } ;
+    """
+
+    cache = AstCache(str(tmp_path))
+
+    first = cache.parse(test3)
+    second = cache.parse(test3)
+    cache.parse(test3 + " class B { } ; ")
+
+    assert AstStr().visit(first, 0) == AstStr().visit(second, 0)
+    assert first is not second
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+    assert stats["bytes"] == sum(
+        os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)
+    )
+
+    cache.max_bytes = stats["bytes"] - 1
+    cache.evict()
+    assert cache.stats()["entries"] == 1
+
+    cache.max_age = -1
+    cache.evict()
+    assert cache.stats()["entries"] == 0
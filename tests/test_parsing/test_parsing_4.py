@@ -0,0 +1,28 @@
+from cool_inference.parsing.parser import parser
+
+
+def test4():
+    test4 = """class A inherits IO {
+    a : Int <- 1 + 2 ;
+    m ( x : Int ) : Int { out_int ( x ) } ;
+} ;
+class B { } ;
+"""
+
+    ast = parser.parse(test4)
+    spans = ast.spans
+
+    class_a, class_b = ast.cool_class_list
+    attr, method = class_a.feature_list
+
+    assert spans.text(test4, attr.nid) == "a : Int <- 1 + 2"
+    assert spans.text(test4, attr.body.nid) == "1 + 2"
+    assert spans.span(attr.body.nid) == (37, 42, 2, 16)
+    assert spans.text(test4, method.body.nid) == "out_int ( x )"
+    assert spans.text(test4, class_b.nid) == "class B { }"
+    assert spans.span(class_b.nid)[2:] == (5, 1)
+    assert spans.span(ast.nid) == (0, len(test4) - 1, 1, 1)
+
+    assert sorted(
+        [attr.nid, attr.body.nid, method.nid, class_a.nid, class_b.nid, ast.nid]
+    ) == [attr.body.nid, attr.nid, method.nid, class_a.nid, class_b.nid, ast.nid]
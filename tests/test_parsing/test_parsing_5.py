@@ -0,0 +1,31 @@
+import lark
+
+from cool_inference.cli.ast_str import AstStr
+from cool_inference.parsing.parser import build_parser
+from cool_inference.parsing.stream import parse
+
+
+def test5():
+    test5 = """class A inherits IO {
+    a : Int <- 1 + 2 ;
+    m ( x : Int ) : Int { { out_int ( x ) ; "}" ; } } ;
+} ;
+class B inherits A { b : String <- "{" ; } ;
+class Main { main ( ) : Object { ( new B ) . m ( 1 ) } ; } ;
+"""
+
+    seen = []
+    ast = parse(test5, lambda cool_class: seen.append(cool_class.id))
+    expected = build_parser(lexer="fast").parse(test5)
+
+    assert seen == ["A", "B", "Main"]
+    assert AstStr().visit(ast, 0) == AstStr().visit(expected, 0)
+    assert list(ast.spans.start) == list(expected.spans.start)
+    assert list(ast.spans.line) == list(expected.spans.line)
+    assert ast.nid == expected.nid
+
+    try:
+        parse("class A { } ;\nclass B { a : Int <- ; } ;\n")
+        assert False
+    except lark.UnexpectedToken as e:
+        assert (e.line, e.column) == (2, 22)
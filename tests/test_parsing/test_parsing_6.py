@@ -0,0 +1,54 @@
+import lark
+
+from cool_inference.cli.ast_str import AstStr
+from cool_inference.parsing.parser import parser
+from cool_inference.parsing.stream import reparse
+
+
+def features(program):
+    nodes = [program]
+    for cool_class in program.cool_class_list:
+        nodes.append(cool_class)
+        nodes.extend(cool_class.feature_list)
+    return [program.spans.span(node.nid) for node in nodes]
+
+
+def test6():
+    test6 = """class A { a : Int <- 1 ; } ;
+class B inherits A { b : Int <- 2 ; } ; class C { c : Int <- 3 ; } ;
+class Main { main ( ) : Object { 0 } ; } ;
+"""
+
+    ast = parser.parse(test6)
+    class_b = ast.cool_class_list[1]
+    edits = [
+        lambda code: (code.index("2"), code.index("2") + 1, "20 + 1"),
+        lambda code: (0, 0, "class Z { } ;\n"),
+        lambda code: (code.index("} ; class C") + 3, code.index("class C"), "\n\n"),
+        lambda code: (code.index("class C"), code.index("class Main"), ""),
+    ]
+    for make_edit in edits:
+        edit = make_edit(test6)
+        code = test6[: edit[0]] + edit[2] + test6[edit[1] :]
+        test6 = reparse(ast, test6, edit)
+        expected = parser.parse(code)
+
+        assert test6 == code
+        assert AstStr().visit(ast, 0) == AstStr().visit(expected, 0)
+        assert features(ast) == features(expected)
+
+    assert [cool_class.id for cool_class in ast.cool_class_list] == [
+        "Z",
+        "A",
+        "B",
+        "Main",
+    ]
+    assert ast.cool_class_list[2] is not class_b
+
+    class_a = ast.cool_class_list[1]
+    try:
+        reparse(ast, test6, (test6.index("class A"), test6.index("class A"), "{"))
+        assert False
+    except lark.UnexpectedToken:
+        pass
+    assert ast.cool_class_list[1] is class_a
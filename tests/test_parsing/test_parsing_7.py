@@ -0,0 +1,47 @@
+from cool_inference.ast import Case, Dispatch, IdExp, LetIn, StaticDispatch
+from cool_inference.parsing.parser import parser
+
+
+def test7():
+    test7 = """class A { f ( x : Int , y : Int ) : Int { x } ; } ;
+class Main inherits A {
+    main ( ) : Object {
+        let a : A <- new Main , b : Int in case a of
+            x : A => a @ A . f ( 1 , b ) ;
+            y : Main => f ( 2 , 3 ) ;
+        esac
+    } ;
+} ;
+"""
+
+    ast = parser.parse(test7)
+    class_a, class_main = ast.cool_class_list
+
+    assert class_a.inherit is None
+    assert class_main.inherit == "A"
+    assert [param.id for param in class_a.feature_list[0].params] == ["x", "y"]
+
+    let = class_main.feature_list[0].body
+    assert isinstance(let, LetIn)
+    assert [(idx, typex) for idx, typex, _ in let.decl_list] == [
+        ("a", "A"),
+        ("b", "Int"),
+    ]
+    assert let.decl_list[1][2] is None
+
+    case = let.exp
+    assert isinstance(case, Case)
+    assert [(idx, typex) for idx, typex, _ in case.case_list] == [
+        ("x", "A"),
+        ("y", "Main"),
+    ]
+
+    static = case.case_list[0][2]
+    assert isinstance(static, StaticDispatch)
+    assert (static.id, static.specific_type, len(static.exp_list)) == ("f", "A", 2)
+    assert ast.spans.text(test7, static.nid) == "a @ A . f ( 1 , b )"
+
+    dispatch = case.case_list[1][2]
+    assert isinstance(dispatch, Dispatch) and isinstance(dispatch.exp, IdExp)
+    assert dispatch.exp.id == "self"
+    assert ast.spans.text(test7, dispatch.nid) == "f ( 2 , 3 )"
@@ -0,0 +1,63 @@
+from cool_inference import flat
+from cool_inference.cli.ast_str import AstStr
+from cool_inference.parsing.batch import parse_files
+from cool_inference.parsing.parser import parser
+
+
+def spans_of(ast):
+    return [ast.spans.span(nid) for nid in range(len(ast.spans))]
+
+
+def test8(tmp_path):
+    sources = {
+        "a.cool": "class A { a : Int <- 1 ; } ;",
+        "b.cool": "class B { b : Int <- ; } ;",
+        "c.cool": "class C inherits A { c ( ) : Int { a + 1 } ; } ;",
+        "d.cool": "class D { d : Int <- $ ; } ;",
+    }
+    paths = []
+    for name, code in sources.items():
+        (tmp_path / name).write_text(code)
+        paths.append(str(tmp_path / name))
+    paths.append(str(tmp_path / "missing.cool"))
+
+    results = list(parse_files(paths, 2))
+
+    assert [path for path, _, _ in results] == paths
+    for path, ast, error in results[::2][:2]:
+        assert error is None
+        code = sources[path[-6:]]
+        expected = parser.parse(code)
+        assert AstStr().visit(ast.to_tree(), 0) == AstStr().visit(expected, 0)
+        # the spans come back from the worker with the tree
+        assert spans_of(ast) == spans_of(flat.parse(code))
+        assert ast.spans.span(ast.root) == (0, len(code), 1, 1)
+    assert results[1][1:] == (None, ("parsing", "Unexpected token ; at (1, 22)"))
+    assert results[3][1:] == (
+        None,
+        ("lexical", "Unexpected character $ at (1, 22)"),
+    )
+    assert results[4][1] is None and results[4][2][0] == "io"
+
+
+def test9(tmp_path):
+    # a file that is not utf8, and one failing after some nodes were built,
+    # do not abort the batch nor leak into the next file of the worker
+    bad = tmp_path / "bad.cool"
+    bad.write_bytes(b'class A { a : String <- "\xff\xfe" ; } ;')
+    broken = tmp_path / "broken.cool"
+    broken.write_text("class B { b : Int <- 1 ; c : Int <- ; } ;")
+    good = tmp_path / "good.cool"
+    code = "class C { c : Int <- 1 ; } ;"
+    good.write_text(code)
+
+    results = list(parse_files([str(bad), str(broken), str(good)], 1))
+
+    assert results[0][1] is None and results[0][2][0] == "io"
+    assert results[1][1] is None and results[1][2][0] == "parsing"
+    path, ast, error = results[2]
+    assert error is None
+    assert len(ast) == len(parser.parse(code).spans)
+    assert spans_of(ast) == spans_of(flat.parse(code))
+    assert ast.spans.span(ast.root) == (0, len(code), 1, 1)
+    assert AstStr().visit(ast.to_tree(), 0) == AstStr().visit(parser.parse(code), 0)
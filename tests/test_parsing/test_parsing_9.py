@@ -0,0 +1,41 @@
+from cool_inference.cli.ast_str import AstStr
+from cool_inference.parsing.parser import parser
+from cool_inference.parsing.recover import parse
+
+
+def test9():
+    test9 = """class A {
+    a : Int <- ;
+    b : Int <- 2 ;
+    c ( ) : Int { { 1 ; 2 + ; } } ;
+    d : Int <- 4 ;
+} ;
+class B inherits A { x : Int <- $ 3 ; } ;
+class C { y : Int <- 1 ;
+class D { z : Int <- 1 ; } ;
+"""
+
+    ast, errors = parse(test9)
+
+    assert [(e.line, e.column) for e in errors] == [
+        (2, 16),
+        (4, 29),
+        (7, 33),
+        (8, 24),
+    ]
+    assert [cool_class.id for cool_class in ast.cool_class_list] == [
+        "A",
+        "B",
+        "C",
+        "D",
+    ]
+    class_a, class_b, class_c, class_d = ast.cool_class_list
+    assert [feature.id for feature in class_a.feature_list] == ["b", "d"]
+    assert class_b.feature_list[0].body.lex == "3"
+    assert [feature.id for feature in class_c.feature_list] == ["y"]
+    assert ast.spans.text(test9, class_d.nid) == "class D { z : Int <- 1 ; }"
+
+    valid = "class A { a : Int <- 1 ; } ;\nclass B { } ;\n"
+    ast, errors = parse(valid)
+    assert errors == []
+    assert AstStr().visit(ast, 0) == AstStr().visit(parser.parse(valid), 0)
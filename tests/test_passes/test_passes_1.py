@@ -0,0 +1,63 @@
+from cool_inference.cli.ast_str import AstStr
+from cool_inference.parsing.parser import parser
+from cool_inference.passes import (
+    BuildTypes,
+    CheckTypes,
+    CollectTypes,
+    PassManager,
+    Unit,
+    inference_passes,
+)
+
+
+def test1():
+    test1 = """
+        class A {
+            a : AUTO_TYPE <- new B ;
+            f ( x : AUTO_TYPE ) : AUTO_TYPE { x + 1 } ;
+        } ;
+        class B inherits A {
+            g ( ) : AUTO_TYPE { f ( 2 ) } ;
+        } ;
+    """
+
+    passes = inference_passes()
+    manager = PassManager(passes)
+    names = [[pass_.name for pass_ in sweep] for sweep in manager.schedule()]
+    assert names == [
+        ["Type collection", "Type building"],
+        ["Type checking"],
+        ["Collecting tybags"],
+        [
+            "Reducing tybags",
+            "Replacing tybags in ast",
+            "Type collection (inferred)",
+            "Type building (inferred)",
+        ],
+        ["Type checking (inferred)"],
+    ]
+
+    unit = Unit(parser.parse(test1))
+    assert len(list(manager.run(unit))) == 5
+    assert all(pass_.errors == [] for pass_ in passes)
+    assert set(unit.timings) == {pass_.name for pass_ in passes}
+
+    inferred = unit.contexts["inferred"]
+    assert inferred.get_type("A").get_attribute("a").type.name == "B"
+    assert inferred.get_type("A").get_method("f").return_type.name == "Int"
+    assert inferred.get_type("B").get_method("g").return_type.name == "Int"
+    assert "AUTO_TYPE" not in AstStr().visit(unit.ast, 0)
+
+
+def test2():
+    # a pass is not run before the facts it needs
+    manager = PassManager([BuildTypes(), CollectTypes()])
+    try:
+        manager.schedule()
+    except ValueError:
+        pass
+    else:
+        assert False
+
+    manager = PassManager([CheckTypes()], facts=[("headers", "context")])
+    assert len(manager.schedule()) == 1
@@ -0,0 +1,74 @@
+import pickle
+
+import pytest
+
+from cool_inference import flat
+from cool_inference.parsing.parser import parser
+from cool_inference.passes import PassManager, Unit, inference_passes
+from cool_inference.utils.tables import NodeTable
+
+
+def infer(ast):
+    unit = Unit(ast)
+    for _ in PassManager(inference_passes()).run(unit):
+        pass
+    return unit
+
+
+def test1():
+    test1 = """
+        class Main {
+            a : AUTO_TYPE <- 1 ;
+            f ( x : AUTO_TYPE ) : AUTO_TYPE {
+                let y : AUTO_TYPE <- x + 1 in case y of z : AUTO_TYPE => z + 1 ; esac
+            } ;
+        } ;
+    """
+
+    ast = parser.parse(test1)
+    unit = infer(ast)
+    attr, func = ast.cool_class_list[0].feature_list
+    let = func.body
+    case = let.exp
+
+    # the bags are keyed by node id
+    cool_class = ast.cool_class_list[0]
+    class_bags = unit.bags.children[cool_class.nid]
+    assert class_bags.name == "Main"
+    assert class_bags.children[func.nid].name == "f"
+
+    types = unit.types
+    assert types[attr.nid] == "Int"
+    assert types[func.nid] == "Int"
+    assert types[func.params[0].nid] == "Int"
+    assert types[let.nid] == ["Int"]
+    assert types[case.nid] == ["Int"]
+    assert types[case.exp.nid] is None
+    assert dict(types.items()) == {
+        attr.nid: "Int",
+        func.nid: "Int",
+        func.params[0].nid: "Int",
+        let.nid: ["Int"],
+        case.nid: ["Int"],
+    }
+
+    assert unit.scopes["context"][cool_class.nid] is not None
+    assert pickle.loads(pickle.dumps(types)) == types
+
+    # flat views are new objects on every access, the ids stay the same
+    unit = infer(flat.parse(test1).program())
+    assert unit.types == types
+
+
+def test2():
+    table = NodeTable(2)
+    assert len(table) == 2 and table[5] is None
+    table[5] = "A"
+    assert len(table) == 6 and table[5] == "A"
+    assert list(table.items()) == [(5, "A")]
+
+    # a negative id is not an index from the end
+    assert table[-1] is None
+    with pytest.raises(IndexError):
+        table[-1] = "B"
+    assert list(table.items()) == [(5, "A")]
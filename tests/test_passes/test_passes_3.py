@@ -0,0 +1,39 @@
+import cool_inference.ast as ast
+from cool_inference.cli.ast_str import AstStr
+from cool_inference.parsing.parser import parser
+from cool_inference.passes import PassManager, Unit, inference_passes
+from cool_inference.utils.tables import number_nodes
+
+
+def infer(program):
+    unit = Unit(program)
+    manager = PassManager(inference_passes())
+    for _ in manager.run(unit):
+        pass
+    assert [error for pass_ in manager.passes for error in pass_.errors] == []
+    return unit
+
+
+def test3():
+    # a tree built by hand, without the ids given by the parser
+    value = ast.IntExp("1")
+    attr = ast.AttrDecl("a", "AUTO_TYPE", value)
+    cool_class = ast.CoolClass([attr], "A")
+    program = ast.Program([cool_class])
+
+    unit = infer(program)
+    assert [value.nid, attr.nid, cool_class.nid, program.nid] == [0, 1, 2, 3]
+    assert unit.types[attr.nid] == "Int"
+    assert AstStr().visit(program, 0) == AstStr().visit(
+        parser.parse("class A { a : Int <- 1 ; } ;"), 0
+    )
+
+    # a node added by hand to a parsed tree gets an id after the parsed ones
+    program = parser.parse("class A { a : AUTO_TYPE <- 1 ; } ;")
+    size = program.nid + 1
+    attr = ast.AttrDecl("b", "AUTO_TYPE", None)
+    program.cool_class_list[0].feature_list.append(attr)
+    number_nodes(program)
+    unit = infer(program)
+    assert attr.nid == size and program.nid == size - 1
+    assert unit.types[attr.nid] == "Object"
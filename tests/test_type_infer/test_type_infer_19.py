@@ -0,0 +1,40 @@
+from cool_inference.parsing.parser import parser
+from cool_inference.semantics.check import TypeCollector, TypeBuilder, TypeChecker
+from cool_inference.inference.tyinfer import BagsCollector, BagsReducer, BagsReplacer
+from cool_inference.utils.utils import search_for_errors
+
+
+def test19():
+    # a let in the argument of a dispatch
+    test19 = """
+        class Main inherits IO {
+            f ( x : AUTO_TYPE ) : AUTO_TYPE { x + 1 } ;
+            main ( ) : Object { out_int ( f ( let y : AUTO_TYPE <- 3 in y ) ) } ;
+        } ;
+            """
+
+    ast = parser.parse(test19)
+
+    errors = []
+
+    collector = TypeCollector(errors)
+    collector.visit(ast)
+    context = collector.context
+    TypeBuilder(context, errors).visit(ast)
+    TypeChecker(context, errors).visit(ast)
+
+    assert errors == []
+
+    bags = BagsCollector(context, errors).visit(ast)
+    bags = BagsReducer(bags, context, errors).visit(ast)
+    search_for_errors(bags, errors)
+
+    assert errors == []
+
+    BagsReplacer(bags, context, errors).visit(ast)
+    f, main = ast.cool_class_list[0].feature_list
+    let = main.body.exp_list[0].exp_list[0]
+
+    assert f.type == "Int"
+    assert f.params[0].type == "Int"
+    assert let.decl_list[0][1] == "Int"
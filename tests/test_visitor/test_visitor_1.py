@@ -0,0 +1,61 @@
+import cool_inference.utils.visitor as visitor
+from cool_inference import flat
+from cool_inference.ast import Binary, Expression, IntExp, Plus
+
+
+class Kind(visitor.Visitor):
+    @visitor.on("node")
+    def visit(self, node):
+        return "default"
+
+    @visitor.when(Expression)
+    def visit(self, node):  # noqa: F811
+        return "expression"
+
+    @visitor.when(Binary)
+    def visit(self, node):  # noqa: F811
+        return "binary"
+
+
+class IntKind(Kind):
+    @visitor.when(IntExp)
+    def visit(self, node):
+        return "int"
+
+
+def test1():
+    kind = Kind()
+    plus = Plus(IntExp("1"), IntExp("2"))
+
+    # the target of the nearest class in the mro wins
+    assert kind.visit(plus) == "binary"
+    assert kind.visit(plus.left) == "expression"
+    # the function decorated with on is not called without a target
+    assert kind.visit(None) == []
+
+    # a target added later replaces the resolved one
+    Kind.visit.dispatcher.add_target(Plus, lambda self, node: "plus")
+    assert kind.visit(plus) == "plus"
+    assert kind.visit(Plus(None, None)) == "plus"
+
+    # flat views are subclasses of the node classes
+    program = flat.parse("class A { a : Int <- 1 + 2 ; } ;").program()
+    body = program.cool_class_list[0].feature_list[0].body
+    assert type(body) is not Plus
+    assert kind.visit(body) == "plus"
+    assert kind.visit(body.left) == "expression"
+
+    # a subclass keeps the targets of its base and adds its own
+    int_kind = IntKind()
+    assert int_kind.visit(plus) == "binary"
+    assert int_kind.visit(plus.left) == "int"
+    assert int_kind.visit(body.left) == "int"
+    assert int_kind.visit(None) == []
+
+
+def test2():
+    # the table is built when the class is defined, before any visit
+    table = IntKind.visit.dispatcher.table
+    assert table[IntExp] is IntKind.visit.dispatcher.targets[IntExp]
+    assert set(table) >= {IntExp, Plus, Binary, Expression}
+    assert table[Plus](None, None) == "binary"
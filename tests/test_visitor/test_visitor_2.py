@@ -0,0 +1,43 @@
+import cool_inference.utils.traverse as traverse
+from cool_inference.ast import AstNode, IdExp, LetIn
+from cool_inference.cli.ast_str import AstStr
+from cool_inference.parsing.parser import parser
+
+
+class Depth(traverse.Walker):
+    # the deepest let of the tree, the state is the number of enclosing lets
+    @traverse.pre(LetIn)
+    def enter(self, node, lets):
+        return [(child, lets + 1) for child in traverse.children(node)]
+
+    @traverse.post(AstNode)
+    def leave(self, node, lets, values):
+        return max([lets] + [value for value in values if value is not None])
+
+
+def test2():
+    # far deeper than the recursion limit
+    depth = 5000
+    body = " + ".join(["a"] * depth)
+    test2 = f"class Main {{ a : Int ; f ( ) : Int {{ {body} }} ; }} ;"
+
+    ast = parser.parse(test2)
+    assert AstStr().visit(ast, 0) == (
+        "class Main {\n    a: Int;\n    f(): Int {\n        " + body + "\n    };\n};\n"
+    )
+
+    decls = " in ".join(f"let x_{i} : Int <- {i}" for i in range(depth))
+    test2 = f"class Main {{ f ( ) : Int {{ {decls} in x_0 }} ; }} ;"
+
+    ast = parser.parse(test2)
+    assert Depth().walk(ast, 0) == depth
+
+    let = ast.cool_class_list[0].feature_list[0].body
+    assert traverse.children(let) == [let.decl_list[0][2], let.exp]
+    assert isinstance(let.exp, LetIn)
+    assert traverse.children(IdExp("x")) == []
+
+    # a missing child is not walked, its value is None
+    ast = parser.parse("class Main { a : Int ; } ;")
+    assert traverse.children(ast.cool_class_list[0].feature_list[0]) == [None]
+    assert Depth().walk(ast, 0) == 0
@@ -0,0 +1,72 @@
+import cool_inference.utils.visitor as visitor
+from cool_inference.ast import Case, CoolClass, LetIn, Plus, Program, kind_mask
+from cool_inference.parsing.parser import parser
+
+
+class Lets(visitor.Visitor):
+    # the let and case nodes, the other nodes are walked
+    def __init__(self):
+        self.found = []
+        self.visited = []
+
+    @visitor.on("node", walk=True)
+    def visit(self, node):
+        pass
+
+    @visitor.when(LetIn)
+    def visit(self, node):  # noqa: F811
+        self.found.append(node)
+        for _, _, exp in node.decl_list:
+            if exp is not None:
+                self.visit(exp)
+        self.visit(node.exp)
+
+    @visitor.when(Case)
+    def visit(self, node):  # noqa: F811
+        self.found.append(node)
+
+
+class Tracing(Lets):
+    @visitor.when(Plus)
+    def visit(self, node):  # noqa: F811
+        self.visited.append(node)
+
+
+def test3():
+    test3 = """class A {
+    a : Int <- 1 + 2 ;
+    f ( x : Int ) : Int { { x + 1 ; let y : Int <- x + 2 in y + 3 ; } } ;
+    g ( ) : Object { case 1 + 1 of z : Int => z ; esac } ;
+} ;
+"""
+
+    ast = parser.parse(test3)
+    a, f, g = ast.cool_class_list[0].feature_list
+    block = f.body
+    let = block.expr_list[1]
+    case = g.body
+
+    # the summary holds the kinds of the whole subtree
+    assert ast.summary & kind_mask([Program, CoolClass, LetIn, Case, Plus])
+    assert a.summary & kind_mask([Plus])
+    assert not a.summary & kind_mask([LetIn, Case])
+    assert f.summary & kind_mask([LetIn]) and not f.summary & kind_mask([Case])
+    assert not block.expr_list[0].summary & kind_mask([LetIn, Case])
+    assert block.children() == block.expr_list
+    assert let.children() == [let.decl_list[0][2], let.exp]
+    assert case.children() == [case.exp, case.case_list[0][2]]
+
+    lets = Lets()
+    lets.visit(ast)
+    assert lets.found == [let, case]
+
+    # the subtrees without a let or a plus are skipped
+    tracing = Tracing()
+    tracing.visit(ast)
+    assert tracing.found == [let, case]
+    assert tracing.visited == [
+        a.body,
+        block.expr_list[0],
+        let.decl_list[0][2],
+        let.exp,
+    ]
@@ -0,0 +1,43 @@
+import cool_inference.utils.visitor as visitor
+from cool_inference import flat
+from cool_inference.ast import Arithmetic, Binary, IntExp, Leq, Plus
+from cool_inference.parsing.parser import parser
+
+
+class Names(visitor.Visitor):
+    @visitor.on("node")
+    def visit(self, node):
+        raise AssertionError("the function decorated with on is not called")
+
+    @visitor.when(IntExp)
+    def visit(self, node):  # noqa: F811
+        return "int"
+
+    @visitor.when(Binary)
+    def visit(self, node):  # noqa: F811
+        return "binary"
+
+
+class Arithmetics(Names):
+    @visitor.when(Arithmetic)
+    def visit(self, node):  # noqa: F811
+        return "arithmetic"
+
+
+def test4():
+    code = "class A { f ( ) : Bool { 1 + 2 <= 3 } ; } ;"
+    for ast in (parser.parse(code), flat.parse(code).program()):
+        cls = ast.cool_class_list[0]
+        leq = cls.feature_list[0].body
+        plus = leq.left
+        assert isinstance(leq, Leq) and isinstance(plus, Plus)
+
+        # a class without a target gives [], as with the original dispatcher
+        assert Names().visit(cls) == []
+        assert Names().visit(cls.feature_list[0]) == []
+        assert Names().visit(plus.left) == "int"
+        assert Names().visit(leq) == "binary"
+        assert Names().visit(plus) == "binary"
+        assert Arithmetics().visit(leq) == "binary"
+        assert Arithmetics().visit(plus) == "arithmetic"
+        assert Arithmetics().visit(cls) == []